@@ -4,30 +4,69 @@ FastAPI Application for AI Vehicle Matching System
 Provides REST API endpoints for vehicle updates and ride quotes.
 """
 
+import time
+
+_import_started = time.perf_counter()
+
+import asyncio
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
-import pickle
 import numpy as np
 import os
 import sys
-import pandas as pd
+import uuid
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.features.distance import haversine_distance
-from src.features.temporal import extract_temporal_features
 from src.pricing.dynamic_pricing import (
     load_demand_model,
-    get_region_id,
+    get_region_index,
+    get_region_ids,
+    format_region_id,
+    get_demand_score,
     get_surge_with_fallback,
-    calculate_fare
+    PEAK_DEMAND_RIDES,
+    calculate_fares,
+    fare_breakdown
+)
+from src.pricing.city_grid import city_grid
+from src.ranking.vehicle_ranker import rank_candidates_by_mode
+from src.inference.feature_builder import ETA_FEATURE_COLUMNS, EtaFeatureBuilder
+from src.inference.bundle import load_eta_bundle
+from src.inference.tree_compiler import compile_lgbm, stack_forests
+from src.inference.eta_table import EtaLookupTable, file_fingerprint
+from src.inference.batcher import MicroBatcher
+from src.inference.executor import InferenceExecutor
+from src.inference.pickup_eta import PickupEtaModel
+from config import (
+    ETA_BUNDLE_PATH,
+    TOP_K_VEHICLES,
+    DEFAULT_SURGE,
+    USER_MODE_WEIGHTS,
+    VEHICLE_TYPE_CODES,
+    USE_COMPILED_ETA,
+    USE_ETA_TABLE,
+    ETA_TABLE_PATH,
+    ETA_TABLE_STEP_KM,
+    ETA_TABLE_MAX_DISTANCE_KM,
+    ETA_MICRO_BATCHING,
+    ETA_BATCH_MAX_ROWS,
+    ETA_BATCH_MAX_WAIT_US,
+    INFERENCE_EXECUTOR,
+    INFERENCE_WORKERS,
+    API_TIMEOUT_SECONDS,
+    DEMAND_MODEL_PATH,
+    MODEL_WATCH_ENABLED,
+    PICKUP_ETA_MODEL_PATH,
+    FALLBACK_PICKUP_SPEED_KMH,
+    SHADOW_BUNDLE_PATH
 )
-from src.ranking.vehicle_ranker import rank_vehicles, format_vehicle_for_response
-from config import ETA_MODEL_PATH, SCALER_PATH, TOP_K_VEHICLES
 
 # ============================================================================
 # PYDANTIC SCHEMAS
@@ -52,7 +91,8 @@ class RideQuoteRequest(BaseModel):
     pickup: Location
     drop: Location
     timestamp: Optional[str] = Field(None, description="ISO format timestamp (default: now)")
-    user_mode: Optional[str] = Field('balanced', pattern="^(fastest|cheapest|balanced)$")
+    # 'all': rank once and return the top vehicles for every mode (RideQuoteResponse.rankings)
+    user_mode: Optional[str] = Field('balanced', pattern="^(fastest|cheapest|balanced|all)$")
 
 
 class FareBreakdown(BaseModel):
@@ -71,6 +111,8 @@ class VehicleOption(BaseModel):
     vehicle_type: str
     eta_pickup: float  # minutes
     eta_trip: float  # minutes
+    eta_trip_p50: Optional[float] = None  # minutes (median trip duration)
+    eta_trip_p90: Optional[float] = None  # minutes (90th percentile trip duration)
     fare_breakdown: FareBreakdown
     final_fare: float
     score: float
@@ -83,9 +125,31 @@ class RideQuoteResponse(BaseModel):
     drop: Location
     distance: float  # km
     estimated_duration: float  # minutes
+    estimated_duration_p50: Optional[float] = None  # minutes
+    estimated_duration_p90: Optional[float] = None  # minutes
     surge_multiplier: float
     surge_reason: str
-    available_vehicles: List[VehicleOption]
+    surge_version: Optional[int] = None  # Published surge snapshot used (None: computed for this request)
+    surge_age_s: Optional[float] = None  # Age of that snapshot
+    available_vehicles: List[VehicleOption]  # Ranked for user_mode ('balanced' when it is 'all')
+    rankings: Optional[Dict[str, List[VehicleOption]]] = None  # Per mode, only for user_mode 'all'
+    quote_token: Optional[str] = None  # Signed fares, redeemable at /ride/quote/redeem
+    quote_expires_at: Optional[float] = None  # Unix time the token expires
+
+
+class QuoteRedemptionRequest(BaseModel):
+    """Quote redemption request"""
+    quote_token: str
+    vehicle_id: str
+
+
+class QuoteRedemptionResponse(BaseModel):
+    """Fare locked in by a quote token"""
+    request_id: str
+    vehicle_id: str
+    final_fare: float
+    surge_multiplier: float
+    quote_expires_at: float
 
 
 class VehicleUpdateResponse(BaseModel):
@@ -94,6 +158,8 @@ class VehicleUpdateResponse(BaseModel):
     region_id: str
     current_demand: float
     surge_multiplier: float
+    surge_version: Optional[int] = None
+    surge_age_s: Optional[float] = None
     message: str
 
 
@@ -120,49 +186,351 @@ app.add_middleware(
 # Global state (in production, use Redis or database)
 # vehicle_registry replacement:
 from src.services.vehicle_store import vehicle_store
+from src.services.trip_cache import trip_cache
+from src.services.quote_cache import quote_cache, quote_signer
+from src.services.loop_monitor import loop_monitor
+from src.services.surge_engine import SurgeEngine
+from src.services.demand_estimator import live_demand
+from src.services.model_reloader import ModelSet, ModelFileWatcher, build_canary_batch, check_canary
+from src.services.shadow_evaluator import ShadowModel, ShadowEvaluator
 
-demand_model = None
-eta_model = None
-scaler = None
+# Currently served models; replaced as a whole on (re)load, never mutated
+models = ModelSet()
 
+# Readiness: models load in a background task after startup
+models_ready = False
+model_loading_task = None
+startup_timings = {
+    'import_ms': round((time.perf_counter() - _import_started) * 1000, 1),
+    'startup_hook_ms': None,
+    'models_load_ms': None,
+    'time_to_ready_ms': None,
+    'error': None
+}
 
-@app.on_event("startup")
-async def load_models():
-    """Load ML models on startup"""
-    global demand_model, eta_model, scaler
-    
-    print("Loading models...")
+# Hot reload
+model_watcher = None
+_reload_lock = None  # asyncio.Lock, created on the serving loop
+reload_history = []  # Most recent reload attempts (newest last)
+
+# Per-region surge, recomputed in the background from live supply and the served demand model
+surge_engine = SurgeEngine(lambda: models.demand_model, vehicle_store.get_all, live_demand=live_demand)
+
+
+def _compiled_predict(bundle, label: str = 'ETA model'):
+    """
+    Batch predict function for a bundle
+
+    Flattens the tree models into NumPy arrays (avoids per-call wrapper overhead).
+    Quantile models are stacked into the same forest, so one traversal yields
+    the point estimate and every quantile. Falls back to the native boosters.
+    """
+    if not USE_COMPILED_ETA:
+        return bundle.predict
+    try:
+        forest = compile_lgbm(bundle.model)
+        if bundle.quantile_models:
+            forest = stack_forests(
+                [forest] + [compile_lgbm(m) for m in bundle.quantile_models.values()]
+            )
+        print(f"✓ {label} compiled ({forest.num_trees} trees, {forest.num_nodes} nodes, "
+              f"outputs: {', '.join(bundle.output_names)})")
+        return forest.predict
+    except (ValueError, AttributeError) as e:
+        print(f"⚠ {label} compilation skipped ({e}), using the native boosters")
+        return bundle.predict
+
+
+def _load_shadow_evaluator(champion: ShadowModel) -> Optional[ShadowEvaluator]:
+    """Challenger bundle evaluated in shadow next to the champion, if one is deployed"""
+    if not os.path.isdir(SHADOW_BUNDLE_PATH):
+        return None
+    try:
+        bundle = load_eta_bundle(SHADOW_BUNDLE_PATH, expected_columns=ETA_FEATURE_COLUMNS)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"⚠ Shadow ETA bundle rejected: {e}")
+        return None
     
+    builder = EtaFeatureBuilder(feature_columns=bundle.feature_columns)
+    builder.set_standardization(bundle.mean, bundle.scale)
+    challenger = ShadowModel(bundle.version, builder, _compiled_predict(bundle, 'Shadow ETA model'))
+    shadow = ShadowEvaluator(champion, challenger)
+    print(f"✓ Shadow ETA model v{bundle.version} loaded "
+          f"(evaluated on {shadow.sample_rate:.0%} of quotes)")
+    return shadow
+
+
+def _load_models_blocking(generation: int) -> ModelSet:
+    """
+    Load every model artifact (runs in a worker thread, off the event loop)
+
+    Args:
+        generation: Sequence number of this load (0 at startup, +1 per reload)
+
+    Returns:
+        ModelSet: Fully loaded, not yet served models
+    """
     # Load demand model
     demand_model = load_demand_model()
     if demand_model:
-        print(f"✓ Demand model loaded ({len(demand_model)} region-hour slots)")
+        print(f"✓ Demand table loaded ({demand_model.n_regions} regions x 24 hours x 7 days, "
+              f"{demand_model.meta['coverage']['slot_coverage']:.0%} of slots observed)")
     else:
         print("⚠ Demand model not found, using defaults")
     
-    # Load ETA model
+    # Load pickup ETA model
+    pickup_eta = None
+    if os.path.exists(PICKUP_ETA_MODEL_PATH):
+        pickup_eta = PickupEtaModel.load(PICKUP_ETA_MODEL_PATH)
+        trained_grid = pickup_eta.meta.get('grid', city_grid.fingerprint)
+        if pickup_eta.n_regions != city_grid.n_regions or trained_grid != city_grid.fingerprint:
+            print(f"⚠ Pickup ETA model was trained on another city grid, assuming {FALLBACK_PICKUP_SPEED_KMH:.0f} km/h")
+            pickup_eta = None
+        else:
+            print(f"✓ Pickup ETA model loaded (pace table {pickup_eta.pace.shape})")
+    else:
+        print(f"⚠ Pickup ETA model not found, assuming {FALLBACK_PICKUP_SPEED_KMH:.0f} km/h")
+    
+    # Load ETA model bundle (native LightGBM model + feature schema, verified on load)
     try:
-        with open(ETA_MODEL_PATH, 'rb') as f:
-            eta_model = pickle.load(f)
-        print(f"✓ ETA model loaded from {ETA_MODEL_PATH}")
+        bundle = load_eta_bundle(ETA_BUNDLE_PATH, expected_columns=ETA_FEATURE_COLUMNS)
+        print(f"✓ ETA model bundle v{bundle.version} loaded from {ETA_BUNDLE_PATH}")
     except FileNotFoundError:
-        print(f"⚠ ETA model not found at {ETA_MODEL_PATH}")
-        eta_model = None
+        print(f"⚠ ETA model bundle not found at {ETA_BUNDLE_PATH}")
+        return ModelSet(demand_model=demand_model, pickup_eta=pickup_eta, generation=generation)
+    except ValueError as e:
+        print(f"⚠ ETA model bundle rejected: {e}")
+        return ModelSet(demand_model=demand_model, pickup_eta=pickup_eta, generation=generation)
+    model = bundle.model
+    
+    # Build the online feature builder from the bundle's feature schema
+    builder = EtaFeatureBuilder(feature_columns=bundle.feature_columns)
+    builder.set_standardization(bundle.mean, bundle.scale)
+    print("✓ ETA feature builder ready")
+    
+    # Compiled (stacked point + quantile) forest
+    predict = _compiled_predict(bundle)
+    
+    # Precomputed ETA table (rebuilt only when the bundle changes)
+    # Bulk grid evaluation goes through the native (multi-threaded) booster
+    table = None
+    if USE_ETA_TABLE:
+        table = EtaLookupTable.load_or_build(
+            ETA_TABLE_PATH,
+            model_fingerprint=file_fingerprint([
+                os.path.join(ETA_BUNDLE_PATH, name)
+                for name in sorted(os.listdir(ETA_BUNDLE_PATH))
+            ]),
+            predict_fn=bundle.predict,
+            feature_builder=builder,
+            n_vehicle_types=len(VEHICLE_TYPE_CODES),
+            step_km=ETA_TABLE_STEP_KM,
+            max_distance_km=ETA_TABLE_MAX_DISTANCE_KM
+        )
+        print(f"✓ ETA lookup table ready (max interpolation error "
+              f"{table.meta['max_interpolation_error']:.3f} min)")
+    
+    # Run predictions off the event loop. In a thread pool the native booster is
+    # preferred: it releases the GIL, while the NumPy forest's per-depth Python loop
+    # keeps contending with the event loop thread for it.
+    pool_predict = bundle.predict if INFERENCE_EXECUTOR == 'thread' else predict
+    executor = InferenceExecutor(
+        pool_predict,
+        mode=INFERENCE_EXECUTOR,
+        max_workers=INFERENCE_WORKERS,
+        bundle_path=ETA_BUNDLE_PATH,
+        use_compiled=USE_COMPILED_ETA
+    )
+    print(f"✓ Inference executor: {INFERENCE_EXECUTOR} ({INFERENCE_WORKERS} workers)")
+    
+    # Batch single-trip predictions across concurrent requests
+    batcher = None
+    if ETA_MICRO_BATCHING:
+        batcher = MicroBatcher(
+            predict,
+            max_batch_rows=ETA_BATCH_MAX_ROWS,
+            max_wait_us=ETA_BATCH_MAX_WAIT_US,
+            executor=executor
+        )
+        print(f"✓ ETA micro-batching enabled ({ETA_BATCH_MAX_ROWS} rows / {ETA_BATCH_MAX_WAIT_US:.0f} µs)")
+    
+    # Challenger model run in shadow on sampled quotes
+    shadow = _load_shadow_evaluator(ShadowModel(bundle.version, builder, predict))
+    
+    return ModelSet(
+        demand_model=demand_model,
+        pickup_eta=pickup_eta,
+        eta_model=model,
+        eta_bundle=bundle,
+        feature_builder=builder,
+        eta_predict=predict,
+        eta_table=table,
+        eta_batcher=batcher,
+        eta_executor=executor,
+        shadow=shadow,
+        generation=generation
+    )
+
+
+async def load_models():
+    """Load ML models in the background and mark the API ready when done"""
+    global models, models_ready
     
-    # Load scaler
+    print("Loading models...")
+    load_started = time.perf_counter()
     try:
-        with open(SCALER_PATH, 'rb') as f:
-            scaler = pickle.load(f)
-        print(f"✓ Feature scaler loaded from {SCALER_PATH}")
-    except FileNotFoundError:
-        print(f"⚠ Scaler not found at {SCALER_PATH}")
-        scaler = None
+        loaded = await asyncio.to_thread(_load_models_blocking, 0)
+    except Exception as e:
+        # Stay live on fallbacks rather than crash-looping the pod
+        print(f"⚠ Model loading failed ({e}), serving fallbacks")
+        startup_timings['error'] = str(e)
+        loaded = ModelSet()
     
-    print("Models loaded successfully!")
+    # A single reference swap on the loop thread, so requests never see a half-loaded set
+    models = loaded
+    models_ready = True
+    surge_engine.recompute()  # Demand model now available
+    
+    now = time.perf_counter()
+    startup_timings['models_load_ms'] = round((now - load_started) * 1000, 1)
+    startup_timings['time_to_ready_ms'] = round((now - _import_started) * 1000, 1)
+    print(f"Models loaded successfully! (ready {startup_timings['time_to_ready_ms']:.0f} ms after import)")
+    
+    if MODEL_WATCH_ENABLED and model_watcher is not None:
+        model_watcher.start()
+
+
+async def wait_until_ready(timeout: float = API_TIMEOUT_SECONDS) -> None:
+    """
+    Wait for background model loading to finish
+
+    Returns immediately when the models are loaded or loading was never started
+    (in which case requests are served with the fallbacks).
+
+    Raises:
+        HTTPException: 503 if the models are still loading after `timeout` seconds
+    """
+    if models_ready or model_loading_task is None:
+        return
+    try:
+        await asyncio.wait_for(asyncio.shield(model_loading_task), timeout=timeout)
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=503, detail="Models are still loading")
 
+
+async def reload_models(trigger: str) -> dict:
+    """
+    Load, warm and validate a new model set, then swap it in
+    
+    The current models keep serving throughout. The candidate is only swapped
+    in if its ETA predictions on a canary batch pass check_canary; requests
+    already in flight finish on the models they started with.
+    
+    Args:
+        trigger: What requested the reload ('file_watch' or 'admin')
+    
+    Returns:
+        dict: Reload report (status 'swapped' or 'rejected')
+    """
+    global models, _reload_lock
+    
+    if _reload_lock is None:
+        _reload_lock = asyncio.Lock()
+    
+    async with _reload_lock:
+        current = models
+        started = time.perf_counter()
+        report = {'trigger': trigger, 'started_at': datetime.now().isoformat()}
+        print(f"Reloading models ({trigger})...")
+        
+        candidate = None
+        try:
+            candidate = await asyncio.to_thread(_load_models_blocking, current.generation + 1)
+            
+            if current.eta_predict is not None and candidate.eta_predict is None:
+                raise ValueError("New model set has no ETA model")
+            if current.demand_model is not None and candidate.demand_model is None:
+                raise ValueError("New model set has no demand model")
+            if current.pickup_eta is not None and candidate.pickup_eta is None:
+                raise ValueError("New model set has no pickup ETA model")
+            
+            if candidate.eta_predict is not None:
+                # The canary also warms the new predict path and its worker pool
+                canary = build_canary_batch(candidate.feature_builder, len(VEHICLE_TYPE_CODES))
+                predictions = await candidate.eta_executor.predict(canary)
+                reference = None
+                if current.eta_predict is not None:
+                    reference = await asyncio.to_thread(
+                        current.eta_predict,
+                        build_canary_batch(current.feature_builder, len(VEHICLE_TYPE_CODES))
+                    )
+                report['canary'] = check_canary(predictions, reference)
+        except Exception as e:
+            if candidate is not None:
+                candidate.retire()
+            report.update(status='rejected', error=str(e))
+            print(f"⚠ Model reload rejected: {e}")
+        else:
+            # Swap: new requests see the new set; trip cache entries hold old-model durations
+            models = candidate
+            trip_cache.clear()
+            quote_cache.clear()
+            surge_engine.recompute()
+            current.retire()
+            report.update(
+                status='swapped',
+                generation=candidate.generation,
+                eta_model_version=candidate.eta_bundle.version if candidate.eta_bundle else None
+            )
+            print(f"✓ Models reloaded (generation {candidate.generation})")
+        
+        report['duration_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        reload_history.append(report)
+        del reload_history[:-10]
+        return report
+
+
+@app.on_event("startup")
+async def startup():
+    """Start serving immediately; models load in a background task"""
+    global model_loading_task, models_ready, model_watcher
+    
+    # Measure event loop blocking from the very start
+    loop_monitor.start()
+    
     # Initialize demo vehicles using the Store
     # Centered on Udupi (13.35, 74.70) as per user demo requirement
     vehicle_store.initialize_fleet(center_lat=13.35, center_lon=74.70, count=50)
+    
+    # Recompute surge for all regions in the background (fallback demand until models load)
+    surge_engine.start()
+    
+    # Watch the model files for retrained versions (started once the models are loaded)
+    model_watcher = ModelFileWatcher(
+        [ETA_BUNDLE_PATH, DEMAND_MODEL_PATH, PICKUP_ETA_MODEL_PATH, SHADOW_BUNDLE_PATH],
+        on_change=lambda: reload_models('file_watch')
+    )
+    
+    startup_timings['startup_hook_ms'] = round((time.perf_counter() - _import_started) * 1000, 1)
+    models_ready = False
+    model_loading_task = asyncio.get_running_loop().create_task(load_models())
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop background work on shutdown"""
+    global _reload_lock
+    loop_monitor.stop()
+    surge_engine.stop()
+    if model_watcher is not None:
+        model_watcher.stop()
+    if model_loading_task is not None and not model_loading_task.done():
+        model_loading_task.cancel()
+    if models.eta_executor is not None:
+        models.eta_executor.shutdown()
+    if models.shadow is not None:
+        models.shadow.stop()
+    _reload_lock = None
 
 
 @app.get("/")
@@ -173,23 +541,133 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "POST /vehicles/update": "Update vehicle location and status",
-            "POST /ride/quote": "Get ride quote with vehicle recommendations"
+            "POST /ride/quote": "Get ride quote with vehicle recommendations",
+            "GET /health/live": "Liveness probe",
+            "GET /health/ready": "Readiness probe (503 while models load)",
+            "POST /admin/reload": "Hot-reload the ETA and demand models from disk",
+            "GET /cache/stats": "Trip cache hit/miss counters",
+            "GET /inference/stats": "ETA micro-batching, executor and event loop blocking metrics",
+            "GET /surge": "Latest published surge multipliers per region"
         }
     }
 
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint"""
+    """Health check endpoint (liveness, readiness and startup timings)"""
     return {
         "status": "healthy",
+        "ready": models_ready,
         "models_loaded": {
-            "demand_model": demand_model is not None,
-            "eta_model": eta_model is not None,
-            "scaler": scaler is not None
+            "demand_model": models.demand_model is not None,
+            "eta_model": models.eta_model is not None,
+            "pickup_eta_model": models.pickup_eta is not None,
+            "eta_table": models.eta_table is not None
         },
-        "vehicles_registered": len(vehicle_store.get_all())
+        "model_generation": models.generation,
+        "models_loaded_at": models.loaded_at,
+        "last_reload": reload_history[-1] if reload_history else None,
+        "eta_bundle": models.eta_bundle.info() if models.eta_bundle is not None else None,
+        "vehicles_registered": len(vehicle_store.get_all()),
+        "startup": startup_timings
+    }
+
+
+@app.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving requests"""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """Readiness probe: 503 until the models have finished loading"""
+    if not models_ready:
+        return JSONResponse(status_code=503, content={"ready": False, "startup": startup_timings})
+    return {"ready": True, "startup": startup_timings}
+
+
+@app.post("/admin/reload")
+async def admin_reload():
+    """Reload the ETA and demand models from disk without restarting"""
+    if not models_ready and model_loading_task is not None:
+        raise HTTPException(status_code=503, detail="Models are still loading")
+    
+    report = await reload_models('admin')
+    if report['status'] != 'swapped':
+        raise HTTPException(status_code=422, detail=f"Reload rejected: {report['error']}")
+    return report
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Trip and quote cache sizes and hit/miss counters"""
+    return {"trip_cache": trip_cache.stats(), "quote_cache": quote_cache.stats()}
+
+
+@app.get("/inference/stats")
+async def inference_stats():
+    """ETA batching, executor and event loop blocking metrics"""
+    return {
+        "executor": models.eta_executor.info() if models.eta_executor is not None else None,
+        "micro_batching": models.eta_batcher.stats() if models.eta_batcher is not None else None,
+        "shadow": models.shadow.stats() if models.shadow is not None else None,
+        "event_loop": loop_monitor.stats()
+    }
+
+
+def _region_surge(lat: float, lon: float, hour: int, day_of_week: int, demand_model):
+    """
+    Surge at a location: O(1) read of the multiplier published for its supply
+    cell, or for quotes at another hour/day than the snapshot's, the demand of
+    that slot against the snapshot's current supply around the location
+    (including vehicles across region boundaries).
+    
+    Returns:
+        tuple: (surge_multiplier, reason, snapshot or None, surge version of the cell or None)
+    """
+    snapshot = surge_engine.snapshot
+    if snapshot is None:
+        # Nothing published yet (startup): no supply to compare demand with
+        return DEFAULT_SURGE, "Normal demand", None, None
+    
+    supply_grid = snapshot.supply_grid
+    cell = int(supply_grid.cell_ids([lat], [lon])[0])
+    if snapshot.covers(hour, day_of_week):
+        surge, reason = snapshot.lookup(cell)
+        return surge, reason, snapshot, int(snapshot.cell_versions[cell])
+    
+    region = int(supply_grid.cell_regions[cell])
+    supply = float(supply_grid.supply_at(snapshot.supply_table, cell, region))
+    surge, reason = get_surge_with_fallback(
+        region, hour, max(supply, 1.0), demand_model, day_of_week=day_of_week
+    )
+    return surge, reason, None, None
+
+
+@app.get("/surge")
+async def surge_status():
+    """
+    Latest published surge snapshot: multiplier and supply per region (at its
+    center) and the multiplier grid quotes are priced from (cell_multipliers,
+    rows south to north, columns west to east)
+    """
+    stats = surge_engine.stats()
+    stats['live_demand'] = live_demand.stats()
+    stats['live_demand']['counts'] = {
+        format_region_id(region): count for region, count in enumerate(stats['live_demand']['counts'])
     }
+    if stats['version'] is not None:
+        stats['multipliers'] = {
+            format_region_id(region): multiplier for region, multiplier in enumerate(stats['multipliers'])
+        }
+        stats['supply'] = {
+            format_region_id(region): supply for region, supply in enumerate(stats['supply'])
+        }
+        stats['effective_supply'] = {
+            format_region_id(region): supply for region, supply in enumerate(stats['effective_supply'])
+        }
+    return stats
 
 
 @app.post("/vehicles/update", response_model=VehicleUpdateResponse)
@@ -212,39 +690,110 @@ async def update_vehicle(vehicle: VehicleUpdate):
     # In this demo, we assume vehicles are pre-seeded or we'd add an 'upsert' logic.
     
     # Determine region
-    region_id = get_region_id(vehicle.location.lat, vehicle.location.lon)
+    region = get_region_index(vehicle.location.lat, vehicle.location.lon)
     
     # Get current hour
-    current_hour = datetime.now().hour
-    
-    # Count available vehicles in region
-    all_vehicles = vehicle_store.get_all()
-    available_in_region = sum(
-        1 for v in all_vehicles
-        if v['status'] == 'available' and 
-        get_region_id(v['location']['lat'], v['location']['lon']) == region_id
-    )
+    now = datetime.now()
     
     # Get surge for this region
-    surge, _ = get_surge_with_fallback(
-        region_id, current_hour, available_in_region, demand_model
+    surge, _, snapshot, _ = _region_surge(
+        vehicle.location.lat, vehicle.location.lon, now.hour, now.weekday(), models.demand_model
     )
     
-    # Mock nearby requests (in production, query from database)
-    nearby_requests = max(0, int(np.random.normal(5, 2)))
-    
-    # Calculate current demand (mock - in production would be from database)
-    current_demand = min(1.0, max(0.1, nearby_requests / 10.0)) if demand_model else 0.5
+    # Current demand: live quote rate blended with the demand table (as a 0-1 score)
+    if snapshot is not None:
+        current_demand = min(1.0, snapshot.demand_rates[region] / PEAK_DEMAND_RIDES)
+    else:
+        current_demand = get_demand_score(region, now.hour, models.demand_model, now.weekday())
     
     return VehicleUpdateResponse(
         vehicle_id=vehicle.vehicle_id,
-        region_id=region_id,
+        region_id=format_region_id(region),
         current_demand=round(current_demand, 2),
         surge_multiplier=round(surge, 1),
+        surge_version=snapshot.version if snapshot else None,
+        surge_age_s=round(snapshot.age_s, 3) if snapshot else None,
         message="Vehicle updated successfully"
     )
 
 
+async def _predict_durations(
+    state: ModelSet,
+    distance: float,
+    hour: int,
+    day_of_week: int,
+    vehicle_types: List[str]
+) -> Dict[str, Dict[str, float]]:
+    """
+    Predict trip duration (minutes) and its quantiles for each vehicle type in one model call
+    
+    Args:
+        state: Model set the request started with
+        distance: Trip distance in kilometers
+        hour: Hour of day (0-23)
+        day_of_week: Day of week (0=Monday)
+        vehicle_types: Vehicle types to predict for
+    
+    Returns:
+        dict: vehicle_type -> {'duration': point estimate, 'p50': ..., 'p90': ...}
+              (quantiles only when the ETA bundle has quantile models)
+    """
+    if not vehicle_types:
+        return {}
+    
+    vehicle_codes = [VEHICLE_TYPE_CODES[vehicle_type] for vehicle_type in vehicle_types]
+    output_names = state.eta_bundle.output_names if state.eta_bundle is not None else ['duration']
+    
+    # Predict trip duration using ETA model
+    if state.eta_table is not None and state.eta_table.covers(distance):
+        # O(1) interpolation in the precomputed table
+        predictions = state.eta_table.lookup(distance, hour, day_of_week, vehicle_codes)
+    elif state.eta_predict and state.feature_builder:
+        # One row per vehicle type so the model runs once for all candidates
+        features = state.feature_builder.build(distance, hour, day_of_week, vehicle_codes)
+        
+        # Predict durations (single batched call, shared with concurrent requests if enabled)
+        if state.eta_batcher is not None:
+            predictions = await state.eta_batcher.predict(features)
+        elif state.eta_executor is not None:
+            predictions = await state.eta_executor.predict(features)
+        else:
+            predictions = state.eta_predict(features)
+    else:
+        # Fallback: simple estimation
+        output_names = ['duration']
+        predictions = [distance / 0.5] * len(vehicle_types)  # Assume 30 km/h average speed
+    
+    # One row per vehicle type, one column per output (point estimate, then quantiles)
+    predictions = np.asarray(predictions, dtype=np.float64).reshape(len(vehicle_types), -1)
+    if predictions.shape[1] > 2:
+        # Independently trained quantile models can cross; keep p50 <= p90
+        predictions[:, 1:] = np.maximum.accumulate(predictions[:, 1:], axis=1)
+    
+    return {
+        vehicle_type: dict(zip(output_names, row))
+        for vehicle_type, row in zip(vehicle_types, predictions.tolist())
+    }
+
+
+def _round_minutes(value: Optional[float]) -> Optional[float]:
+    return round(value, 1) if value is not None else None
+
+
+def _sign_quote(request_id: str, surge: float, option_lists) -> Tuple[str, float]:
+    """
+    Issue a quote token for the fares of every listed vehicle option
+
+    Returns:
+        tuple: (token, expires_at unix time)
+    """
+    return quote_signer.issue({
+        'request_id': request_id,
+        'surge_multiplier': surge,
+        'fares': {option.vehicle_id: option.final_fare for options in option_lists for option in options}
+    })
+
+
 @app.post("/ride/quote", response_model=RideQuoteResponse)
 async def get_ride_quote(request: RideQuoteRequest):
     """
@@ -252,6 +801,9 @@ async def get_ride_quote(request: RideQuoteRequest):
     """
     print(f"DEBUG: /ride/quote called with pickup={request.pickup}, drop={request.drop}, mode={request.user_mode}")
     
+    # Generate request ID (also keys the shadow log)
+    request_id = f"REQ_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+    
     # Parse timestamp
     if request.timestamp:
         try:
@@ -261,72 +813,33 @@ async def get_ride_quote(request: RideQuoteRequest):
     else:
         request_time = datetime.now()
     
-    # 1. Calculate trip distance
-    distance = haversine_distance(
+    # 1. Extract temporal features
+    hour = request_time.hour
+    day_of_week = request_time.weekday()
+    
+    # Trip distance and per-type durations only depend on the trip cell pair and time bucket
+    cache_key = trip_cache.make_key(
         request.pickup.lat, request.pickup.lon,
-        request.drop.lat, request.drop.lon
+        request.drop.lat, request.drop.lon,
+        hour, day_of_week
     )
     
-    # 2. Extract temporal features
-    hour = request_time.hour
-    day_of_week = request_time.weekday()
-    day_of_month = request_time.day
-    month = request_time.month
-    
-    # Calculate temporal flags
-    is_rush_hour = 1 if (7 <= hour < 10) or (17 <= hour < 20) else 0
-    is_morning_rush = 1 if 7 <= hour < 10 else 0
-    is_evening_rush = 1 if 17 <= hour < 20 else 0
-    is_weekend = 1 if day_of_week >= 5 else 0
-    is_late_night = 1 if hour >= 23 or hour < 5 else 0
-
-    
-    # 3. Predict trip duration using ETA model
-    if eta_model and scaler:
-        # Prepare features (must match training order - 9 features)
-        features = np.array([[
-            distance,
-            hour,
-            day_of_week,
-            is_rush_hour,
-            is_weekend,         # Moved up
-            is_morning_rush,
-            is_evening_rush,
-            is_late_night,
-            1  # vehicle_encoded
-        ]])
-        
-        # Prepare features DataFrame
-        feature_names = [
-            'trip_distance', 'hour', 'day_of_week', 'is_rush_hour', 
-            'is_weekend', 'is_morning_rush', 'is_evening_rush', 
-            'is_late_night', 'vehicle_encoded'
-        ]
-
-        
-        try:
-            features_df = pd.DataFrame(features, columns=feature_names)
-            features_scaled = scaler.transform(features_df)
-        except Exception as e:
-            print(f"Warning: transformation failed with DataFrame ({e}), falling back to numpy array")
-            features_scaled = scaler.transform(features)
-        
-        # Predict duration
-        duration = eta_model.predict(features_scaled)[0]
-    else:
-        # Fallback: simple estimation
-        duration = distance / 0.5  # Assume 30 km/h average speed
+    # Every distinct trip counts as demand in its pickup region (including ones no vehicle
+    # can serve); refreshes and mode toggles re-quote the same trip key and are not recounted
+    pickup_region = get_region_index(request.pickup.lat, request.pickup.lon)
+    live_demand.record(pickup_region, intent=cache_key)
     
-    # 4. Determine pickup region and surge
-    pickup_region = get_region_id(request.pickup.lat, request.pickup.lon)
+    # Hold the request while models are still loading (503 after API_TIMEOUT_SECONDS),
+    # (so fallback durations computed mid-load never reach the trip cache)
+    await wait_until_ready()
     
-    # Count available vehicles in region
-    all_vehicles = vehicle_store.get_all()
-    available_in_region = sum(
-        1 for v in all_vehicles
-        if v['status'] == 'available' and 
-        get_region_id(v['location']['lat'], v['location']['lon']) == pickup_region
-    )
+    # Every model used by this request comes from this one snapshot,
+    # so a hot reload mid-request cannot mix old and new models
+    state = models
+    
+    # 2. Determine surge for the pickup (an O(1) read of the published snapshot)
+    surge_snapshot = None
+    surge_version = None
     
     # DEMO HACK: Force specific pricing for demo locations
     # "Manipal University" -> High Demand (Student Rush)
@@ -344,11 +857,48 @@ async def get_ride_quote(request: RideQuoteRequest):
         surge_reason = "Low Demand (Promotion)"
     else:
         # Standard logic
-        surge, surge_reason = get_surge_with_fallback(
-            pickup_region, hour, max(available_in_region, 1), demand_model
+        surge, surge_reason, surge_snapshot, surge_version = _region_surge(
+            request.pickup.lat, request.pickup.lon, hour, day_of_week, state.demand_model
         )
     
-    # 5. Find available vehicles and calculate costs
+    # Refreshes and mode toggles under an unchanged surge are served from the quote cache
+    # (only for published surge: a new surge version for the pickup cell invalidates the entry)
+    quote_key = quote_cache.make_key(
+        request.pickup.lat, request.pickup.lon,
+        request.drop.lat, request.drop.lon,
+        request.user_mode, hour, day_of_week, surge
+    )
+    if surge_version is not None:
+        cached_quote = quote_cache.get(quote_key, surge_version)
+        if cached_quote is not None:
+            # Same prices, but each response gets its own request id and token
+            quote_token, quote_expires_at = _sign_quote(
+                request_id, cached_quote.surge_multiplier,
+                [cached_quote.available_vehicles, *(cached_quote.rankings or {}).values()]
+            )
+            return cached_quote.model_copy(update={
+                'request_id': request_id,
+                'pickup': request.pickup,
+                'drop': request.drop,
+                'quote_token': quote_token,
+                'quote_expires_at': quote_expires_at
+            })
+    
+    # 3. Trip distance (per-type durations are cached alongside it)
+    # Refreshes and mode toggles are served from the trip cache
+    cached_trip = trip_cache.get(cache_key)
+    
+    if cached_trip is not None:
+        distance = cached_trip['distance']
+        durations = dict(cached_trip['durations'])
+    else:
+        distance = float(haversine_distance(
+            request.pickup.lat, request.pickup.lon,
+            request.drop.lat, request.drop.lon
+        ))
+        durations = {}
+    
+    # 4. Find available vehicles
     # Use VehicleStore proximity search (optimised)
     nearby_vehicles = vehicle_store.get_nearby(
         lat=request.pickup.lat,
@@ -356,74 +906,142 @@ async def get_ride_quote(request: RideQuoteRequest):
         radius_km=15.0
     )
     
-    available_vehicles = []
-    
-    for vehicle_data in nearby_vehicles:
-        vehicle_id = vehicle_data['id']
-        
-        # Calculate pickup ETA (already filtered by distance, but calculating exact)
-        pickup_distance = haversine_distance(
-            vehicle_data['location']['lat'],
-            vehicle_data['location']['lon'],
-            request.pickup.lat,
-            request.pickup.lon
-        )
-        
-        # Estimate pickup time (assume 40 km/h in city)
-        eta_pickup = (pickup_distance / 40.0) * 60  # minutes
-        
-        # Calculate fare
-        fare = calculate_fare(
-            distance, duration, vehicle_data['vehicle_type'], surge
-        )
-        
-        available_vehicles.append({
-            'id': vehicle_id,
-            'vehicle_type': vehicle_data['vehicle_type'],
-            'eta_pickup': eta_pickup,
-            'trip_cost': fare['final_fare'],
-            'fare_breakdown': fare
-        })
-    
     # Check if any vehicles available
-    if not available_vehicles:
+    if not nearby_vehicles:
         raise HTTPException(
             status_code=404,
             detail="No vehicles available in your area"
         )
     
-    # 6. Rank vehicles by user preference
-    ranked_vehicles = rank_vehicles(
-        available_vehicles,
-        user_mode=request.user_mode,
+    # Predict trip duration for every vehicle type among the candidates
+    # (one model call covers all types not already cached)
+    candidate_types = sorted({v['vehicle_type'] for v in nearby_vehicles})
+    missing_types = [t for t in candidate_types if t not in durations]
+    if missing_types:
+        durations.update(await _predict_durations(state, distance, hour, day_of_week, missing_types))
+        if state is models:  # don't cache old-model durations after a reload
+            trip_cache.put(cache_key, {'distance': distance, 'durations': durations})
+    
+    # Sampled quotes are re-run on the challenger model in the background
+    if state.shadow is not None:
+        state.shadow.submit(
+            request_id, distance, hour, day_of_week,
+            {t: durations[t] for t in candidate_types}
+        )
+    
+    # 5. Pickup ETA for all candidates in one vectorized call
+    vehicle_lats = np.array([v['location']['lat'] for v in nearby_vehicles])
+    vehicle_lons = np.array([v['location']['lon'] for v in nearby_vehicles])
+    pickup_distances = haversine_distance(
+        vehicle_lats, vehicle_lons, request.pickup.lat, request.pickup.lon
+    )
+    type_codes = np.array([VEHICLE_TYPE_CODES[v['vehicle_type']] for v in nearby_vehicles])
+    if state.pickup_eta is not None:
+        # Learned pace for each vehicle's region, the hour and its vehicle type
+        eta_pickups = state.pickup_eta.predict(
+            pickup_distances,
+            get_region_ids(vehicle_lats, vehicle_lons),
+            hour,
+            type_codes
+        )
+    else:
+        eta_pickups = pickup_distances / FALLBACK_PICKUP_SPEED_KMH * 60  # minutes
+    
+    # Fare for every candidate in one vectorized call, from its type's trip duration
+    # (breakdown dicts are only built for the vehicles in the response)
+    type_durations = np.zeros(len(VEHICLE_TYPE_CODES))
+    for vehicle_type in candidate_types:
+        type_durations[VEHICLE_TYPE_CODES[vehicle_type]] = durations[vehicle_type]['duration']
+    eta_trips = type_durations[type_codes]
+    fares = calculate_fares(distance, eta_trips, type_codes, surge)
+    
+    # 6. Rank the candidate columns by user preference (the vehicle dicts are read-only)
+    # ('all' scores every mode from the same normalized features in one product)
+    user_modes = list(USER_MODE_WEIGHTS) if request.user_mode == 'all' else [request.user_mode]
+    primary_mode = 'balanced' if request.user_mode == 'all' else request.user_mode
+    rankings = rank_candidates_by_mode(
+        eta_pickups,
+        fares['final_fare'],
+        type_codes,
+        user_modes=user_modes,
         top_k=TOP_K_VEHICLES
     )
     
     # 7. Format response
-    vehicle_options = []
-    for v in ranked_vehicles:
-        vehicle_options.append(VehicleOption(
-            vehicle_id=v['id'],
-            vehicle_type=v['vehicle_type'],
-            eta_pickup=round(v['eta_pickup'], 1),
-            eta_trip=round(duration, 1),
-            fare_breakdown=FareBreakdown(**v['fare_breakdown']),
-            final_fare=v['trip_cost'],
-            score=round(v['final_score'], 3)
-        ))
+    mode_options = {}
+    for mode, (ranked_indices, ranked_scores) in rankings.items():
+        mode_options[mode] = []
+        for i, score in zip(ranked_indices.tolist(), ranked_scores.tolist()):
+            vehicle_type = nearby_vehicles[i]['vehicle_type']
+            trip = durations[vehicle_type]
+            mode_options[mode].append(VehicleOption(
+                vehicle_id=nearby_vehicles[i]['id'],
+                vehicle_type=vehicle_type,
+                eta_pickup=round(float(eta_pickups[i]), 1),
+                eta_trip=round(trip['duration'], 1),
+                eta_trip_p50=_round_minutes(trip.get('p50')),
+                eta_trip_p90=_round_minutes(trip.get('p90')),
+                fare_breakdown=FareBreakdown(**fare_breakdown(fares, i)),
+                final_fare=float(fares['final_fare'][i]),
+                score=round(score, 3)
+            ))
+    vehicle_options = mode_options[primary_mode]
+    
+    # Headline duration (and its quantiles) is the trip time of the top recommendation
+    top = durations[nearby_vehicles[rankings[primary_mode][0][0]]['vehicle_type']]
     
-    # Generate request ID
-    request_id = f"REQ_{datetime.now().strftime('%Y%m%d%H%M%S')}_{np.random.randint(1000, 9999)}"
+    # Signed token a booking can redeem for exactly these fares
+    quote_token, quote_expires_at = _sign_quote(request_id, surge, mode_options.values())
     
-    return RideQuoteResponse(
+    response = RideQuoteResponse(
         request_id=request_id,
         pickup=request.pickup,
         drop=request.drop,
         distance=round(distance, 2),
-        estimated_duration=round(duration, 1),
+        estimated_duration=round(top['duration'], 1),
+        estimated_duration_p50=_round_minutes(top.get('p50')),
+        estimated_duration_p90=_round_minutes(top.get('p90')),
         surge_multiplier=surge,
         surge_reason=surge_reason,
-        available_vehicles=vehicle_options
+        surge_version=surge_snapshot.version if surge_snapshot else None,
+        surge_age_s=round(surge_snapshot.age_s, 3) if surge_snapshot else None,
+        available_vehicles=vehicle_options,
+        rankings=mode_options if request.user_mode == 'all' else None,
+        quote_token=quote_token,
+        quote_expires_at=quote_expires_at
+    )
+    if surge_version is not None and state is models:
+        quote_cache.put(quote_key, surge_version, response)
+    return response
+
+
+@app.post("/ride/quote/redeem", response_model=QuoteRedemptionResponse)
+async def redeem_quote(request: QuoteRedemptionRequest):
+    """
+    Redeem a quote token for the fare it quoted for one vehicle, without recomputing the quote
+
+    Redemption is a stateless price lookup (it reserves nothing), so a token can be
+    redeemed more than once until it expires and always returns the same fare.
+    Every quote response, cached or not, carries its own request_id and token,
+    so a booking flow that must charge once can dedupe on the request_id.
+    """
+    try:
+        quote = quote_signer.verify(request.quote_token)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    if request.vehicle_id not in quote['fares']:
+        raise HTTPException(status_code=400, detail=f"Vehicle {request.vehicle_id} is not part of this quote")
+    vehicle = vehicle_store.get_vehicle(request.vehicle_id)
+    if vehicle is None or vehicle['status'] != 'available':
+        raise HTTPException(status_code=409, detail=f"Vehicle {request.vehicle_id} is no longer available")
+    
+    return QuoteRedemptionResponse(
+        request_id=quote['request_id'],
+        vehicle_id=request.vehicle_id,
+        final_fare=quote['fares'][request.vehicle_id],
+        surge_multiplier=quote['surge_multiplier'],
+        quote_expires_at=quote['expires_at']
     )
 
 
@@ -6,6 +6,13 @@ Configuration for AI Vehicle Matching System
 # PRICING CONFIGURATION
 # ============================================================================
 
+# Label encoding of vehicle types (matches LabelEncoder order used in training)
+VEHICLE_TYPE_CODES = {
+    'economy': 0,
+    'sedan': 1,
+    'suv': 2
+}
+
 # Base fares by vehicle type (USD)
 # Base fares by vehicle type (INR)
 VEHICLE_BASE_FARES = {
@@ -54,6 +61,33 @@ SURGE_MULTIPLIERS = {
     'high': 1.5        # 50% surge (capped)
 }
 
+# Demand score thresholds of the demand-only surge tiers precomputed per
+# (region, hour, day) slot: score < 0.3 → discount, < 0.7 → normal,
+# < 0.85 → moderate, else high (tiers in SURGE_MULTIPLIERS order)
+DEMAND_TIER_THRESHOLDS = [0.3, 0.7, 0.85]
+
+# Surge for every region is recomputed in the background from live supply and
+# demand this often; quotes read the latest published multipliers
+SURGE_REFRESH_INTERVAL_S = 2.0
+
+# Live demand: distinct /ride/quote trips per pickup region over a sliding window
+# (ring buffer of LIVE_DEMAND_BUCKET_S buckets), blended with the demand table's
+# historical rate as LIVE_DEMAND_PRIOR_QUOTES pseudo-quotes. Repeat quotes for the
+# same snapped pickup/drop within the window are not recounted, so the live rate is
+# prospective rides/hour, the unit of the demand table prior.
+LIVE_DEMAND_WINDOW_S = 900.0
+LIVE_DEMAND_BUCKET_S = 30.0
+LIVE_DEMAND_PRIOR_QUOTES = 20.0
+
+# Neighbor-aware supply: available vehicles are counted on a fine grid
+# (SUPPLY_SUBDIVISIONS x SUPPLY_SUBDIVISIONS cells per region, ~0.45 km cells)
+# and supply at a pickup is the distance-weighted count in square rings of
+# cells around it: weight 1.0 in the pickup cell, 0.75 one ring out, 0.5 two out.
+# Surge is published per cell. With a split city grid, subdivisions is rounded
+# up to a multiple of 2**max_depth so that no cell straddles two regions.
+SUPPLY_SUBDIVISIONS = 5
+SUPPLY_RING_WEIGHTS = [1.0, 0.75, 0.5]
+
 # ============================================================================
 # VEHICLE RANKING CONFIGURATION
 # ============================================================================
@@ -97,6 +131,29 @@ MAX_SEARCH_RADIUS_KM = 15.0
 # API response timeout (seconds)
 API_TIMEOUT_SECONDS = 10.0
 
+# Event loop block monitor: wakes every interval and counts wake-ups later
+# than the threshold as the loop being blocked
+LOOP_MONITOR_INTERVAL_MS = 10.0
+LOOP_BLOCK_THRESHOLD_MS = 5.0
+
+# ============================================================================
+# CACHING CONFIGURATION
+# ============================================================================
+
+# Trip cache (distance + predicted duration per snapped pickup/drop pair)
+TRIP_CACHE_MAX_SIZE = 10000      # Max entries before LRU eviction
+TRIP_CACHE_TTL_SECONDS = 300.0   # Entries older than this are recomputed
+TRIP_CACHE_CELL_DEGREES = 0.001  # Coordinate snap size (~110 m)
+
+# Quote cache (full /ride/quote responses per snapped pickup/drop, user mode and surge;
+# dropped when the pickup region's surge version changes)
+QUOTE_CACHE_MAX_SIZE = 5000
+QUOTE_CACHE_TTL_SECONDS = 30.0
+
+# Signed quote tokens: a booking can redeem the quoted fare until the token expires
+# (signed with the QUOTE_TOKEN_SECRET environment variable)
+QUOTE_TOKEN_TTL_SECONDS = 120.0
+
 # ============================================================================
 # SPATIAL CONFIGURATION
 # ============================================================================
@@ -108,6 +165,13 @@ CITY_MIN_LON = 74.6900
 CITY_MAX_LON = 74.7900
 GRID_SIZE = 5  # 5x5 grid = 25 regions
 
+# Multi-resolution city grid: each base cell is split quadtree-style (up to
+# CITY_GRID_MAX_DEPTH times) while it holds more than CITY_GRID_SPLIT_RIDES
+# historical pickups. Built by scripts/build_city_grid.py (CITY_GRID_PATH);
+# without it the uniform GRID_SIZE x GRID_SIZE grid is used.
+CITY_GRID_MAX_DEPTH = 2
+CITY_GRID_SPLIT_RIDES = 800
+
 # ============================================================================
 # MODEL PATHS
 # ============================================================================
@@ -117,10 +181,70 @@ import os
 # Get the project root directory (where config.py is located)
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 
-# Model paths (absolute paths from project root)
+# Legacy pickles still written by scripts/train_eta_models.py. The API serves ETA_BUNDLE_PATH;
+# these are only inputs for export_eta_bundle.py, test_rush_hour.py and generate_analysis_report.py.
 ETA_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'eta_lgbm.pkl')
 SCALER_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'feature_scaler.pkl')
-DEMAND_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'demand_model.pkl')
+
+# Saved city grid (regions shared by demand estimation, surge and supply counting)
+CITY_GRID_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'city_grid.json')
+
+# Demand table: score, surge tier and ride count per (region, hour, day of week),
+# memory-mapped from a structured .npy (+ .json sidecar) written by scripts/estimate_demand.py.
+# A warning is logged when fewer slots than DEMAND_MIN_COVERAGE were observed.
+DEMAND_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'demand_table.npy')
+DEMAND_MIN_COVERAGE = 0.5
+
+# Versioned ETA bundle served by the API (LightGBM text model + JSON feature schema)
+ETA_BUNDLE_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'eta_bundle')
+
+# Pickup ETA model: learned pace (min/km) per region, hour and vehicle type
+# (scripts/train_pickup_eta_model.py). Without it, pickup ETAs assume
+# FALLBACK_PICKUP_SPEED_KMH.
+PICKUP_ETA_MODEL_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'pickup_eta.npz')
+FALLBACK_PICKUP_SPEED_KMH = 40.0
+
+# Quantile levels trained alongside the point ETA model and served as
+# p50/p90 trip durations (evaluated in the same pass as the point model)
+ETA_QUANTILES = [0.5, 0.9]
+
+# Serve the ETA model from flattened NumPy tree arrays instead of LGBMRegressor.predict
+USE_COMPILED_ETA = True
+
+# Optional precomputed ETA table: model output over a distance grid for every
+# (hour, day_of_week, vehicle type), memory-mapped and interpolated per quote.
+# Regenerated automatically when the model/scaler files change.
+USE_ETA_TABLE = False
+ETA_TABLE_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'eta_table.npy')
+ETA_TABLE_STEP_KM = 0.05
+ETA_TABLE_MAX_DISTANCE_KM = 30.0
+
+# Micro-batching of ETA predictions across concurrent quote requests:
+# a batch is flushed at ETA_BATCH_MAX_ROWS rows or after ETA_BATCH_MAX_WAIT_US
+ETA_MICRO_BATCHING = True
+ETA_BATCH_MAX_ROWS = 256
+ETA_BATCH_MAX_WAIT_US = 1000.0
+
+# Where model inference runs: 'inline' (on the event loop), 'thread' (thread pool,
+# native LightGBM booster which releases the GIL) or 'process' (process pool,
+# ETA model loaded once per worker)
+INFERENCE_EXECUTOR = 'thread'
+INFERENCE_WORKERS = 2
+
+# Hot reload: poll the ETA bundle, pickup ETA and demand model files and swap in new models
+# without a restart (also available via POST /admin/reload). A new model is only
+# swapped in if its predictions on a canary batch are finite and in (0, max] minutes.
+MODEL_WATCH_ENABLED = True
+MODEL_WATCH_INTERVAL_S = 5.0
+CANARY_MAX_DURATION_MIN = 600.0
+
+# Shadow evaluation: when a challenger bundle exists, it is run off the request
+# path on a sampled fraction of quotes and its predictions are logged next to
+# the served ones (reports: scripts/shadow_report.py)
+SHADOW_BUNDLE_PATH = os.path.join(PROJECT_ROOT, 'models', 'saved', 'eta_bundle_shadow')
+SHADOW_SAMPLE_RATE = 0.1
+SHADOW_QUEUE_SIZE = 1000
+SHADOW_LOG_PATH = os.path.join(PROJECT_ROOT, 'logs', 'shadow_eta.jsonl')
 
 # ============================================================================
 # LOGGING CONFIGURATION
@@ -0,0 +1,112 @@
+"""
+Pricing Backtest
+
+Replays historical rides through surge pricing for a grid of parameter sets
+around the current config (SURGE_THRESHOLDS, SURGE_MULTIPLIERS, SURGE_CAP)
+and reports revenue and surge-tier frequencies overall and per region and hour.
+
+Usage:
+    python scripts/backtest_pricing.py [--data rides.csv] [--threshold-scales 0.8 1.0 1.25]
+        [--multiplier-scales 1.0 1.5] [--caps 1.5 2.0] [--supply 2.0] [--workers N]
+        [--demand table|rides]
+
+Historical supply is not logged, so every region is assumed to have
+--supply available vehicles. With --demand table (default), demand is the
+served demand table's score for the ride's region, hour and day, as live
+pricing computes it before blending in live quotes (which are not logged
+either). With --demand rides, demand is the rides actually requested in the
+region during the same clock hour. Rides with an unknown vehicle type are
+skipped and counted in the report.
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import DEMAND_MODEL_PATH
+from src.evaluation.metrics import save_metrics
+from src.evaluation.pricing_backtest import (
+    current_parameters,
+    parameter_grid,
+    run_backtest,
+    summarize_backtest,
+    backtest_by_region_hour
+)
+from src.pricing.dynamic_pricing import load_demand_model
+
+DEMAND_NOTES = {
+    'demand_table': "Demand per ride is the served demand table's score for its (region, hour, day of week) "
+                    "times PEAK_DEMAND_RIDES, as in live pricing without live quote blending "
+                    "(historical quote counts are not logged). Supply is the assumed supply_per_region.",
+    'hourly_rides': "Demand per ride is the realized rides in its region during the same clock hour, "
+                    "not the served demand-score path, so revenue differs from what live pricing would "
+                    "have charged. Supply is the assumed supply_per_region."
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data/raw/rides.csv', help='Rides CSV')
+    parser.add_argument('--threshold-scales', type=float, nargs='+', default=[0.8, 1.0, 1.25])
+    parser.add_argument('--multiplier-scales', type=float, nargs='+', default=[0.5, 1.0, 1.5])
+    parser.add_argument('--caps', type=float, nargs='+', default=[1.5, 2.0])
+    parser.add_argument('--supply', type=float, default=2.0, help='Available vehicles assumed per region')
+    parser.add_argument('--chunksize', type=int, default=500_000, help='Rows read per chunk')
+    parser.add_argument('--workers', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--demand', choices=['table', 'rides'], default='table',
+                        help='Demand from the served demand table or from realized hourly rides')
+    parser.add_argument('--output', default='reports/pricing_backtest.json')
+    parser.add_argument('--region-hour-output', default='reports/pricing_backtest_region_hour.csv')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("PRICING BACKTEST")
+    print("=" * 80)
+
+    param_sets = parameter_grid(args.threshold_scales, args.multiplier_scales, args.caps)
+    demand_table = None
+    if args.demand == 'table':
+        demand_table = load_demand_model(DEMAND_MODEL_PATH)
+        if demand_table is None:
+            print("⚠ No usable demand table, using realized hourly rides as demand")
+    print(f"\nReplaying {args.data} for {len(param_sets)} parameter sets "
+          f"(supply {args.supply} vehicles/region)...")
+    result = run_backtest(
+        args.data, param_sets, supply_per_region=args.supply,
+        chunksize=args.chunksize, n_workers=args.workers, demand_table=demand_table
+    )
+    summary = summarize_backtest(result)
+
+    print(f"Rides replayed: {int(result['rides'].sum())} (demand: {result['demand_source']})")
+    if result['skipped_rides']:
+        print(f"⚠ Skipped {result['skipped_rides']} rides with an unknown vehicle type")
+    print()
+    current = current_parameters()
+    for row in summary.sort_values('revenue', ascending=False).itertuples():
+        marker = '*' if (row.thresholds, row.multipliers, row.cap) == (
+            current['thresholds'], current['multipliers'], current['cap']) else ' '
+        print(f"{marker} #{row.param_set:<3} thresholds {row.thresholds} multipliers {row.multipliers} "
+              f"cap {row.cap}: revenue {row.revenue:,.0f} ({row.revenue_vs_no_surge_pct:+.1f}% vs no surge), "
+              f"mean surge {row.mean_surge:.3f}, surged {row.moderate_share + row.high_share:.1%}")
+    print("\n* current config")
+
+    save_metrics({
+        'data': args.data,
+        'supply_per_region': args.supply,
+        'demand_source': result['demand_source'],
+        'demand_note': DEMAND_NOTES[result['demand_source']],
+        'rides': int(result['rides'].sum()),
+        'skipped_rides': int(result['skipped_rides']),
+        'current_parameters': current,
+        'parameter_sets': summary.to_dict(orient='records')
+    }, args.output)
+
+    backtest_by_region_hour(result).to_csv(args.region_hour_output, index=False)
+    print(f"✓ Per region/hour results saved to: {args.region_hour_output}")
+
+
+if __name__ == '__main__':
+    main()
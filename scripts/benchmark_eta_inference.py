@@ -0,0 +1,218 @@
+"""
+ETA Inference Benchmark
+
+Compares the served ETA bundle's LightGBM booster against the flattened NumPy forest
+(src/inference/tree_compiler.py) for accuracy and latency, and measures
+throughput of the async micro-batcher (src/inference/batcher.py) under
+increasing request concurrency, and how long the event loop is blocked
+with inference inline vs. on a worker pool (src/inference/executor.py),
+and the cost of serving p50/p90 quantiles from a stacked forest.
+
+Usage:
+    python scripts/benchmark_eta_inference.py [--bundle DIR] [--export PATH]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import ETA_BUNDLE_PATH
+from src.inference.bundle import load_eta_bundle
+from src.inference.tree_compiler import compile_lgbm, stack_forests
+from src.inference.batcher import MicroBatcher
+from src.inference.executor import InferenceExecutor
+from src.services.loop_monitor import LoopBlockMonitor
+
+BATCH_SIZES = [1, 64, 4096]
+CONCURRENCY_LEVELS = [1, 16, 64, 256]
+ROWS_PER_REQUEST = 3  # One row per vehicle type
+RANDOM_STATE = 42
+
+
+def make_feature_rows(n_rows, rng):
+    """
+    Generate realistic feature rows in training column order.
+    """
+    hour = rng.integers(0, 24, n_rows)
+    day_of_week = rng.integers(0, 7, n_rows)
+    is_morning_rush = ((hour >= 7) & (hour < 10)).astype(float)
+    is_evening_rush = ((hour >= 17) & (hour < 20)).astype(float)
+
+    return np.column_stack([
+        rng.uniform(0.5, 30.0, n_rows),          # trip_distance
+        hour,
+        day_of_week,
+        np.maximum(is_morning_rush, is_evening_rush),
+        (day_of_week >= 5).astype(float),
+        is_morning_rush,
+        is_evening_rush,
+        ((hour >= 23) | (hour < 5)).astype(float),
+        rng.integers(0, 3, n_rows)               # vehicle_encoded
+    ]).astype(np.float64)
+
+
+def time_call(fn, X, min_seconds=0.5):
+    """
+    Return mean seconds per call, repeating until min_seconds have elapsed.
+    """
+    fn(X)  # Warm up
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        fn(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_seconds:
+            return elapsed / calls
+
+
+async def run_concurrent_requests(batcher, requests, concurrency):
+    """
+    Issue all requests with at most `concurrency` in flight; return per-request latencies (s).
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(rows):
+        async with semaphore:
+            start = time.perf_counter()
+            await batcher.predict(rows)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(rows) for rows in requests))
+    return np.array(latencies)
+
+
+def benchmark_micro_batching(predict_fn, rng, n_requests=2048):
+    """
+    Throughput and latency of the micro-batcher at several concurrency levels.
+    """
+    print(f"\nMicro-batching ({n_requests} requests x {ROWS_PER_REQUEST} rows)")
+    print(f"{'Conc.':>6} {'Req/s':>10} {'p50 (ms)':>10} {'p99 (ms)':>10} {'Req/batch':>10} {'Fill':>7}")
+    print("-"*60)
+    requests = [make_feature_rows(ROWS_PER_REQUEST, rng) for _ in range(n_requests)]
+
+    for concurrency in CONCURRENCY_LEVELS:
+        batcher = MicroBatcher(predict_fn, max_batch_rows=256, max_wait_us=1000.0)
+        start = time.perf_counter()
+        latencies = asyncio.run(run_concurrent_requests(batcher, requests, concurrency))
+        elapsed = time.perf_counter() - start
+        stats = batcher.stats()
+
+        print(f"{concurrency:>6} {n_requests / elapsed:>10.0f} "
+              f"{np.percentile(latencies, 50) * 1000:>10.2f} {np.percentile(latencies, 99) * 1000:>10.2f} "
+              f"{stats['mean_requests_per_batch']:>10.1f} {stats['mean_batch_fill']:>7.2f}")
+
+
+def benchmark_quantiles(bundle_path, rng):
+    """
+    Point-only forest vs. point + quantiles stacked into one forest.
+    """
+    bundle = load_eta_bundle(bundle_path)
+    if not bundle.quantile_models:
+        print("\nQuantiles: bundle has no quantile models, skipped")
+        return
+
+    point = compile_lgbm(bundle.model)
+    stacked = stack_forests([point] + [compile_lgbm(m) for m in bundle.quantile_models.values()])
+
+    print(f"\nQuantile outputs {bundle.output_names} "
+          f"({point.num_trees} -> {stacked.num_trees} trees)")
+    print(f"{'Batch':>6} {'Point (ms)':>12} {'Stacked (ms)':>13} {'3x native (ms)':>15} {'Ratio':>7}")
+    print("-"*60)
+    for batch_size in [ROWS_PER_REQUEST] + BATCH_SIZES[1:]:
+        X = make_feature_rows(batch_size, rng)
+        assert np.allclose(stacked.predict(X), bundle.predict(X))
+
+        point_s = time_call(point.predict, X)
+        stacked_s = time_call(stacked.predict, X)
+        native_s = time_call(bundle.predict, X)
+        print(f"{batch_size:>6} {point_s * 1000:>12.4f} {stacked_s * 1000:>13.4f} "
+              f"{native_s * 1000:>15.4f} {stacked_s / point_s:>6.2f}x")
+
+
+def benchmark_loop_blocking(predict_fns, rng, n_requests=2048, concurrency=256):
+    """
+    Event loop blocking with predictions inline vs. in a thread pool.
+
+    predict_fns maps a label to (executor mode, predict function).
+    """
+    print(f"\nEvent loop blocking ({n_requests} requests, concurrency {concurrency})")
+    print(f"{'Executor':>16} {'Req/s':>9} {'Blocked':>8} {'Blocked ms':>11} {'Max lag ms':>11}")
+    print("-"*60)
+    requests = [make_feature_rows(ROWS_PER_REQUEST, rng) for _ in range(n_requests)]
+
+    async def run(mode, predict_fn):
+        executor = InferenceExecutor(predict_fn, mode=mode, max_workers=2)
+        batcher = MicroBatcher(predict_fn, max_batch_rows=256, max_wait_us=1000.0, executor=executor)
+        monitor = LoopBlockMonitor(interval_ms=1.0, threshold_ms=2.0)
+        monitor.start()
+        start = time.perf_counter()
+        await run_concurrent_requests(batcher, requests, concurrency)
+        elapsed = time.perf_counter() - start
+        monitor.stop()
+        executor.shutdown()
+        return elapsed, monitor.stats()
+
+    for label, (mode, predict_fn) in predict_fns.items():
+        elapsed, stats = asyncio.run(run(mode, predict_fn))
+        print(f"{label:>16} {n_requests / elapsed:>9.0f} {stats['blocked_events']:>8} "
+              f"{stats['blocked_ms_total']:>11.1f} {stats['lag_ms']['max']:>11.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--bundle', default=ETA_BUNDLE_PATH, help='ETA bundle directory served by the API')
+    parser.add_argument('--export', default=None, help='Optional .npz path for the flattened forest')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("ETA INFERENCE BENCHMARK")
+    print("="*60)
+
+    model = load_eta_bundle(args.bundle).model
+
+    start = time.perf_counter()
+    forest = compile_lgbm(model)
+    compile_ms = (time.perf_counter() - start) * 1000
+    print(f"✓ Compiled {forest.num_trees} trees / {forest.num_nodes} nodes "
+          f"(max depth {forest.max_depth}) in {compile_ms:.1f} ms")
+
+    if args.export:
+        forest.save(args.export)
+        print(f"✓ Saved: {args.export}")
+
+    rng = np.random.default_rng(RANDOM_STATE)
+
+    print(f"\n{'Batch':>6} {'Booster (ms)':>12} {'NumPy (ms)':>12} {'Speedup':>9} {'Max |diff|':>12}")
+    print("-"*60)
+    for batch_size in BATCH_SIZES:
+        X = make_feature_rows(batch_size, rng)
+
+        max_diff = float(np.max(np.abs(model.predict(X) - forest.predict(X))))
+        lgbm_s = time_call(model.predict, X)
+        numpy_s = time_call(forest.predict, X)
+
+        print(f"{batch_size:>6} {lgbm_s * 1000:>12.4f} {numpy_s * 1000:>12.4f} "
+              f"{lgbm_s / numpy_s:>8.1f}x {max_diff:>12.2e}")
+
+    benchmark_micro_batching(forest.predict, rng)
+    benchmark_quantiles(args.bundle, rng)
+    benchmark_loop_blocking({
+        'inline/numpy': ('inline', forest.predict),
+        'thread/numpy': ('thread', forest.predict),
+        'thread/booster': ('thread', model.predict)
+    }, rng)
+
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
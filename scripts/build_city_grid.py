@@ -0,0 +1,70 @@
+"""
+City Grid Builder
+
+Splits the base GRID_SIZE x GRID_SIZE city grid quadtree-style where
+historical pickups are dense and saves it to CITY_GRID_PATH, where the API,
+demand estimation, surge and supply counting pick it up.
+
+Usage:
+    python scripts/build_city_grid.py [--data rides.csv] [--split-rides 800] [--max-depth 2]
+
+The demand table and pickup ETA model are per region, so re-run
+scripts/estimate_demand.py and scripts/train_pickup_eta_model.py after
+building a new grid (the API rejects artifacts built on another grid).
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import CITY_GRID_PATH, CITY_GRID_MAX_DEPTH, CITY_GRID_SPLIT_RIDES
+from src.pricing.city_grid import CityGrid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--data', default='data/raw/rides.csv', help='Rides CSV')
+    parser.add_argument('--split-rides', type=int, default=CITY_GRID_SPLIT_RIDES,
+                        help='Split a cell holding more pickups than this')
+    parser.add_argument('--max-depth', type=int, default=CITY_GRID_MAX_DEPTH,
+                        help='Maximum number of splits of a base cell')
+    parser.add_argument('--output', default=CITY_GRID_PATH)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("CITY GRID")
+    print("=" * 60)
+
+    df = pd.read_csv(args.data, usecols=['origin_lat', 'origin_lon'])
+    print(f"✓ Loaded {len(df):,} pickups")
+
+    grid = CityGrid.from_points(
+        df['origin_lat'].values, df['origin_lon'].values,
+        split_threshold=args.split_rides, max_depth=args.max_depth
+    )
+    counts = np.bincount(
+        grid.region_ids(df['origin_lat'].values, df['origin_lon'].values), minlength=grid.n_regions
+    )
+
+    print(f"\n{grid.n_regions} regions (base {grid.base_size}x{grid.base_size}, max depth {grid.max_depth})")
+    for depth in range(grid.max_depth + 1):
+        at_depth = grid.depths == depth
+        if at_depth.any():
+            print(f"  depth {depth}: {int(at_depth.sum()):3d} regions, "
+                  f"pickups per region {int(counts[at_depth].min())}-{int(counts[at_depth].max())}")
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    grid.save(args.output)
+    print(f"\n✓ Saved: {os.path.relpath(args.output)} (fingerprint {grid.fingerprint})")
+    print("⚠ Re-run scripts/estimate_demand.py and scripts/train_pickup_eta_model.py for the new regions")
+
+
+if __name__ == '__main__':
+    main()
@@ -6,7 +6,6 @@ Estimates ride demand by region and time for surge pricing decisions.
 
 import pandas as pd
 import numpy as np
-import pickle
 import json
 import os
 import sys
@@ -15,39 +14,37 @@ from pathlib import Path
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from config import DEMAND_MODEL_PATH, SURGE_MULTIPLIERS
 from src.features.temporal import extract_temporal_features
+from src.pricing.city_grid import city_grid
+from src.pricing.demand_table import DemandTable, demand_tiers
 
 
-def create_spatial_grid(df, grid_size=5):
+def create_spatial_grid(df, grid=None):
     """
-    Divide city into spatial grid regions.
+    Assign each ride to a region of the city grid.
+    
+    Uses the serving grid (the saved multi-resolution grid, or the uniform
+    grid over the config city bounds), so region indices match the ones the
+    API looks up.
     
     Parameters
     ----------
     df : pandas.DataFrame
         DataFrame with origin_lat, origin_lon columns
-    grid_size : int
-        Number of grid cells per dimension (creates grid_size x grid_size grid)
+    grid : CityGrid, optional
+        Grid to use (default: the shared city grid)
     
     Returns
     -------
     pandas.DataFrame
-        DataFrame with added region_id column
+        DataFrame with added region (integer index) and region_id columns
     """
-    # Get lat/lon bounds
-    lat_min, lat_max = df['origin_lat'].min(), df['origin_lat'].max()
-    lon_min, lon_max = df['origin_lon'].min(), df['origin_lon'].max()
-    
-    # Create bins
-    lat_bins = np.linspace(lat_min, lat_max, grid_size + 1)
-    lon_bins = np.linspace(lon_min, lon_max, grid_size + 1)
-    
-    # Assign grid cells
-    df['lat_grid'] = pd.cut(df['origin_lat'], bins=lat_bins, labels=False, include_lowest=True)
-    df['lon_grid'] = pd.cut(df['origin_lon'], bins=lon_bins, labels=False, include_lowest=True)
+    grid = grid or city_grid
+    df['region'] = grid.region_ids(df['origin_lat'].values, df['origin_lon'].values)
     
     # Create region ID
-    df['region_id'] = df['lat_grid'].astype(str) + '_' + df['lon_grid'].astype(str)
+    df['region_id'] = np.array(grid.leaves, dtype=object)[df['region'].values]
     
     return df
 
@@ -105,24 +102,9 @@ def calculate_surge_multiplier(demand_score):
     float or array-like
         Surge multiplier (1.0 = normal, >1.0 = surge)
     """
-    demand_score = np.asarray(demand_score)
-    
-    # Base multiplier
-    multiplier = np.ones_like(demand_score, dtype=float)
-    
-    # Low demand (< 0.3): Discount
-    multiplier[demand_score < 0.3] = 0.9
-    
-    # Medium demand (0.3 - 0.7): Normal
-    multiplier[(demand_score >= 0.3) & (demand_score < 0.7)] = 1.0
-    
-    # High demand (0.7 - 0.85): Moderate surge
-    multiplier[(demand_score >= 0.7) & (demand_score < 0.85)] = 1.3
-    
-    # Very high demand (>= 0.85): High surge
-    multiplier[demand_score >= 0.85] = 1.5
-    
-    return multiplier
+    # Tiers from DEMAND_TIER_THRESHOLDS: discount, normal, moderate, high surge
+    multipliers = np.array(list(SURGE_MULTIPLIERS.values()))
+    return multipliers[demand_tiers(np.asarray(demand_score))]
 
 
 def analyze_demand_patterns(demand_df):
@@ -189,8 +171,8 @@ def main():
     df = extract_temporal_features(df)
     
     # Create spatial grid
-    print("Creating spatial grid (5x5 = 25 regions)...")
-    df = create_spatial_grid(df, grid_size=5)
+    print(f"Creating spatial grid ({city_grid.n_regions} regions, max depth {city_grid.max_depth})...")
+    df = create_spatial_grid(df)
     print(f"✓ Created {df['region_id'].nunique()} regions")
     
     # Calculate demand by region and hour
@@ -233,16 +215,16 @@ def main():
         json.dump(summary, f, indent=2)
     print("✓ Saved: reports/demand_analysis.json")
     
-    # Save demand model (simple lookup table)
-    demand_model = {
-        'demand_data': demand_df.to_dict('records'),
-        'grid_size': 5,
-        'summary': summary
-    }
-    
-    with open('models/saved/demand_model.pkl', 'wb') as f:
-        pickle.dump(demand_model, f)
-    print("✓ Saved: models/saved/demand_model.pkl")
+    # Save demand table (region x hour x day, weekday/weekend rates, memory-mapped by the API)
+    table = DemandTable.from_rides(
+        df['region'].values, df['hour'].values, df['day_of_week'].values,
+        df['timestamp'].dt.date.values, n_regions=city_grid.n_regions
+    )
+    coverage = table.validate(n_regions=city_grid.n_regions)
+    table.meta.update(grid=city_grid.fingerprint, coverage=coverage, summary=summary)
+    table.save(DEMAND_MODEL_PATH)
+    print(f"✓ Saved: {os.path.relpath(DEMAND_MODEL_PATH)} "
+          f"({coverage['slot_coverage']:.0%} of region-hour-day slots observed)")
     
     print("\n" + "="*60)
     print("DEMAND ESTIMATION COMPLETE!")
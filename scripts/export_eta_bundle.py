@@ -0,0 +1,65 @@
+"""
+ETA Bundle Export Script
+
+Converts an existing pickled LGBMRegressor (models/saved/eta_lgbm.pkl) into the
+versioned bundle the API loads (models/saved/eta_bundle), without retraining.
+New training runs write the bundle directly (scripts/train_eta_models.py).
+
+Usage:
+    python scripts/export_eta_bundle.py [--model PATH] [--data PATH] [--out DIR]
+"""
+
+import argparse
+import json
+import pickle
+import sys
+import warnings
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import ETA_MODEL_PATH, ETA_BUNDLE_PATH, PROJECT_ROOT
+from src.inference.bundle import save_eta_bundle, load_eta_bundle
+from src.inference.feature_builder import ETA_FEATURE_COLUMNS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--model', default=ETA_MODEL_PATH, help='Pickled LGBMRegressor')
+    parser.add_argument('--data', default=str(Path(PROJECT_ROOT) / 'data' / 'raw' / 'rides.csv'),
+                        help='Training data (hashed for provenance)')
+    parser.add_argument('--metrics', default=str(Path(PROJECT_ROOT) / 'reports' / 'eta_evaluation.json'),
+                        help='Evaluation report to copy LightGBM metrics from')
+    parser.add_argument('--out', default=ETA_BUNDLE_PATH, help='Bundle output directory')
+    args = parser.parse_args()
+
+    # Pickled models may come from a different sklearn version
+    warnings.filterwarnings('ignore')
+
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+
+    metrics = {}
+    if Path(args.metrics).exists():
+        with open(args.metrics, 'r') as f:
+            metrics = json.load(f).get('lightgbm', {})
+
+    schema = save_eta_bundle(
+        args.out,
+        model.booster_,
+        ETA_FEATURE_COLUMNS,
+        training_data_path=args.data,
+        scaler=None,  # LightGBM was trained on unscaled features
+        metrics=metrics
+    )
+    load_eta_bundle(args.out, expected_columns=ETA_FEATURE_COLUMNS)
+
+    print(f"✓ Exported {args.model} -> {args.out}")
+    print(f"  Model version: {schema['model_version']}")
+    print(f"  Trees: {schema['num_trees']}")
+    print(f"  Training data sha256: {schema['training_data_sha256']}")
+
+
+if __name__ == '__main__':
+    main()
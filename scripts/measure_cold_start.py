@@ -0,0 +1,86 @@
+"""
+API Cold Start Report
+
+Measures, each in a fresh interpreter, how long `import api.main` takes,
+which heavy libraries the import pulls in, how soon the app answers its
+liveness probe and how long background model loading takes until the
+readiness probe returns 200.
+
+Usage:
+    python scripts/measure_cold_start.py [--runs N]
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+
+PROJECT_ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ['numpy', 'pandas', 'sklearn', 'lightgbm', 'scipy']
+
+# Runs in a child interpreter; prints one JSON line
+CHILD_SCRIPT = r'''
+import json, sys, time
+sys.path.insert(0, {root!r})
+started = time.perf_counter()
+import api.main as main
+import_ms = (time.perf_counter() - started) * 1000
+heavy = [m for m in {heavy!r} if m in sys.modules]
+
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    live_ms = (time.perf_counter() - started) * 1000
+    assert client.get('/health/live').status_code == 200
+    while client.get('/health/ready').status_code != 200:
+        time.sleep(0.005)
+    ready_ms = (time.perf_counter() - started) * 1000
+    startup = client.get('/health').json()['startup']
+
+print(json.dumps({{'import_ms': import_ms, 'heavy_after_import': heavy,
+                  'live_ms': live_ms, 'ready_ms': ready_ms, 'models_load_ms': startup['models_load_ms']}}))
+'''
+
+
+def measure_once() -> dict:
+    """Start a fresh interpreter, import the API and wait for readiness"""
+    code = CHILD_SCRIPT.format(root=str(PROJECT_ROOT), heavy=HEAVY_MODULES)
+    result = subprocess.run(
+        [sys.executable, '-c', code],
+        capture_output=True, text=True, cwd=PROJECT_ROOT, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh-process measurements')
+    args = parser.parse_args()
+
+    print("\n" + "="*60)
+    print("API COLD START REPORT")
+    print("="*60)
+
+    runs = [measure_once() for _ in range(args.runs)]
+
+    print(f"\nHeavy libraries loaded by `import api.main`: "
+          f"{', '.join(runs[0]['heavy_after_import']) or 'none'}")
+
+    print(f"\n{'Phase':<32} {'p50 (ms)':>10} {'max (ms)':>10}")
+    print("-"*60)
+    for key, label in [
+        ('import_ms', 'import api.main'),
+        ('live_ms', 'Serving (liveness OK)'),
+        ('models_load_ms', 'Background model loading'),
+        ('ready_ms', 'Ready (readiness OK)')
+    ]:
+        values = np.array([run[key] for run in runs])
+        print(f"{label:<32} {np.median(values):>10.1f} {values.max():>10.1f}")
+
+    print("="*60 + "\n")
+
+
+if __name__ == '__main__':
+    main()
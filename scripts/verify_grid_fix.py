@@ -1,12 +1,15 @@
 
 import sys
 import os
-import pickle
+
+import numpy as np
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.pricing.dynamic_pricing import get_region_id, load_demand_model, get_demand_score, DEMAND_MODEL_PATH
+from src.pricing.dynamic_pricing import (
+    get_region_id, get_region_index, format_region_id, load_demand_model, get_demand_score, DEMAND_MODEL_PATH
+)
 from config import CITY_MIN_LAT, CITY_MAX_LAT, CITY_MIN_LON, CITY_MAX_LON
 
 def verify():
@@ -33,29 +36,14 @@ def verify():
     print("\n=== Demand Model Inspection ===")
     if os.path.exists(DEMAND_MODEL_PATH):
         try:
-            with open(DEMAND_MODEL_PATH, 'rb') as f:
-                data = pickle.load(f)
+            slots = np.load(DEMAND_MODEL_PATH, mmap_mode='r')
             print("Model loaded successfully.")
-            print(f"Number of keys: {len(data)}")
-            print("Sample keys:")
-            if 'demand_data' in data:
-                print("  (Found 'demand_data' key...)")
-                inner = data['demand_data']
-                print(f"  Type of inner data: {type(inner)}")
-                if isinstance(inner, list):
-                    print(f"  Length of list: {len(inner)}")
-                    if len(inner) > 0:
-                        item = inner[0]
-                        print("\n--- FIRST ITEM DETAILS ---")
-                        for k, v in item.items():
-                            print(f"KEY: {k} | VALUE: {v}")
-                        print("--------------------------\n")
-                elif isinstance(inner, dict):
-                     for k in list(inner.keys())[:5]:
-                        print(f"  {k} -> {inner[k]}")
-            else:
-                for k in list(data.keys())[:5]:
-                    print(f"  {k}")
+            print(f"Shape (regions, hours, days): {slots.shape}")
+            print(f"Fields: {slots.dtype.names}")
+            print("\n--- FIRST SLOT DETAILS ---")
+            for name in slots.dtype.names:
+                print(f"KEY: {name} | VALUE: {slots[0, 0, 0][name]}")
+            print("--------------------------\n")
         except Exception as e:
             print(f"Error loading model: {e}")
     else:
@@ -64,22 +52,21 @@ def verify():
     print("\n=== Testing Integrated Logic ===")
     try:
         model = load_demand_model()
-        if model:
+        if model is not None:
             print(f"Model loaded via load_demand_model(). Type: {type(model)}")
-            if isinstance(model, dict):
-                first_key = list(model.keys())[0]
-                print(f"Sample key: {first_key}")
-                
-                # Test with the sample key logic
-                score = get_demand_score(str(first_key), 10, model)
-                print(f"Demand Score lookup: {score}")
-                
-                if score != 0.5:
-                     print("SUCCESS: Retrieved non-default demand score.")
-                else:
-                     print("WARNING: Retrieved default score (0.5). Should check if this is correct.")
+            print(f"Table shape (regions, hours, days): {model.scores.shape}")
+            
+            # Test the lookup for the center region
+            region = get_region_index(center_lat, center_lon)
+            score = get_demand_score(region, 10, model)
+            print(f"Demand Score lookup ({format_region_id(region)}, 10:00): {score}")
+            
+            if score != 0.5:
+                 print("SUCCESS: Retrieved non-default demand score.")
             else:
-                 print("ERROR: load_demand_model() did not return a dictionary.")
+                 print("WARNING: Retrieved default score (0.5). Should check if this is correct.")
+        else:
+             print("ERROR: load_demand_model() did not return a demand table.")
     except Exception as e:
         print(f"ERROR testing logic: {e}")
 
@@ -9,11 +9,26 @@ from .metrics import (
     save_metrics,
     load_metrics
 )
+from .shadow_report import load_shadow_log, build_shadow_report
+from .pricing_backtest import (
+    current_parameters,
+    parameter_grid,
+    run_backtest,
+    summarize_backtest,
+    backtest_by_region_hour
+)
 
 __all__ = [
     'calculate_regression_metrics',
     'print_metrics',
     'compare_models',
     'save_metrics',
-    'load_metrics'
+    'load_metrics',
+    'load_shadow_log',
+    'build_shadow_report',
+    'current_parameters',
+    'parameter_grid',
+    'run_backtest',
+    'summarize_backtest',
+    'backtest_by_region_hour'
 ]
@@ -0,0 +1,335 @@
+"""
+Pricing Backtest
+
+Replays historical rides through the surge pricing logic for a grid of
+parameter sets (surge thresholds, multipliers and cap) to compare revenue
+and how often riders would have seen each surge tier, per region and hour,
+before changing config.py.
+
+With a demand table, demand follows the served path: the table's demand
+score for the ride's (region, hour, day of week) times PEAK_DEMAND_RIDES, as
+in calculate_demand_supply_ratio (without the live quote blending, since
+historical quote counts are not logged). Without one, demand is the number
+of rides actually requested in the region during the same clock hour.
+Either way supply is an assumed constant per region.
+
+Every step is vectorized over rides; parameter sets are split across
+worker processes, and files are streamed in chunks so the ride history
+does not have to fit in memory.
+"""
+
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import (
+    SURGE_CAP,
+    SURGE_MULTIPLIERS,
+    SURGE_THRESHOLDS,
+    VEHICLE_TYPE_CODES
+)
+from src.pricing.city_grid import city_grid
+from src.pricing.dynamic_pricing import PEAK_DEMAND_RIDES, calculate_fares
+
+SURGE_TIERS = list(SURGE_MULTIPLIERS)
+RIDE_COLUMNS = ['timestamp', 'origin_lat', 'origin_lon', 'vehicle_type', 'trip_distance', 'trip_duration']
+
+
+def current_parameters():
+    """
+    Surge parameters currently in config.py.
+
+    Returns
+    -------
+    dict
+        thresholds (ratio bounds between tiers), multipliers (one per tier) and cap
+    """
+    return {
+        'thresholds': [SURGE_THRESHOLDS[tier] for tier in SURGE_TIERS[:-1]],
+        'multipliers': [SURGE_MULTIPLIERS[tier] for tier in SURGE_TIERS],
+        'cap': SURGE_CAP
+    }
+
+
+def parameter_grid(threshold_scales=(1.0,), multiplier_scales=(1.0,), caps=(SURGE_CAP,)):
+    """
+    Parameter sets around the current config.
+
+    Parameters
+    ----------
+    threshold_scales : sequence of float
+        Factors applied to every ratio threshold
+    multiplier_scales : sequence of float
+        Factors applied to each multiplier's distance from 1.0
+        (so discounts deepen and surges rise together)
+    caps : sequence of float
+        Surge caps
+
+    Returns
+    -------
+    list of dict
+        One parameter set per combination
+    """
+    base = current_parameters()
+    return [
+        {
+            'thresholds': [round(t * t_scale, 4) for t in base['thresholds']],
+            'multipliers': [round(1 + (m - 1) * m_scale, 4) for m in base['multipliers']],
+            'cap': cap
+        }
+        for t_scale, m_scale, cap in itertools.product(threshold_scales, multiplier_scales, caps)
+    ]
+
+
+def _iter_rides(rides, chunksize):
+    if isinstance(rides, pd.DataFrame):
+        for start in range(0, len(rides), chunksize):
+            yield rides.iloc[start:start + chunksize]
+    else:
+        yield from pd.read_csv(rides, usecols=RIDE_COLUMNS, chunksize=chunksize)
+
+
+def _prepare_chunk(chunk, grid):
+    """
+    Region, clock-hour key, hour of day, day of week and pre-surge fare per
+    ride, skipping rides with an unknown vehicle type (returned as a count)
+    """
+    codes = chunk['vehicle_type'].map(VEHICLE_TYPE_CODES)
+    known = codes.notna().to_numpy()
+    chunk = chunk[known]
+    codes = codes[known].to_numpy(dtype=np.int64)
+
+    timestamps = pd.to_datetime(chunk['timestamp'])
+    region = grid.region_ids(chunk['origin_lat'].to_numpy(), chunk['origin_lon'].to_numpy())
+    clock_hour = timestamps.to_numpy().astype('datetime64[h]').astype(np.int64)
+    subtotal = calculate_fares(
+        chunk['trip_distance'].to_numpy(), chunk['trip_duration'].to_numpy(), codes, 1.0
+    )['subtotal']
+    return {
+        'region': region,
+        'key': clock_hour * grid.n_regions + region,
+        'hour': clock_hour % 24,
+        'day_of_week': timestamps.dt.dayofweek.to_numpy(),
+        'subtotal': subtotal,
+        'skipped': int((~known).sum())
+    }
+
+
+def count_rides_per_hour(rides, chunksize=500_000, grid=None):
+    """
+    Rides per (region, clock hour) over the whole history.
+
+    Parameters
+    ----------
+    rides : str or pandas.DataFrame
+        Path to a rides CSV or the rides themselves
+    chunksize : int
+        Rows read per chunk
+    grid : CityGrid, optional
+        Pricing regions (default: the shared city grid)
+
+    Returns
+    -------
+    pandas.Series
+        Ride count indexed by clock_hour * n_regions + region
+    """
+    grid = grid or city_grid
+    counts = pd.Series(dtype=np.int64)
+    for chunk in _iter_rides(rides, chunksize):
+        keys = _prepare_chunk(chunk, grid)['key']
+        counts = counts.add(pd.Series(keys).value_counts(), fill_value=0)
+    return counts.astype(np.int64)
+
+
+def _backtest_worker(rides, param_sets, hourly_counts, demand_scores, supply_per_region, chunksize, grid):
+    """Accumulate per (region, hour) totals for a group of parameter sets"""
+    n_slots = grid.n_regions * 24
+    n_tiers = len(SURGE_TIERS)
+    result = {
+        'skipped_rides': 0,
+        'rides': np.zeros(n_slots, dtype=np.int64),
+        'base_revenue': np.zeros(n_slots),
+        'revenue': np.zeros((len(param_sets), n_slots)),
+        'surge_sum': np.zeros((len(param_sets), n_slots)),
+        'tier_counts': np.zeros((len(param_sets), n_slots, n_tiers), dtype=np.int64)
+    }
+    thresholds = [np.asarray(p['thresholds'], dtype=np.float64) for p in param_sets]
+    multipliers = [np.minimum(np.asarray(p['multipliers'], dtype=np.float64), p['cap']) for p in param_sets]
+
+    for chunk in _iter_rides(rides, chunksize):
+        prepared = _prepare_chunk(chunk, grid)
+        region, hour, subtotal = prepared['region'], prepared['hour'], prepared['subtotal']
+        result['skipped_rides'] += prepared['skipped']
+        if demand_scores is not None:
+            # Served path: demand score of the slot as rides/hour per available vehicle
+            ratios = (demand_scores[region, hour, prepared['day_of_week']] * PEAK_DEMAND_RIDES
+                      / max(supply_per_region, 1))
+        else:
+            # Rides requested in the region that clock hour per available vehicle
+            ratios = hourly_counts.reindex(prepared['key']).to_numpy(dtype=np.float64) / supply_per_region
+        slots = region * 24 + hour
+
+        result['rides'] += np.bincount(slots, minlength=n_slots)
+        result['base_revenue'] += np.bincount(slots, weights=subtotal, minlength=n_slots)
+        for p in range(len(param_sets)):
+            tiers = np.searchsorted(thresholds[p], ratios, side='right')
+            surge = multipliers[p][tiers]
+            result['revenue'][p] += np.bincount(slots, weights=subtotal * surge, minlength=n_slots)
+            result['surge_sum'][p] += np.bincount(slots, weights=surge, minlength=n_slots)
+            result['tier_counts'][p] += np.bincount(
+                slots * n_tiers + tiers, minlength=n_slots * n_tiers
+            ).reshape(n_slots, n_tiers)
+    return result
+
+
+def run_backtest(rides, param_sets, supply_per_region=2.0, chunksize=500_000,
+                 n_workers=None, grid=None, demand_table=None):
+    """
+    Replay rides through surge pricing for every parameter set.
+
+    Parameters
+    ----------
+    rides : str or pandas.DataFrame
+        Path to a rides CSV (timestamp, origin_lat, origin_lon, vehicle_type,
+        trip_distance, trip_duration) or the rides themselves
+    param_sets : list of dict
+        Parameter sets (see parameter_grid)
+    supply_per_region : float
+        Available vehicles assumed per region (historical supply is not logged)
+    chunksize : int
+        Rows read per chunk
+    n_workers : int, optional
+        Worker processes (default: CPU count); parameter sets are split between them
+    grid : CityGrid, optional
+        Pricing regions (default: the shared city grid)
+    demand_table : DemandTable, optional
+        Served demand table; demand is its score per slot times
+        PEAK_DEMAND_RIDES. Without it, demand is the realized rides per
+        region and clock hour.
+
+    Returns
+    -------
+    dict
+        param_sets, demand_source, skipped_rides (unknown vehicle type),
+        rides and base_revenue per (region, hour) slot, and per parameter
+        set revenue, surge_sum and tier_counts per slot
+    """
+    if not param_sets:
+        raise ValueError("No parameter sets to backtest")
+    if supply_per_region <= 0:
+        raise ValueError(f"supply_per_region must be positive, got {supply_per_region}")
+
+    grid = grid or city_grid
+    if demand_table is not None:
+        if demand_table.n_regions != grid.n_regions:
+            raise ValueError(
+                f"Demand table has {demand_table.n_regions} regions, the grid has {grid.n_regions}"
+            )
+        demand_scores = np.asarray(demand_table.scores, dtype=np.float64)
+        hourly_counts = None
+    else:
+        demand_scores = None
+        hourly_counts = count_rides_per_hour(rides, chunksize, grid)
+
+    n_workers = min(n_workers or os.cpu_count() or 1, len(param_sets))
+    groups = [list(group) for group in np.array_split(np.arange(len(param_sets)), n_workers)]
+    args = [
+        (rides, [param_sets[i] for i in group], hourly_counts, demand_scores, supply_per_region, chunksize, grid)
+        for group in groups
+    ]
+    if n_workers == 1:
+        parts = [_backtest_worker(*args[0])]
+    else:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            parts = list(pool.map(_backtest_worker, *zip(*args)))
+
+    return {
+        'param_sets': param_sets,
+        'demand_source': 'demand_table' if demand_table is not None else 'hourly_rides',
+        'skipped_rides': parts[0]['skipped_rides'],
+        'region_ids': list(grid.leaves),
+        'rides': parts[0]['rides'],
+        'base_revenue': parts[0]['base_revenue'],
+        'revenue': np.concatenate([part['revenue'] for part in parts]),
+        'surge_sum': np.concatenate([part['surge_sum'] for part in parts]),
+        'tier_counts': np.concatenate([part['tier_counts'] for part in parts])
+    }
+
+
+def summarize_backtest(result):
+    """
+    One row per parameter set.
+
+    Parameters
+    ----------
+    result : dict
+        Output of run_backtest
+
+    Returns
+    -------
+    pandas.DataFrame
+        Parameters, total revenue, change vs. no surge, mean multiplier and
+        share of rides in each surge tier
+    """
+    total_rides = max(int(result['rides'].sum()), 1)
+    base_revenue = result['base_revenue'].sum()
+    rows = []
+    for p, params in enumerate(result['param_sets']):
+        revenue = result['revenue'][p].sum()
+        tier_share = result['tier_counts'][p].sum(axis=0) / total_rides
+        row = {
+            'param_set': p,
+            'thresholds': params['thresholds'],
+            'multipliers': params['multipliers'],
+            'cap': params['cap'],
+            'revenue': round(float(revenue), 2),
+            'revenue_vs_no_surge_pct': round(float((revenue / base_revenue - 1) * 100), 2) if base_revenue else 0.0,
+            'mean_surge': round(float(result['surge_sum'][p].sum() / total_rides), 4)
+        }
+        row.update({f'{tier}_share': round(float(share), 4) for tier, share in zip(SURGE_TIERS, tier_share)})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def backtest_by_region_hour(result):
+    """
+    Revenue and surge-tier distribution per parameter set, region and hour.
+
+    Parameters
+    ----------
+    result : dict
+        Output of run_backtest
+
+    Returns
+    -------
+    pandas.DataFrame
+        Long format: param_set, region_id, hour, rides, revenue, mean_surge
+        and the share of rides in each surge tier (slots without rides omitted)
+    """
+    n_params, n_slots = result['revenue'].shape
+    region, hour = np.divmod(np.arange(n_slots), 24)
+    rides = result['rides']
+    observed = rides > 0
+
+    frames = []
+    for p in range(n_params):
+        frame = pd.DataFrame({
+            'param_set': p,
+            'region_id': [result['region_ids'][r] for r in region[observed]],
+            'hour': hour[observed],
+            'rides': rides[observed],
+            'revenue': np.round(result['revenue'][p][observed], 2),
+            'mean_surge': np.round(result['surge_sum'][p][observed] / rides[observed], 4)
+        })
+        shares = result['tier_counts'][p][observed] / rides[observed, None]
+        for t, tier in enumerate(SURGE_TIERS):
+            frame[f'{tier}_share'] = np.round(shares[:, t], 4)
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
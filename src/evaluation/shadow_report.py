@@ -0,0 +1,131 @@
+"""
+Shadow Evaluation Reports
+
+Summarizes the champion/challenger log written by the API's shadow
+evaluator: prediction agreement, per-model inference latency and, once
+actual trip durations are joined in, accuracy of both models.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from .metrics import calculate_regression_metrics, compare_models
+
+
+def load_shadow_log(filepath):
+    """
+    Load a JSON-lines shadow log into one row per (quote, vehicle type).
+
+    Parameters
+    ----------
+    filepath : str
+        Path to the shadow log
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns: request_id, vehicle_type, champion, challenger, delta,
+        champion_latency_ms, challenger_latency_ms, champion_version,
+        challenger_version, distance, hour, day_of_week
+    """
+    with open(filepath, 'r') as f:
+        records = [json.loads(line) for line in f if line.strip()]
+
+    rows = []
+    for record in records:
+        for i, vehicle_type in enumerate(record['vehicle_types']):
+            rows.append({
+                'request_id': record['request_id'],
+                'vehicle_type': vehicle_type,
+                'champion': record['champion'][i],
+                'challenger': record['challenger'][i],
+                'delta': record['delta'][i],
+                'champion_latency_ms': record['champion_latency_ms'],
+                'challenger_latency_ms': record['challenger_latency_ms'],
+                'champion_version': record['champion_version'],
+                'challenger_version': record['challenger_version'],
+                'distance': record['distance'],
+                'hour': record['hour'],
+                'day_of_week': record['day_of_week']
+            })
+    return pd.DataFrame(rows)
+
+
+def _latency_summary(latency_ms):
+    latency_ms = np.asarray(latency_ms, dtype=np.float64)
+    return {
+        'mean_ms': round(float(latency_ms.mean()), 4),
+        'p50_ms': round(float(np.percentile(latency_ms, 50)), 4),
+        'p90_ms': round(float(np.percentile(latency_ms, 90)), 4),
+        'p99_ms': round(float(np.percentile(latency_ms, 99)), 4)
+    }
+
+
+def build_shadow_report(log_df, actuals_df=None):
+    """
+    Compare challenger and champion from a shadow log.
+
+    Parameters
+    ----------
+    log_df : pd.DataFrame
+        Output of load_shadow_log
+    actuals_df : pd.DataFrame, optional
+        Completed trips with columns request_id, vehicle_type and
+        actual_duration (minutes). When given, both models are scored
+        against the actual durations of the quotes that became rides.
+
+    Returns
+    -------
+    dict
+        Report with sample counts, agreement (challenger scored against the
+        champion), prediction deltas overall and per vehicle type, per-model
+        latency percentiles and, with actuals, accuracy and the better model
+    """
+    if log_df.empty:
+        raise ValueError("Shadow log is empty")
+
+    # Latency is logged once per quote, not per vehicle type
+    quotes = log_df.drop_duplicates('request_id')
+    delta = log_df['delta'].to_numpy()
+
+    report = {
+        'champion_version': str(log_df['champion_version'].iloc[-1]),
+        'challenger_version': str(log_df['challenger_version'].iloc[-1]),
+        'quotes': int(len(quotes)),
+        'predictions': int(len(log_df)),
+        'agreement': calculate_regression_metrics(
+            log_df['champion'].to_numpy(), log_df['challenger'].to_numpy()
+        ),
+        'delta': {
+            'mean': round(float(delta.mean()), 4),
+            'mean_abs': round(float(np.abs(delta).mean()), 4),
+            'p95_abs': round(float(np.percentile(np.abs(delta), 95)), 4),
+            'by_vehicle_type': {
+                vehicle_type: round(float(group.mean()), 4)
+                for vehicle_type, group in log_df.groupby('vehicle_type')['delta']
+            }
+        },
+        'latency': {
+            'champion': _latency_summary(quotes['champion_latency_ms']),
+            'challenger': _latency_summary(quotes['challenger_latency_ms'])
+        }
+    }
+
+    if actuals_df is not None:
+        joined = log_df.merge(
+            actuals_df[['request_id', 'vehicle_type', 'actual_duration']],
+            on=['request_id', 'vehicle_type']
+        )
+        report['completed_trips'] = int(len(joined))
+        if len(joined) > 1:
+            y_true = joined['actual_duration'].to_numpy()
+            accuracy = {
+                'champion': calculate_regression_metrics(y_true, joined['champion'].to_numpy()),
+                'challenger': calculate_regression_metrics(y_true, joined['challenger'].to_numpy())
+            }
+            report['accuracy'] = accuracy
+            report['better_model'] = compare_models(accuracy)
+
+    return report
@@ -1,13 +1,27 @@
 """
 Feature Engineering Module for Ride-Hailing ML Models
+
+Submodules are imported on first attribute access, so that online code importing
+only `src.features.distance` does not pull in pandas/scikit-learn.
 """
 
-from .distance import haversine_distance
-from .temporal import extract_temporal_features
-from .encoders import encode_vehicle_type
+import importlib
+
+_EXPORTS = {
+    'haversine_distance': 'distance',
+    'extract_temporal_features': 'temporal',
+    'encode_vehicle_type': 'encoders'
+}
 
 __all__ = [
     'haversine_distance',
     'extract_temporal_features',
     'encode_vehicle_type'
 ]
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
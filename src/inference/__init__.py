@@ -0,0 +1,39 @@
+"""
+Inference module for online model serving
+"""
+
+from .feature_builder import (
+    ETA_FEATURE_COLUMNS,
+    EtaFeatureBuilder
+)
+from .tree_compiler import (
+    CompiledForest,
+    compile_lgbm
+)
+from .eta_table import (
+    EtaLookupTable,
+    file_fingerprint
+)
+from .batcher import MicroBatcher
+from .executor import InferenceExecutor
+from .bundle import (
+    EtaBundle,
+    save_eta_bundle,
+    load_eta_bundle
+)
+from .pickup_eta import PickupEtaModel
+
+__all__ = [
+    'ETA_FEATURE_COLUMNS',
+    'EtaFeatureBuilder',
+    'CompiledForest',
+    'compile_lgbm',
+    'EtaLookupTable',
+    'file_fingerprint',
+    'MicroBatcher',
+    'InferenceExecutor',
+    'EtaBundle',
+    'save_eta_bundle',
+    'load_eta_bundle',
+    'PickupEtaModel'
+]
@@ -0,0 +1,152 @@
+"""
+ETA Micro-Batcher
+
+Collects feature rows from concurrent requests for a short window and runs a
+single batched predict for all of them.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class MicroBatcher:
+    """
+    Asyncio micro-batching layer in front of a batch predict function.
+
+    A batch is flushed when either `max_batch_rows` rows are pending or
+    `max_wait_us` microseconds have passed since the first pending row,
+    so no request waits in the queue longer than the window.
+
+    Design Decisions:
+    1. Single event loop: All state is touched from the loop thread only, so no locks.
+       With an `executor`, only the predict call itself runs off the loop.
+    2. Copy on submit: Callers may pass views of reused buffers (EtaFeatureBuilder),
+       so rows are copied when queued.
+    3. Bounded stats: Fill ratios and queue waits are kept for the last `stats_window` batches/requests.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch_rows: int = 256,
+        max_wait_us: float = 1000.0,
+        stats_window: int = 1000,
+        executor=None
+    ):
+        self.predict_fn = predict_fn
+        self.executor = executor  # Optional InferenceExecutor
+        self.max_batch_rows = max_batch_rows
+        self.max_wait_us = max_wait_us
+
+        self._pending: List[Tuple[np.ndarray, asyncio.Future, float]] = []
+        self._pending_rows = 0
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # Metrics
+        self.batches = 0
+        self.requests = 0
+        self.rows = 0
+        self._batch_rows = deque(maxlen=stats_window)
+        self._queue_waits_us = deque(maxlen=stats_window)
+
+    async def predict(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Queue rows for the next batch and wait for their predictions
+
+        Args:
+            rows: (n, n_features) feature matrix for one request
+
+        Returns:
+            np.ndarray: (n,) predictions for these rows
+        """
+        rows = np.array(rows, dtype=np.float64, ndmin=2)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        self._pending.append((rows, future, time.perf_counter()))
+        self._pending_rows += len(rows)
+
+        if self._pending_rows >= self.max_batch_rows:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait_us / 1e6, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Run one batched predict for everything pending and resolve the futures"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        pending, self._pending = self._pending, []
+        self._pending_rows = 0
+        if not pending:
+            return
+
+        flushed_at = time.perf_counter()
+        batch = np.concatenate([rows for rows, _, _ in pending])
+
+        if self.executor is not None:
+            asyncio.get_running_loop().create_task(self._predict_async(pending, batch, flushed_at))
+            return
+
+        try:
+            predictions = np.asarray(self.predict_fn(batch))
+        except Exception as e:
+            self._fail(pending, e)
+            return
+        self._resolve(pending, batch, predictions, flushed_at)
+
+    async def _predict_async(self, pending, batch: np.ndarray, flushed_at: float) -> None:
+        """Run the batch on the executor and resolve the futures back on the loop"""
+        try:
+            predictions = np.asarray(await self.executor.predict(batch))
+        except Exception as e:
+            self._fail(pending, e)
+            return
+        self._resolve(pending, batch, predictions, flushed_at)
+
+    def _fail(self, pending, error: Exception) -> None:
+        for _, future, _ in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    def _resolve(self, pending, batch: np.ndarray, predictions: np.ndarray, flushed_at: float) -> None:
+        offset = 0
+        for rows, future, queued_at in pending:
+            n = len(rows)
+            if not future.done():
+                future.set_result(predictions[offset:offset + n])
+            offset += n
+            self._queue_waits_us.append((flushed_at - queued_at) * 1e6)
+
+        self.batches += 1
+        self.requests += len(pending)
+        self.rows += len(batch)
+        self._batch_rows.append(len(batch))
+
+    def stats(self) -> Dict:
+        """Batch fill and queue wait metrics"""
+        batch_rows = np.asarray(self._batch_rows, dtype=np.float64)
+        waits = np.asarray(self._queue_waits_us, dtype=np.float64)
+
+        return {
+            'max_batch_rows': self.max_batch_rows,
+            'max_wait_us': self.max_wait_us,
+            'batches': self.batches,
+            'requests': self.requests,
+            'rows': self.rows,
+            'mean_requests_per_batch': round(self.requests / self.batches, 2) if self.batches else 0.0,
+            'mean_batch_rows': round(float(batch_rows.mean()), 2) if batch_rows.size else 0.0,
+            'mean_batch_fill': round(float(batch_rows.mean()) / self.max_batch_rows, 4) if batch_rows.size else 0.0,
+            'queue_wait_us': {
+                'p50': round(float(np.percentile(waits, 50)), 1) if waits.size else 0.0,
+                'p99': round(float(np.percentile(waits, 99)), 1) if waits.size else 0.0,
+                'max': round(float(waits.max()), 1) if waits.size else 0.0
+            }
+        }
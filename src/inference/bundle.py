@@ -0,0 +1,235 @@
+"""
+ETA Model Bundle
+
+A single versioned artifact for the ETA model: a native LightGBM text dump
+plus a JSON schema describing the feature columns, optional preprocessing
+and where the model came from. Nothing in the bundle is pickled.
+
+Layout:
+    <bundle_dir>/model.txt    LightGBM Booster.save_model output
+    <bundle_dir>/model_p<q>.txt  Optional quantile models (e.g. model_p90.txt)
+    <bundle_dir>/schema.json  format version, model version, feature schema,
+                              preprocessing, model/training-data hashes, metrics
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BUNDLE_FORMAT_VERSION = 1
+MODEL_FILENAME = 'model.txt'
+SCHEMA_FILENAME = 'schema.json'
+
+
+def quantile_name(alpha: float) -> str:
+    """Output name for a quantile level (0.9 -> 'p90')"""
+    return f"p{int(round(alpha * 100))}"
+
+
+def sha256_file(path: str) -> str:
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EtaBundle:
+    """
+    Loaded ETA bundle.
+
+    Attributes:
+        model: lightgbm.Booster (point estimate)
+        quantile_models: Quantile name ('p50', 'p90', ...) -> lightgbm.Booster
+        feature_columns: Column order the model was trained on
+        mean, scale: Standardization applied before predict, or None when the
+                     model was trained on raw features
+        schema: Full schema.json contents
+    """
+
+    def __init__(self, model, schema: Dict, quantile_models: Optional[Dict] = None):
+        self.model = model
+        self.quantile_models = dict(quantile_models or {})
+        self.schema = schema
+        self.feature_columns: List[str] = list(schema['feature_columns'])
+
+        preprocessing = schema.get('preprocessing')
+        if preprocessing:
+            self.mean = np.asarray(preprocessing['mean'], dtype=np.float64)
+            self.scale = np.asarray(preprocessing['scale'], dtype=np.float64)
+        else:
+            self.mean = None
+            self.scale = None
+
+    @property
+    def version(self) -> str:
+        return self.schema['model_version']
+
+    @property
+    def output_names(self) -> List[str]:
+        """Prediction columns: 'duration' followed by the quantiles"""
+        return ['duration'] + list(self.quantile_models)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict with the native boosters
+
+        Returns:
+            np.ndarray: (n,) point predictions, or (n, len(output_names)) with quantiles
+        """
+        if not self.quantile_models:
+            return self.model.predict(X)
+        return np.column_stack(
+            [self.model.predict(X)] + [model.predict(X) for model in self.quantile_models.values()]
+        )
+
+    def info(self) -> Dict:
+        """Summary for health/monitoring endpoints"""
+        return {
+            'model_version': self.schema['model_version'],
+            'format_version': self.schema['format_version'],
+            'model_type': self.schema['model_type'],
+            'num_trees': self.schema.get('num_trees'),
+            'quantiles': list(self.quantile_models),
+            'preprocessing': (self.schema.get('preprocessing') or {}).get('type'),
+            'training_data_sha256': self.schema.get('training_data_sha256')
+        }
+
+
+def save_eta_bundle(
+    bundle_dir: str,
+    booster,
+    feature_columns: List[str],
+    training_data_path: Optional[str] = None,
+    scaler=None,
+    metrics: Optional[Dict] = None,
+    quantile_models: Optional[Dict[float, object]] = None
+) -> Dict:
+    """
+    Write a LightGBM ETA model and its schema as a bundle
+
+    Args:
+        bundle_dir: Output directory
+        booster: Trained lightgbm.Booster (or LGBMRegressor)
+        feature_columns: Feature order used in training
+        training_data_path: CSV the model was trained on (hashed for provenance)
+        scaler: Fitted StandardScaler if the model was trained on scaled features
+        metrics: Evaluation metrics to record
+        quantile_models: Quantile level (e.g. 0.9) -> booster trained with the quantile objective
+
+    Returns:
+        dict: The written schema
+    """
+    booster = getattr(booster, 'booster_', booster)
+    if list(booster.feature_name()) != list(feature_columns):
+        raise ValueError(
+            f"Booster features {booster.feature_name()} do not match schema {list(feature_columns)}"
+        )
+
+    os.makedirs(bundle_dir, exist_ok=True)
+    model_path = os.path.join(bundle_dir, MODEL_FILENAME)
+    booster.save_model(model_path)
+
+    quantiles = {}
+    for alpha, quantile_booster in sorted((quantile_models or {}).items()):
+        quantile_booster = getattr(quantile_booster, 'booster_', quantile_booster)
+        if list(quantile_booster.feature_name()) != list(feature_columns):
+            raise ValueError(f"Quantile {alpha} model features do not match schema")
+        name = quantile_name(alpha)
+        filename = f"model_{name}.txt"
+        quantile_booster.save_model(os.path.join(bundle_dir, filename))
+        quantiles[name] = {
+            'alpha': float(alpha),
+            'file': filename,
+            'sha256': sha256_file(os.path.join(bundle_dir, filename))
+        }
+
+    preprocessing = None
+    if scaler is not None:
+        preprocessing = {
+            'type': 'standard_scaler',
+            'mean': [float(v) for v in scaler.mean_],
+            'scale': [float(v) for v in scaler.scale_]
+        }
+
+    created_at = datetime.now()
+    schema = {
+        'format_version': BUNDLE_FORMAT_VERSION,
+        'model_version': created_at.strftime('%Y%m%d%H%M%S'),
+        'model_type': 'lightgbm',
+        'created_at': created_at.isoformat(),
+        'feature_columns': list(feature_columns),
+        'preprocessing': preprocessing,
+        'num_trees': booster.num_trees(),
+        'model_sha256': sha256_file(model_path),
+        'quantiles': quantiles,
+        'training_data_sha256': (
+            sha256_file(training_data_path)
+            if training_data_path and os.path.exists(training_data_path) else None
+        ),
+        'metrics': metrics or {}
+    }
+
+    with open(os.path.join(bundle_dir, SCHEMA_FILENAME), 'w') as f:
+        json.dump(schema, f, indent=2)
+
+    return schema
+
+
+def load_eta_bundle(bundle_dir: str, expected_columns: Optional[List[str]] = None) -> EtaBundle:
+    """
+    Load and verify an ETA bundle
+
+    Args:
+        bundle_dir: Bundle directory
+        expected_columns: If given, the bundle's feature columns must match exactly
+
+    Returns:
+        EtaBundle: Verified bundle
+
+    Raises:
+        FileNotFoundError: If the bundle files are missing
+        ValueError: If the format version, model hash or feature schema do not check out
+    """
+    import lightgbm as lgb
+
+    with open(os.path.join(bundle_dir, SCHEMA_FILENAME), 'r') as f:
+        schema = json.load(f)
+
+    if schema.get('format_version') != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported bundle format version: {schema.get('format_version')}")
+    if schema.get('model_type') != 'lightgbm':
+        raise ValueError(f"Unsupported model type: {schema.get('model_type')}")
+
+    model_path = os.path.join(bundle_dir, MODEL_FILENAME)
+    if sha256_file(model_path) != schema['model_sha256']:
+        raise ValueError("Model file hash does not match schema (bundle corrupted or partially written)")
+
+    if expected_columns is not None and list(schema['feature_columns']) != list(expected_columns):
+        raise ValueError(
+            f"Bundle features {schema['feature_columns']} do not match expected {list(expected_columns)}"
+        )
+
+    booster = lgb.Booster(model_file=model_path)
+    if list(booster.feature_name()) != list(schema['feature_columns']):
+        raise ValueError("Model feature names do not match the bundle schema")
+
+    quantile_models = {}
+    for name, spec in (schema.get('quantiles') or {}).items():
+        quantile_path = os.path.join(bundle_dir, spec['file'])
+        if sha256_file(quantile_path) != spec['sha256']:
+            raise ValueError(f"Quantile model {name} hash does not match schema")
+        quantile_models[name] = lgb.Booster(model_file=quantile_path)
+        if list(quantile_models[name].feature_name()) != list(schema['feature_columns']):
+            raise ValueError(f"Quantile model {name} feature names do not match the bundle schema")
+
+    preprocessing = schema.get('preprocessing')
+    if preprocessing and len(preprocessing['mean']) != len(schema['feature_columns']):
+        raise ValueError("Preprocessing parameters do not match the number of features")
+
+    return EtaBundle(booster, schema, quantile_models)
@@ -0,0 +1,199 @@
+"""
+ETA Lookup Table
+
+Precomputes ETA model output over a fine distance grid for every
+(hour, day_of_week, vehicle type) combination and serves quotes by
+linear interpolation in O(1).
+
+The only continuous model input is trip_distance; everything else is a
+function of hour, day of week and vehicle type, so the table is exact on
+grid points and only interpolates between neighbouring distances.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+
+N_HOURS = 24
+N_DAYS = 7
+
+
+def file_fingerprint(paths: Sequence[str]) -> str:
+    """
+    SHA-256 over the contents of the given files (missing files are skipped)
+
+    Used to detect that a model artifact changed and the table must be rebuilt.
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        if path and os.path.exists(path):
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+
+class EtaLookupTable:
+    """
+    Dense [hour, day_of_week, vehicle_code, distance_step] table of predicted durations,
+    with a trailing output axis when the model predicts several outputs (e.g. quantiles).
+
+    The array is stored as .npy next to a .json sidecar holding the grid and
+    the model fingerprint, and is memory-mapped read-only on load.
+    """
+
+    def __init__(self, table: np.ndarray, step_km: float, meta: Optional[Dict] = None):
+        self.table = table
+        self.step_km = float(step_km)
+        self.max_distance_km = self.step_km * (table.shape[3] - 1)
+        self.meta = dict(meta or {})
+
+    @classmethod
+    def build(
+        cls,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        feature_builder,
+        n_vehicle_types: int,
+        step_km: float,
+        max_distance_km: float,
+        model_fingerprint: str = ''
+    ) -> 'EtaLookupTable':
+        """
+        Evaluate the model over the full grid
+
+        Args:
+            predict_fn: Batch predict function (feature matrix -> (n,) or (n, n_outputs) durations)
+            feature_builder: EtaFeatureBuilder used to build (and scale) the rows
+            n_vehicle_types: Number of vehicle type codes (0..n-1)
+            step_km: Distance grid step
+            max_distance_km: Largest distance covered by the table
+            model_fingerprint: Identifier of the model the table was built from
+
+        Returns:
+            EtaLookupTable: Table with max/mean interpolation error in meta
+        """
+        n_points = int(np.ceil(max_distance_km / step_km)) + 1
+        distances = np.arange(n_points) * step_km
+        shape = (N_HOURS, N_DAYS, n_vehicle_types, n_points)
+
+        hour, day, code, dist_idx = np.indices(shape).reshape(4, -1)
+        features = feature_builder.build_batch(distances[dist_idx], hour, day, code)
+        table = np.asarray(predict_fn(features), dtype=np.float64)
+        table = table.reshape(shape + table.shape[1:])
+
+        # Interpolation error, measured at the midpoint between every pair of grid points
+        mid_shape = shape[:-1] + (n_points - 1,)
+        hour, day, code, dist_idx = np.indices(mid_shape).reshape(4, -1)
+        features = feature_builder.build_batch(distances[dist_idx] + step_km / 2, hour, day, code)
+        exact = np.asarray(predict_fn(features), dtype=np.float64).reshape(mid_shape + table.shape[4:])
+        interpolated = (table[:, :, :, :-1] + table[:, :, :, 1:]) / 2
+        errors = np.abs(exact - interpolated)
+
+        meta = {
+            'model_fingerprint': model_fingerprint,
+            'step_km': step_km,
+            'max_distance_km': max_distance_km,
+            'shape': list(table.shape),
+            'max_interpolation_error': round(float(errors.max()), 4),
+            'mean_interpolation_error': round(float(errors.mean()), 4),
+            'built_at': datetime.now().isoformat()
+        }
+        return cls(table, step_km, meta)
+
+    def save(self, path: str) -> None:
+        """
+        Write the table (.npy) and its metadata (.json sidecar)
+
+        Both files are written to temporaries and renamed into place, so a
+        table that is still memory-mapped (e.g. during a model hot reload)
+        keeps its old contents.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.table))
+        with open(_meta_path(path) + '.tmp', 'w') as f:
+            json.dump(self.meta, f, indent=2)
+        os.replace(tmp_path, path)
+        os.replace(_meta_path(path) + '.tmp', _meta_path(path))
+
+    @classmethod
+    def load(cls, path: str) -> 'EtaLookupTable':
+        """Memory-map a saved table"""
+        with open(_meta_path(path), 'r') as f:
+            meta = json.load(f)
+        table = np.load(path, mmap_mode='r')
+        return cls(table, meta['step_km'], meta)
+
+    @classmethod
+    def load_or_build(
+        cls,
+        path: str,
+        model_fingerprint: str,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        feature_builder,
+        n_vehicle_types: int,
+        step_km: float,
+        max_distance_km: float
+    ) -> 'EtaLookupTable':
+        """
+        Load the table from disk, regenerating it if the model or grid changed
+
+        Returns:
+            EtaLookupTable: Memory-mapped table matching model_fingerprint
+        """
+        try:
+            table = cls.load(path)
+            meta = table.meta
+            if (meta.get('model_fingerprint') == model_fingerprint
+                    and meta.get('step_km') == step_km
+                    and meta.get('max_distance_km') == max_distance_km
+                    and table.table.shape[2] == n_vehicle_types):
+                return table
+        except (FileNotFoundError, ValueError, KeyError, json.JSONDecodeError):
+            pass
+
+        built = cls.build(
+            predict_fn, feature_builder, n_vehicle_types,
+            step_km, max_distance_km, model_fingerprint
+        )
+        built.save(path)
+        return cls.load(path)
+
+    def covers(self, distance: float) -> bool:
+        """Whether a distance falls inside the precomputed grid"""
+        return 0.0 <= distance <= self.max_distance_km
+
+    def lookup(
+        self,
+        distance: float,
+        hour: int,
+        day_of_week: int,
+        vehicle_codes: Sequence[int]
+    ) -> np.ndarray:
+        """
+        Interpolated durations for one trip and several vehicle types
+
+        Args:
+            distance: Trip distance in kilometers (must satisfy covers())
+            hour: Hour of day (0-23)
+            day_of_week: Day of week (0=Monday)
+            vehicle_codes: Encoded vehicle types
+
+        Returns:
+            np.ndarray: Duration per vehicle code ((n_codes, n_outputs) for multi-output tables)
+        """
+        position = distance / self.step_km
+        i = min(int(position), self.table.shape[3] - 2)
+        frac = position - i
+
+        segment = self.table[hour, day_of_week][np.asarray(vehicle_codes), i:i + 2]
+        return segment[:, 0] * (1.0 - frac) + segment[:, 1] * frac
+
+
+def _meta_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.json'
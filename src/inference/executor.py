@@ -0,0 +1,116 @@
+"""
+Inference Executor
+
+Runs model predictions off the asyncio event loop, in a thread pool or in a
+process pool whose workers each load the ETA model once.
+"""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+EXECUTOR_MODES = ('inline', 'thread', 'process')
+
+# Per-process predict function, set by _init_process_worker
+_worker_predict_fn: Optional[Callable[[np.ndarray], np.ndarray]] = None
+
+
+def _init_process_worker(bundle_path: str, use_compiled: bool) -> None:
+    """Load the ETA model bundle once when a worker process starts"""
+    global _worker_predict_fn
+    from .bundle import load_eta_bundle
+
+    bundle = load_eta_bundle(bundle_path)
+    _worker_predict_fn = bundle.predict
+    if use_compiled:
+        from .tree_compiler import compile_lgbm, stack_forests
+        try:
+            forest = compile_lgbm(bundle.model)
+            if bundle.quantile_models:
+                forest = stack_forests(
+                    [forest] + [compile_lgbm(m) for m in bundle.quantile_models.values()]
+                )
+            _worker_predict_fn = forest.predict
+        except (ValueError, AttributeError):
+            pass
+
+
+def _process_worker_predict(features: np.ndarray) -> np.ndarray:
+    return _worker_predict_fn(features)
+
+
+class InferenceExecutor:
+    """
+    Async front for a batch predict function.
+
+    Modes:
+        inline:  call predict_fn on the event loop (blocking; the old behaviour)
+        thread:  run predict_fn in a ThreadPoolExecutor (best with a GIL-releasing
+                 predict such as the native LightGBM booster)
+        process: run predictions in a ProcessPoolExecutor; each worker loads the model
+                 bundle from bundle_path once in its initializer
+    """
+
+    def __init__(
+        self,
+        predict_fn: Optional[Callable[[np.ndarray], np.ndarray]],
+        mode: str = 'thread',
+        max_workers: int = 2,
+        bundle_path: Optional[str] = None,
+        use_compiled: bool = True
+    ):
+        if mode not in EXECUTOR_MODES:
+            raise ValueError(f"Invalid executor mode: {mode} (expected one of {EXECUTOR_MODES})")
+        if mode == 'process' and not bundle_path:
+            raise ValueError("Process executor requires bundle_path")
+
+        self.mode = mode
+        self.max_workers = max_workers
+        self.predict_fn = predict_fn
+        self._pool: Optional[Executor] = None
+
+        if mode == 'thread':
+            self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='inference')
+        elif mode == 'process':
+            self._pool = ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_process_worker,
+                initargs=(bundle_path, use_compiled)
+            )
+
+    async def predict(self, features: np.ndarray) -> np.ndarray:
+        """
+        Predict a feature matrix without blocking the event loop (unless mode is inline)
+
+        Args:
+            features: (n, n_features) feature matrix. Copied before dispatch, so
+                      callers may pass views of reused buffers.
+
+        Returns:
+            np.ndarray: (n,) predictions
+        """
+        if self._pool is None:
+            return self.predict_fn(features)
+
+        features = np.array(features, dtype=np.float64)
+        fn = self.predict_fn if self.mode == 'thread' else _process_worker_predict
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, fn, features)
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """
+        Stop the worker pool
+
+        Args:
+            cancel_pending: Cancel queued predictions. With False, queued work still
+                            completes (used when a hot reload retires an old model);
+                            predictions submitted afterwards run inline.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=cancel_pending)
+            self._pool = None
+
+    def info(self) -> dict:
+        return {'mode': self.mode, 'max_workers': self.max_workers if self._pool else 0}
@@ -0,0 +1,217 @@
+"""
+ETA Feature Builder
+
+Builds ETA model feature rows straight into a reused NumPy buffer, without pandas.
+"""
+
+import numpy as np
+from typing import List, Optional, Sequence
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import VEHICLE_TYPE_CODES
+
+
+# Feature order used by scripts/train_eta_models.py
+ETA_FEATURE_COLUMNS = [
+    'trip_distance',
+    'hour',
+    'day_of_week',
+    'is_rush_hour',
+    'is_weekend',
+    'is_morning_rush',
+    'is_evening_rush',
+    'is_late_night',
+    'vehicle_encoded'
+]
+
+
+class EtaFeatureBuilder:
+    """
+    Writes ETA features for one trip (one row per vehicle type) into a preallocated buffer.
+
+    Column positions are resolved once at construction and checked against the
+    model's feature names once at load time via validate(), so the per-request
+    path is just a handful of array writes.
+
+    Note: build() returns a view of the internal buffer, which is overwritten by the
+    next call. Consume it (predict) before building again.
+    """
+
+    def __init__(
+        self,
+        feature_columns: Sequence[str] = ETA_FEATURE_COLUMNS,
+        max_rows: int = len(VEHICLE_TYPE_CODES)
+    ):
+        unknown = set(feature_columns) - set(ETA_FEATURE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown ETA feature columns: {sorted(unknown)}")
+
+        self.feature_columns = list(feature_columns)
+        self._buffer = np.zeros((max_rows, len(self.feature_columns)), dtype=np.float64)
+        self._col = {name: i for i, name in enumerate(self.feature_columns)}
+        self._mean: Optional[np.ndarray] = None
+        self._scale: Optional[np.ndarray] = None
+
+    def validate(self, estimator) -> None:
+        """
+        Check that a fitted model/scaler expects exactly our column order
+
+        Args:
+            estimator: Fitted estimator exposing feature_names_in_ or feature_name_
+
+        Raises:
+            ValueError: If the estimator was trained on a different column order
+        """
+        names = getattr(estimator, 'feature_names_in_', None)
+        if names is None:
+            names = getattr(estimator, 'feature_name_', None)
+        if names is None:
+            return  # Estimator was fitted without names; nothing to check
+
+        if list(names) != self.feature_columns:
+            raise ValueError(
+                f"Feature order mismatch: model expects {list(names)}, "
+                f"builder produces {self.feature_columns}"
+            )
+
+    def set_scaler(self, scaler) -> None:
+        """
+        Fold a fitted StandardScaler into the builder as (x - mean) / scale
+
+        Args:
+            scaler: Fitted StandardScaler, or None to disable scaling
+        """
+        if scaler is None:
+            self._mean = None
+            self._scale = None
+            return
+
+        self.validate(scaler)
+        n = len(self.feature_columns)
+        mean = getattr(scaler, 'mean_', None)
+        scale = getattr(scaler, 'scale_', None)
+        self.set_standardization(
+            np.zeros(n) if mean is None else mean,
+            np.ones(n) if scale is None else scale
+        )
+
+    def set_standardization(self, mean: Optional[np.ndarray], scale: Optional[np.ndarray]) -> None:
+        """
+        Apply (x - mean) / scale to every built row
+
+        Args:
+            mean, scale: Per-column parameters in feature_columns order, or None to disable
+        """
+        if mean is None or scale is None:
+            self._mean = None
+            self._scale = None
+            return
+
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        if mean.shape != (len(self.feature_columns),) or scale.shape != mean.shape:
+            raise ValueError("Standardization parameters do not match the number of features")
+        self._mean = mean
+        self._scale = scale
+
+    def build(
+        self,
+        distance: float,
+        hour: int,
+        day_of_week: int,
+        vehicle_codes: List[int]
+    ) -> np.ndarray:
+        """
+        Build the feature matrix for one trip
+
+        Args:
+            distance: Trip distance in kilometers
+            hour: Hour of day (0-23)
+            day_of_week: Day of week (0=Monday)
+            vehicle_codes: Encoded vehicle types, one row each
+
+        Returns:
+            np.ndarray: (len(vehicle_codes), n_features) view of the internal buffer
+        """
+        n = len(vehicle_codes)
+        if n > self._buffer.shape[0]:
+            self._buffer = np.zeros((n, self._buffer.shape[1]), dtype=np.float64)
+
+        is_morning_rush = 1.0 if 7 <= hour < 10 else 0.0
+        is_evening_rush = 1.0 if 17 <= hour < 20 else 0.0
+        values = {
+            'trip_distance': distance,
+            'hour': hour,
+            'day_of_week': day_of_week,
+            'is_rush_hour': max(is_morning_rush, is_evening_rush),
+            'is_weekend': 1.0 if day_of_week >= 5 else 0.0,
+            'is_morning_rush': is_morning_rush,
+            'is_evening_rush': is_evening_rush,
+            'is_late_night': 1.0 if hour >= 23 or hour < 5 else 0.0
+        }
+
+        rows = self._buffer[:n]
+        for name, value in values.items():
+            if name in self._col:
+                rows[:, self._col[name]] = value
+        if 'vehicle_encoded' in self._col:
+            rows[:, self._col['vehicle_encoded']] = vehicle_codes
+
+        if self._mean is not None:
+            rows -= self._mean
+            rows /= self._scale
+
+        return rows
+
+    def build_batch(
+        self,
+        distance: np.ndarray,
+        hour: np.ndarray,
+        day_of_week: np.ndarray,
+        vehicle_codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Build a feature matrix for many trips at once (vectorized, new array)
+
+        Args:
+            distance: Trip distances in kilometers
+            hour: Hours of day (0-23)
+            day_of_week: Days of week (0=Monday)
+            vehicle_codes: Encoded vehicle types
+
+        Returns:
+            np.ndarray: (n, n_features) feature matrix, scaled if a scaler is set
+        """
+        distance, hour, day_of_week, vehicle_codes = np.broadcast_arrays(
+            np.asarray(distance, dtype=np.float64),
+            np.asarray(hour),
+            np.asarray(day_of_week),
+            np.asarray(vehicle_codes)
+        )
+        is_morning_rush = (hour >= 7) & (hour < 10)
+        is_evening_rush = (hour >= 17) & (hour < 20)
+        values = {
+            'trip_distance': distance,
+            'hour': hour,
+            'day_of_week': day_of_week,
+            'is_rush_hour': is_morning_rush | is_evening_rush,
+            'is_weekend': day_of_week >= 5,
+            'is_morning_rush': is_morning_rush,
+            'is_evening_rush': is_evening_rush,
+            'is_late_night': (hour >= 23) | (hour < 5),
+            'vehicle_encoded': vehicle_codes
+        }
+
+        rows = np.empty((distance.size, len(self.feature_columns)), dtype=np.float64)
+        for name, i in self._col.items():
+            rows[:, i] = values[name].ravel()
+
+        if self._mean is not None:
+            rows -= self._mean
+            rows /= self._scale
+
+        return rows
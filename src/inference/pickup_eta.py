@@ -0,0 +1,161 @@
+"""
+Pickup ETA Model
+
+Predicts how long a driver needs to reach the pickup point from the
+straight-line distance, hour of day, region and vehicle type. Learned from
+completed rides as a table of travel paces (minutes per km) per
+(region, hour, vehicle type), evaluated for all candidates in one
+vectorized gather.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+
+N_HOURS = 24
+
+
+class PickupEtaModel:
+    """
+    Pace table [region, hour, vehicle_code] in minutes per road-km.
+
+    ETA (minutes) = detour_factor * straight_line_km * pace[region, hour, code].
+
+    Design Decisions:
+    1. Paces, not speeds: Pace is additive in duration, so a cell's pace is
+       total minutes / total km (a ratio estimator that is unbiased for duration).
+    2. Shrinkage: Sparse (region, hour, type) cells are pulled towards the
+       (hour, type) pace, which is pulled towards the hour pace, with
+       `prior_strength` pseudo-rides at each level.
+    3. Detour factor: Road distance / straight-line distance, learned from the
+       rides (or set from a road graph when one is available).
+    """
+
+    def __init__(self, pace: np.ndarray, detour_factor: float = 1.0, meta: Optional[Dict] = None):
+        self.pace = np.ascontiguousarray(pace, dtype=np.float64)
+        self.detour_factor = float(detour_factor)
+        self.meta = dict(meta or {})
+
+    @property
+    def n_regions(self) -> int:
+        return self.pace.shape[0]
+
+    @classmethod
+    def fit(
+        cls,
+        straight_km: np.ndarray,
+        road_km: np.ndarray,
+        duration_min: np.ndarray,
+        region: np.ndarray,
+        hour: np.ndarray,
+        vehicle_code: np.ndarray,
+        n_regions: int,
+        n_vehicle_types: int,
+        prior_strength: float = 5.0
+    ) -> 'PickupEtaModel':
+        """
+        Learn paces from completed rides
+
+        Args:
+            straight_km: Straight-line (haversine) distance per ride
+            road_km: Travelled distance per ride
+            duration_min: Ride duration in minutes
+            region: Origin region index per ride
+            hour: Hour of day per ride
+            vehicle_code: Encoded vehicle type per ride
+            n_regions: Number of regions
+            n_vehicle_types: Number of vehicle type codes
+            prior_strength: Pseudo-ride count used for shrinkage
+
+        Returns:
+            PickupEtaModel: Fitted model
+        """
+        straight_km = np.asarray(straight_km, dtype=np.float64)
+        road_km = np.asarray(road_km, dtype=np.float64)
+        duration_min = np.asarray(duration_min, dtype=np.float64)
+        region = np.asarray(region, dtype=np.intp)
+        hour = np.asarray(hour, dtype=np.intp)
+        vehicle_code = np.asarray(vehicle_code, dtype=np.intp)
+
+        valid = (road_km > 0) & (duration_min > 0) & (straight_km > 0)
+        straight_km, road_km, duration_min = straight_km[valid], road_km[valid], duration_min[valid]
+        region, hour, vehicle_code = region[valid], hour[valid], vehicle_code[valid]
+        if road_km.size == 0:
+            raise ValueError("No valid rides to fit the pickup ETA model")
+
+        detour_factor = float(np.median(road_km / straight_km))
+
+        def sums(index, size):
+            return (np.bincount(index, weights=duration_min, minlength=size),
+                    np.bincount(index, weights=road_km, minlength=size),
+                    np.bincount(index, minlength=size))
+
+        def shrink(minutes, km, counts, prior):
+            # Pace of each cell, pulled towards its prior by prior_strength rides
+            cell_pace = np.divide(minutes, km, out=prior.copy(), where=km > 0)
+            weight = np.divide(counts, counts + prior_strength, out=np.zeros_like(prior), where=counts > 0)
+            return weight * cell_pace + (1 - weight) * prior
+
+        global_pace = duration_min.sum() / road_km.sum()
+
+        # Hour -> (hour, type) -> (region, hour, type)
+        hour_pace = shrink(*sums(hour, N_HOURS), np.full(N_HOURS, global_pace))
+
+        hour_type = hour * n_vehicle_types + vehicle_code
+        hour_type_pace = shrink(
+            *sums(hour_type, N_HOURS * n_vehicle_types),
+            np.repeat(hour_pace, n_vehicle_types)
+        )
+
+        cell = (region * N_HOURS + hour) * n_vehicle_types + vehicle_code
+        n_cells = n_regions * N_HOURS * n_vehicle_types
+        cell_pace = shrink(*sums(cell, n_cells), np.tile(hour_type_pace, n_regions))
+
+        meta = {
+            'n_rides': int(road_km.size),
+            'prior_strength': prior_strength,
+            'global_speed_kmh': round(60.0 / global_pace, 2),
+            'trained_at': datetime.now().isoformat()
+        }
+        return cls(cell_pace.reshape(n_regions, N_HOURS, n_vehicle_types), detour_factor, meta)
+
+    def predict(
+        self,
+        straight_km: np.ndarray,
+        region: np.ndarray,
+        hour,
+        vehicle_code: np.ndarray
+    ) -> np.ndarray:
+        """
+        Pickup ETAs for many candidates in one call
+
+        Args:
+            straight_km: Straight-line distance from each vehicle to the pickup
+            region: Region index per vehicle (see get_region_ids)
+            hour: Hour of day (scalar or per vehicle)
+            vehicle_code: Encoded vehicle type per vehicle
+
+        Returns:
+            np.ndarray: ETA in minutes per vehicle
+        """
+        pace = self.pace[np.asarray(region), np.asarray(hour), np.asarray(vehicle_code)]
+        return self.detour_factor * np.asarray(straight_km, dtype=np.float64) * pace
+
+    def save(self, path: str) -> None:
+        """Write the pace table and metadata to a .npz file"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        np.savez(
+            path,
+            pace=self.pace,
+            detour_factor=np.float64(self.detour_factor),
+            meta=np.array(json.dumps(self.meta))
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'PickupEtaModel':
+        """Load a model saved with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(data['pace'], float(data['detour_factor']), json.loads(str(data['meta'])))
@@ -0,0 +1,265 @@
+"""
+Tree Compiler
+
+Flattens a trained LightGBM model into contiguous NumPy arrays and evaluates
+batches of rows across all trees with vectorized array indexing.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+# LightGBM's kZeroThreshold: feature values within this of 0.0 count as zero
+K_ZERO_THRESHOLD = 1e-35
+
+
+class CompiledForest:
+    """
+    Flat-array representation of a LightGBM regression forest.
+
+    All trees share one set of node arrays; `roots` holds each tree's root index.
+    Leaves point to themselves (left = right = own index), so every row can take
+    exactly `max_depth` steps without checking whether it has already landed.
+
+    Several models over the same features (e.g. a point model and quantile
+    models) can be stacked into one forest with stack_forests(); their trees
+    are stored consecutively and `output_offsets` marks where each model's
+    trees start, so one traversal yields every model's prediction.
+
+    Arrays:
+        feature:   int32   split feature index (0 for leaves)
+        threshold: float64 split threshold, go left when x <= threshold
+        left:      int32   left child node index
+        right:     int32   right child node index
+        value:     float64 leaf output (0 for internal nodes)
+        default_left: bool  direction for missing inputs
+        zero_missing: bool  also treat 0.0 as missing (LightGBM missing_type 'Zero')
+        roots:     int32   root node index for each tree
+        output_offsets: int32 first tree of each output ([0] for a single model)
+    """
+
+    ARRAY_NAMES = ('feature', 'threshold', 'left', 'right', 'value', 'default_left', 'roots')
+    # Saved alongside ARRAY_NAMES; absent in files exported before it existed
+    OPTIONAL_ARRAY_NAMES = ('zero_missing',)
+
+    def __init__(
+        self,
+        feature: np.ndarray,
+        threshold: np.ndarray,
+        left: np.ndarray,
+        right: np.ndarray,
+        value: np.ndarray,
+        default_left: np.ndarray,
+        roots: np.ndarray,
+        max_depth: int,
+        feature_names: List[str],
+        output_offsets: Optional[np.ndarray] = None,
+        zero_missing: Optional[np.ndarray] = None
+    ):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.value = np.ascontiguousarray(value, dtype=np.float64)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        self.zero_missing = np.ascontiguousarray(
+            np.zeros(len(self.feature), dtype=bool) if zero_missing is None else zero_missing, dtype=bool
+        )
+        self._has_zero_missing = bool(self.zero_missing.any())
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.max_depth = int(max_depth)
+        self.feature_names = list(feature_names)
+        self.output_offsets = np.ascontiguousarray(
+            [0] if output_offsets is None else output_offsets, dtype=np.int32
+        )
+
+        # Interleaved children: node i goes to _children[2*i] (left) or _children[2*i + 1] (right)
+        self._children = np.empty(2 * len(self.left), dtype=np.intp)
+        self._children[0::2] = self.left
+        self._children[1::2] = self.right
+
+    @property
+    def num_trees(self) -> int:
+        return len(self.roots)
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.feature)
+
+    @property
+    def num_outputs(self) -> int:
+        return len(self.output_offsets)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """
+        Predict a batch of rows
+
+        Args:
+            X: (n_rows, n_features) feature matrix
+
+        Returns:
+            np.ndarray: (n_rows,) predictions, or (n_rows, num_outputs) for a stacked forest
+        """
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+
+        n_rows, n_features = X.shape
+        flat_X = np.ascontiguousarray(X).ravel()
+        row_offsets = (np.arange(n_rows, dtype=np.intp) * n_features)[:, None]
+
+        # (n_rows, n_trees) current node per row per tree
+        nodes = np.broadcast_to(self.roots.astype(np.intp), (n_rows, self.num_trees)).copy()
+        for _ in range(self.max_depth):
+            x = flat_X.take(row_offsets + self.feature.take(nodes))
+            go_right = ~(x <= self.threshold.take(nodes))
+            missing = np.isnan(x)
+            if self._has_zero_missing:
+                # LightGBM treats |x| <= kZeroThreshold as zero
+                missing |= self.zero_missing.take(nodes) & (np.abs(x) <= K_ZERO_THRESHOLD)
+            if missing.any():
+                go_right[missing] = ~self.default_left.take(nodes[missing])
+            nodes = self._children.take(2 * nodes + go_right)
+
+        leaf_values = self.value[nodes]
+        if self.num_outputs == 1:
+            return leaf_values.sum(axis=1)
+        return np.add.reduceat(leaf_values, self.output_offsets, axis=1)
+
+    def save(self, path: str) -> None:
+        """Export the flat arrays to a .npz file"""
+        np.savez(
+            path,
+            max_depth=np.array(self.max_depth),
+            feature_names=np.array(self.feature_names),
+            output_offsets=self.output_offsets,
+            **{name: getattr(self, name) for name in self.ARRAY_NAMES + self.OPTIONAL_ARRAY_NAMES}
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'CompiledForest':
+        """Load a forest exported with save()"""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                max_depth=int(data['max_depth']),
+                feature_names=[str(name) for name in data['feature_names']],
+                output_offsets=data['output_offsets'] if 'output_offsets' in data else None,
+                **{name: data[name] for name in cls.ARRAY_NAMES},
+                **{name: data[name] for name in cls.OPTIONAL_ARRAY_NAMES if name in data}
+            )
+
+
+def compile_lgbm(model) -> CompiledForest:
+    """
+    Flatten a LightGBM model into a CompiledForest
+
+    Args:
+        model: Fitted lightgbm.LGBMRegressor or lightgbm.Booster
+
+    Returns:
+        CompiledForest: Flat-array forest matching model.predict
+
+    Raises:
+        ValueError: If the model uses features the compiler does not support
+                    (categorical splits, multiclass output, linear trees)
+    """
+    booster = getattr(model, 'booster_', model)
+    dump = booster.dump_model()
+
+    if dump.get('num_tree_per_iteration', 1) != 1:
+        raise ValueError("Only single-output (regression) models can be compiled")
+
+    columns: Dict[str, List] = {
+        'feature': [], 'threshold': [], 'left': [], 'right': [],
+        'value': [], 'default_left': [], 'zero_missing': []
+    }
+    roots = []
+    max_depth = 0
+
+    def add_node() -> int:
+        for values in columns.values():
+            values.append(0)
+        return len(columns['feature']) - 1
+
+    def walk(node: Dict, depth: int) -> int:
+        nonlocal max_depth
+        index = add_node()
+
+        if 'leaf_value' in node or 'split_index' not in node:
+            if 'leaf_coeff' in node:
+                raise ValueError("Linear trees are not supported")
+            columns['left'][index] = index
+            columns['right'][index] = index
+            columns['value'][index] = node.get('leaf_value', 0.0)
+            max_depth = max(max_depth, depth)
+            return index
+
+        if node['decision_type'] != '<=':
+            raise ValueError(f"Unsupported split type: {node['decision_type']}")
+
+        columns['feature'][index] = node['split_feature']
+        columns['threshold'][index] = node['threshold']
+        # missing_type 'None' means LightGBM maps NaN to 0.0 before comparing;
+        # 'Zero' sends both 0.0 and NaN in the default direction
+        missing_type = node.get('missing_type', 'None')
+        if missing_type in ('NaN', 'Zero'):
+            columns['default_left'][index] = node['default_left']
+            columns['zero_missing'][index] = missing_type == 'Zero'
+        elif missing_type == 'None':
+            columns['default_left'][index] = 0.0 <= node['threshold']
+        else:
+            raise ValueError(f"Unsupported missing value handling: {missing_type}")
+        columns['left'][index] = walk(node['left_child'], depth + 1)
+        columns['right'][index] = walk(node['right_child'], depth + 1)
+        return index
+
+    for tree in dump['tree_info']:
+        roots.append(walk(tree['tree_structure'], 0))
+
+    return CompiledForest(
+        roots=np.array(roots),
+        max_depth=max_depth,
+        feature_names=dump.get('feature_names', []),
+        **{name: np.array(values) for name, values in columns.items()}
+    )
+
+
+def stack_forests(forests: Sequence[CompiledForest]) -> CompiledForest:
+    """
+    Combine single-output forests over the same features into one multi-output forest
+
+    Args:
+        forests: Compiled forests, in output order
+
+    Returns:
+        CompiledForest: Forest whose predict returns one column per input forest
+
+    Raises:
+        ValueError: If the forests use different features or are already stacked
+    """
+    if any(forest.num_outputs != 1 for forest in forests):
+        raise ValueError("Only single-output forests can be stacked")
+    if any(forest.feature_names != forests[0].feature_names for forest in forests):
+        raise ValueError("Stacked forests must share the same feature columns")
+
+    node_offsets = np.cumsum([0] + [forest.num_nodes for forest in forests[:-1]])
+    tree_offsets = np.cumsum([0] + [forest.num_trees for forest in forests[:-1]])
+
+    def concat(name, shift_by_nodes=False):
+        return np.concatenate([
+            getattr(forest, name) + (offset if shift_by_nodes else 0)
+            for forest, offset in zip(forests, node_offsets)
+        ])
+
+    return CompiledForest(
+        feature=concat('feature'),
+        threshold=concat('threshold'),
+        left=concat('left', shift_by_nodes=True),
+        right=concat('right', shift_by_nodes=True),
+        value=concat('value'),
+        default_left=concat('default_left'),
+        zero_missing=concat('zero_missing'),
+        roots=concat('roots', shift_by_nodes=True),
+        max_depth=max(forest.max_depth for forest in forests),
+        feature_names=forests[0].feature_names,
+        output_offsets=tree_offsets
+    )
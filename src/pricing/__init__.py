@@ -4,20 +4,40 @@ Pricing module for dynamic surge pricing
 
 from .dynamic_pricing import (
     load_demand_model,
+    get_region_index,
     get_region_id,
+    get_region_ids,
+    format_region_id,
     get_demand_score,
     calculate_demand_supply_ratio,
     get_surge_multiplier,
+    get_surge_multipliers,
     get_surge_with_fallback,
-    calculate_fare
+    calculate_fare,
+    calculate_fares,
+    fare_breakdown
 )
+from .demand_table import DemandTable
+from .supply import SupplyGrid
+from .city_grid import CityGrid, city_grid, load_city_grid
 
 __all__ = [
     'load_demand_model',
+    'get_region_index',
     'get_region_id',
+    'get_region_ids',
+    'format_region_id',
+    'DemandTable',
+    'SupplyGrid',
+    'CityGrid',
+    'city_grid',
+    'load_city_grid',
     'get_demand_score',
     'calculate_demand_supply_ratio',
     'get_surge_multiplier',
+    'get_surge_multipliers',
     'get_surge_with_fallback',
-    'calculate_fare'
+    'calculate_fare',
+    'calculate_fares',
+    'fare_breakdown'
 ]
@@ -0,0 +1,239 @@
+"""
+City Grid
+
+Regions used by demand estimation, surge pricing and supply counting.
+The city bounds are split into a base grid of GRID_SIZE x GRID_SIZE cells,
+and cells with many historical pickups are split again quadtree-style, so
+dense areas get smaller regions. Point-to-region lookup is O(1) through a
+precomputed raster at the finest resolution.
+
+Without a saved grid the uniform base grid is used, whose region indices
+(lat_idx * GRID_SIZE + lon_idx) and IDs ("lat_idx_lon_idx") are unchanged.
+"""
+
+import hashlib
+import json
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import (
+    CITY_MIN_LAT,
+    CITY_MAX_LAT,
+    CITY_MIN_LON,
+    CITY_MAX_LON,
+    GRID_SIZE,
+    CITY_GRID_PATH,
+    CITY_GRID_MAX_DEPTH,
+    CITY_GRID_SPLIT_RIDES
+)
+
+CITY_BOUNDS = (CITY_MIN_LAT, CITY_MAX_LAT, CITY_MIN_LON, CITY_MAX_LON)
+
+
+def uniform_cell_ids(lats, lons, size: int, bounds: Sequence[float] = CITY_BOUNDS) -> np.ndarray:
+    """
+    Cell index lat_idx * size + lon_idx on a uniform size x size grid over the bounds
+
+    Points outside the bounds are clipped to the nearest edge cell.
+    """
+    min_lat, max_lat, min_lon, max_lon = bounds
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    lat_idx = np.floor((lats - min_lat) / (max_lat - min_lat) * size)
+    lon_idx = np.floor((lons - min_lon) / (max_lon - min_lon) * size)
+    lat_idx = np.clip(lat_idx, 0, size - 1).astype(np.intp)
+    lon_idx = np.clip(lon_idx, 0, size - 1).astype(np.intp)
+    return lat_idx * size + lon_idx
+
+
+def _parse_leaf(region_id: str) -> Tuple[int, int, str]:
+    base, _, path = region_id.partition('.')
+    lat_idx, lon_idx = map(int, base.split('_'))
+    if any(q not in '0123' for q in path):
+        raise ValueError(f"Invalid region ID: {region_id}")
+    return lat_idx, lon_idx, path
+
+
+class CityGrid:
+    """
+    Multi-resolution grid of regions.
+
+    Design Decisions:
+    1. Leaves: Regions are the leaves of a quadtree under each base cell, named
+       "lat_idx_lon_idx" plus a '.'-separated quadrant path for split cells
+       (quadrant = 2 * north + east, e.g. "2_2.13"). Leaves are numbered in
+       base-cell row-major order, so an unsplit grid keeps the uniform indices.
+    2. Raster: A (base_size * 2**max_depth)^2 array maps every finest cell to
+       its region, so a lookup is one index computation and one array read.
+    3. Fingerprint: A hash of the leaves identifies the grid, so artifacts built
+       on another grid (demand table) can be detected and rejected.
+    """
+
+    def __init__(
+        self,
+        leaves: Sequence[str],
+        base_size: int = GRID_SIZE,
+        max_depth: int = CITY_GRID_MAX_DEPTH,
+        bounds: Sequence[float] = CITY_BOUNDS
+    ):
+        self.leaves = list(leaves)
+        self.base_size = base_size
+        self.max_depth = max_depth
+        self.bounds = tuple(bounds)
+        self.size = base_size * 2 ** max_depth
+        self.n_regions = len(self.leaves)
+        self._index = {leaf: i for i, leaf in enumerate(self.leaves)}
+
+        # Raster of region per finest cell, plus each region's depth and center
+        raster = np.full((self.size, self.size), -1, dtype=np.int32)
+        self.depths = np.zeros(self.n_regions, dtype=np.int64)
+        center_rows = np.zeros(self.n_regions)
+        center_cols = np.zeros(self.n_regions)
+        for region, leaf in enumerate(self.leaves):
+            lat_idx, lon_idx, path = _parse_leaf(leaf)
+            if len(path) > max_depth or not (0 <= lat_idx < base_size and 0 <= lon_idx < base_size):
+                raise ValueError(f"Region {leaf} is outside a {base_size}x{base_size} grid of depth {max_depth}")
+            span = 2 ** max_depth
+            row, col = lat_idx * span, lon_idx * span
+            for q in path:
+                span //= 2
+                row += (int(q) // 2) * span
+                col += (int(q) % 2) * span
+            if (raster[row:row + span, col:col + span] != -1).any():
+                raise ValueError(f"Region {leaf} overlaps another region")
+            raster[row:row + span, col:col + span] = region
+            self.depths[region] = len(path)
+            center_rows[region] = row + span / 2
+            center_cols[region] = col + span / 2
+        if (raster == -1).any():
+            raise ValueError("Regions do not cover the whole grid")
+        self._raster = raster.ravel()
+
+        min_lat, max_lat, min_lon, max_lon = self.bounds
+        self.center_lats = min_lat + center_rows / self.size * (max_lat - min_lat)
+        self.center_lons = min_lon + center_cols / self.size * (max_lon - min_lon)
+        # Region area relative to a base cell
+        self.area_fractions = 0.25 ** self.depths
+
+        self.fingerprint = hashlib.sha1(json.dumps(
+            [self.bounds, base_size, max_depth, self.leaves]
+        ).encode()).hexdigest()[:12]
+
+    @classmethod
+    def uniform(cls, base_size: int = GRID_SIZE, bounds: Sequence[float] = CITY_BOUNDS) -> 'CityGrid':
+        """Base grid without any splits"""
+        leaves = [f"{i}_{j}" for i in range(base_size) for j in range(base_size)]
+        return cls(leaves, base_size, max_depth=0, bounds=bounds)
+
+    @classmethod
+    def from_points(
+        cls,
+        lats,
+        lons,
+        split_threshold: int = CITY_GRID_SPLIT_RIDES,
+        max_depth: int = CITY_GRID_MAX_DEPTH,
+        base_size: int = GRID_SIZE,
+        bounds: Sequence[float] = CITY_BOUNDS
+    ) -> 'CityGrid':
+        """
+        Split base cells quadtree-style where historical pickups are dense
+
+        Args:
+            lats: Pickup latitudes
+            lons: Pickup longitudes
+            split_threshold: A cell with more pickups than this is split in four
+            max_depth: Maximum number of splits of a base cell
+            base_size: Base grid size
+            bounds: (min_lat, max_lat, min_lon, max_lon)
+
+        Returns:
+            CityGrid: Grid with dense cells split
+        """
+        size = base_size * 2 ** max_depth
+        counts = np.bincount(
+            uniform_cell_ids(lats, lons, size, bounds), minlength=size * size
+        ).reshape(size, size)
+
+        leaves: List[str] = []
+
+        def split(name: str, path: str, row: int, col: int, span: int) -> None:
+            if len(path) < max_depth and counts[row:row + span, col:col + span].sum() > split_threshold:
+                half = span // 2
+                for q in range(4):
+                    split(name, path + str(q), row + (q // 2) * half, col + (q % 2) * half, half)
+            else:
+                leaves.append(f"{name}.{path}" if path else name)
+
+        span = 2 ** max_depth
+        for i in range(base_size):
+            for j in range(base_size):
+                split(f"{i}_{j}", '', i * span, j * span, span)
+        return cls(leaves, base_size, max_depth, bounds)
+
+    def region_index(self, lat: float, lon: float) -> int:
+        """Region index of one point"""
+        min_lat, max_lat, min_lon, max_lon = self.bounds
+        lat_idx = max(0, min(self.size - 1, int((lat - min_lat) / (max_lat - min_lat) * self.size)))
+        lon_idx = max(0, min(self.size - 1, int((lon - min_lon) / (max_lon - min_lon) * self.size)))
+        return int(self._raster[lat_idx * self.size + lon_idx])
+
+    def region_ids(self, lats, lons) -> np.ndarray:
+        """Region index per point"""
+        return self._raster[uniform_cell_ids(lats, lons, self.size, self.bounds)].astype(np.intp)
+
+    def format_region_id(self, region: int) -> str:
+        """Region ID string of a region index"""
+        return self.leaves[int(region)]
+
+    def parse_region_id(self, region_id: str) -> int:
+        """Region index of a region ID string"""
+        try:
+            return self._index[region_id]
+        except KeyError:
+            raise ValueError(f"Unknown region ID: {region_id}")
+
+    def save(self, path: str) -> None:
+        """Write the grid definition (JSON)"""
+        with open(path + '.tmp', 'w') as f:
+            json.dump({
+                'bounds': list(self.bounds),
+                'base_size': self.base_size,
+                'max_depth': self.max_depth,
+                'fingerprint': self.fingerprint,
+                'leaves': self.leaves
+            }, f, indent=2)
+        os.replace(path + '.tmp', path)
+
+    @classmethod
+    def load(cls, path: str) -> 'CityGrid':
+        """Read a saved grid"""
+        with open(path, 'r') as f:
+            data = json.load(f)
+        return cls(data['leaves'], data['base_size'], data['max_depth'], data['bounds'])
+
+
+def load_city_grid(path: Optional[str] = CITY_GRID_PATH) -> CityGrid:
+    """
+    Load the saved city grid, or the uniform base grid if there is none
+
+    Args:
+        path: Grid file written by scripts/build_city_grid.py
+
+    Returns:
+        CityGrid: Grid shared by demand estimation, surge and supply counting
+    """
+    if path and os.path.exists(path):
+        grid = CityGrid.load(path)
+        print(f"✓ City grid loaded ({grid.n_regions} regions, max depth {grid.max_depth})")
+        return grid
+    return CityGrid.uniform()
+
+
+# Global instance
+city_grid = load_city_grid()
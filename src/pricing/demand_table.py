@@ -0,0 +1,260 @@
+"""
+Demand Table
+
+Dense demand per (region, hour, day of week), so a surge lookup is one
+array index instead of dictionary probes with string region keys.
+
+Each slot holds the demand score, its derived surge tier and the number of
+rides it was estimated from. The table is stored as a single structured
+.npy file (plus a .json sidecar) and memory-mapped on load.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import DEMAND_TIER_THRESHOLDS, SURGE_MULTIPLIERS
+from .city_grid import city_grid
+
+N_HOURS = 24
+N_DAYS = 7
+WEEKEND_DAYS = (5, 6)
+
+# Tier codes index into SURGE_MULTIPLIERS order (discount, normal, moderate, high)
+SURGE_TIERS = list(SURGE_MULTIPLIERS)
+
+SLOT_DTYPE = np.dtype([('score', '<f4'), ('tier', 'i1'), ('rides', '<u2')])
+
+
+def demand_tiers(scores: np.ndarray) -> np.ndarray:
+    """Surge tier code per demand score (see DEMAND_TIER_THRESHOLDS)"""
+    return np.searchsorted(DEMAND_TIER_THRESHOLDS, scores, side='right').astype(np.int8)
+
+
+class DemandTable:
+    """
+    Demand slots in a [region, hour, day_of_week] structured array.
+
+    Regions are integer region indices of the city grid
+    (see get_region_ids).
+    """
+
+    def __init__(self, slots: np.ndarray, meta: Optional[Dict] = None):
+        if slots.dtype != SLOT_DTYPE:
+            raise ValueError(f"Demand slots must have dtype {SLOT_DTYPE}, got {slots.dtype}")
+        if slots.ndim != 3 or slots.shape[1:] != (N_HOURS, N_DAYS):
+            raise ValueError(
+                f"Demand table must have shape (regions, {N_HOURS}, {N_DAYS}), got {slots.shape}"
+            )
+        self.slots = slots
+        self.meta = dict(meta or {})
+
+    @property
+    def scores(self) -> np.ndarray:
+        return self.slots['score']
+
+    @property
+    def tiers(self) -> np.ndarray:
+        return self.slots['tier']
+
+    @property
+    def rides(self) -> np.ndarray:
+        return self.slots['rides']
+
+    @property
+    def n_regions(self) -> int:
+        return self.slots.shape[0]
+
+    @classmethod
+    def from_scores(
+        cls,
+        scores: np.ndarray,
+        rides: Optional[np.ndarray] = None,
+        meta: Optional[Dict] = None
+    ) -> 'DemandTable':
+        """
+        Build the table from dense scores, deriving the surge tiers
+
+        Args:
+            scores: Demand scores (0-1), shape (regions, 24, 7)
+            rides: Rides observed per slot (coverage); defaults to none observed
+            meta: Extra metadata
+
+        Returns:
+            DemandTable: Table
+        """
+        scores = np.asarray(scores, dtype=np.float64)
+        if scores.ndim != 3:
+            raise ValueError(f"Demand scores must be 3-D, got shape {scores.shape}")
+        slots = np.zeros(scores.shape, dtype=SLOT_DTYPE)
+        slots['score'] = scores
+        slots['tier'] = demand_tiers(scores)
+        if rides is not None:
+            slots['rides'] = np.minimum(rides, np.iinfo(np.uint16).max)
+        return cls(slots, meta)
+
+    @classmethod
+    def from_rides(
+        cls,
+        region: np.ndarray,
+        hour: np.ndarray,
+        day_of_week: np.ndarray,
+        date: np.ndarray,
+        n_regions: int
+    ) -> 'DemandTable':
+        """
+        Estimate demand from completed rides
+
+        Rides are counted per (region, hour, day type), where day type is
+        weekday or weekend, and divided by the number of such days in the
+        data. Scores are the resulting rides/hour min-max scaled to 0-1.
+
+        Args:
+            region: Origin region index per ride
+            hour: Hour of day per ride
+            day_of_week: Day of week per ride (0=Monday)
+            date: Calendar date per ride (counts days of each type)
+            n_regions: Number of regions
+
+        Returns:
+            DemandTable: Table with coverage metadata
+        """
+        region = np.asarray(region, dtype=np.intp)
+        hour = np.asarray(hour, dtype=np.intp)
+        day_type = np.isin(day_of_week, WEEKEND_DAYS).astype(np.intp)
+        if region.size == 0:
+            raise ValueError("No rides to estimate demand from")
+
+        cell = (region * N_HOURS + hour) * 2 + day_type
+        counts = np.bincount(cell, minlength=n_regions * N_HOURS * 2).reshape(n_regions, N_HOURS, 2)
+
+        dates = np.asarray(date)
+        n_days = np.array([len(np.unique(dates[day_type == t])) for t in (0, 1)], dtype=np.float64)
+        rate = counts / np.maximum(n_days, 1)  # Rides per hour on a day of that type
+        scores = (rate - rate.min()) / max(rate.max() - rate.min(), 1e-12)
+
+        # Expand day types to days of the week
+        day_types = np.isin(np.arange(N_DAYS), WEEKEND_DAYS).astype(np.intp)
+        meta = {
+            'grid_cells': n_regions,
+            'n_rides': int(region.size),
+            'days': {'weekday': int(n_days[0]), 'weekend': int(n_days[1])},
+            'peak_rides_per_hour': round(float(rate.max()), 3),
+            'built_at': datetime.now().isoformat()
+        }
+        return cls.from_scores(scores[:, :, day_types], counts[:, :, day_types], meta)
+
+    @classmethod
+    def from_records(
+        cls,
+        records: Iterable[Dict],
+        grid_size: Optional[int] = None,
+        default_score: float = 0.5
+    ) -> 'DemandTable':
+        """
+        Build the table from per-slot records
+
+        Args:
+            records: Dicts with region_id, hour and demand_score;
+                     records without day_of_week apply to every day
+            grid_size: Size of the uniform grid ("lat_idx_lon_idx") the region IDs
+                       refer to (default: the city grid)
+            default_score: Score of slots without a record
+
+        Returns:
+            DemandTable: Dense table
+        """
+        if grid_size is None:
+            n_regions, parse = city_grid.n_regions, city_grid.parse_region_id
+        else:
+            def parse(region_id):
+                lat_idx, lon_idx = map(int, str(region_id).split('_'))
+                return lat_idx * grid_size + lon_idx
+            n_regions = grid_size * grid_size
+
+        scores = np.full((n_regions, N_HOURS, N_DAYS), default_score)
+        rides = np.zeros(scores.shape, dtype=np.int64)
+        for record in records:
+            slot = (parse(str(record['region_id'])), int(record['hour']), record.get('day_of_week', slice(None)))
+            scores[slot] = record['demand_score']
+            rides[slot] = record.get('demand_count', 1)
+        return cls.from_scores(scores, rides, {'grid_cells': n_regions})
+
+    def score(self, region, hour, day_of_week=0):
+        """
+        Demand score lookup (scalars or arrays of regions/hours/days)
+
+        Args:
+            region: Integer region index
+            hour: Hour of day (0-23)
+            day_of_week: Day of week (0=Monday)
+
+        Returns:
+            float or np.ndarray: Demand score(s)
+        """
+        return self.slots['score'][region, hour, day_of_week]
+
+    def tier(self, region, hour, day_of_week=0):
+        """Surge tier code(s); SURGE_TIERS[code] is the tier name"""
+        return self.slots['tier'][region, hour, day_of_week]
+
+    def validate(self, n_regions: int) -> Dict:
+        """
+        Check the table against the serving grid and report its coverage
+
+        Args:
+            n_regions: Number of regions of the serving grid
+
+        Returns:
+            dict: Coverage report (share of slots and list of regions without rides)
+
+        Raises:
+            ValueError: If the table does not match the grid or holds invalid scores/tiers
+        """
+        if self.n_regions != n_regions:
+            raise ValueError(f"Demand table has {self.n_regions} regions, the grid has {n_regions}")
+        scores = self.scores
+        if not np.all(np.isfinite(scores)) or scores.min() < 0 or scores.max() > 1:
+            raise ValueError("Demand scores must be finite and within [0, 1]")
+        if self.tiers.min() < 0 or self.tiers.max() >= len(SURGE_TIERS):
+            raise ValueError("Demand table holds unknown surge tiers")
+
+        observed = self.rides > 0
+        return {
+            'slot_coverage': round(float(observed.mean()), 4),
+            'regions_without_data': np.flatnonzero(~observed.any(axis=(1, 2))).tolist()
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Write the slots (.npy) and metadata (.json sidecar)
+
+        Both files are written to temporaries and renamed into place, so a
+        table that is still memory-mapped keeps its old contents.
+        """
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        meta = dict(self.meta, shape=list(self.slots.shape), surge_tiers=SURGE_TIERS)
+        with open(path + '.tmp', 'wb') as f:
+            np.save(f, np.ascontiguousarray(self.slots))
+        with open(_meta_path(path) + '.tmp', 'w') as f:
+            json.dump(meta, f, indent=2)
+        os.replace(path + '.tmp', path)
+        os.replace(_meta_path(path) + '.tmp', _meta_path(path))
+
+    @classmethod
+    def load(cls, path: str) -> 'DemandTable':
+        """Memory-map a saved table"""
+        with open(_meta_path(path), 'r') as f:
+            meta = json.load(f)
+        return cls(np.load(path, mmap_mode='r'), meta)
+
+
+def _meta_path(path: str) -> str:
+    return os.path.splitext(path)[0] + '.json'
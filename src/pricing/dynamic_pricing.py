@@ -4,7 +4,6 @@ Dynamic Pricing Module
 Calculates surge multipliers based on demand-supply ratio with fallback logic.
 """
 
-import pickle
 import numpy as np
 from typing import Dict, Optional, Tuple
 import os
@@ -14,6 +13,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import (
+    VEHICLE_TYPE_CODES,
     VEHICLE_BASE_FARES,
     PRICE_PER_KM,
     PRICE_PER_MIN,
@@ -22,71 +22,149 @@ from config import (
     SURGE_THRESHOLDS,
     SURGE_MULTIPLIERS,
     DEMAND_MODEL_PATH,
+    DEMAND_MIN_COVERAGE,
     CITY_MIN_LAT,
     CITY_MAX_LAT,
     CITY_MIN_LON,
-    CITY_MAX_LON,
-    GRID_SIZE
+    CITY_MAX_LON
 )
+from .demand_table import DemandTable
+from .city_grid import city_grid, uniform_cell_ids
 
+# Rides/hour corresponding to a demand score of 1.0 (peak region)
+PEAK_DEMAND_RIDES = 50
 
-def load_demand_model():
-    """Load the demand estimation model"""
+# Fare components returned by calculate_fare / calculate_fares
+FARE_COMPONENTS = ('base_fare', 'distance_cost', 'time_cost', 'subtotal', 'surge_multiplier', 'final_fare')
+
+# Per-type rates indexed by vehicle type code (VEHICLE_TYPE_CODES)
+_TYPES_BY_CODE = sorted(VEHICLE_TYPE_CODES, key=VEHICLE_TYPE_CODES.get)
+BASE_FARE_RATES = np.array([VEHICLE_BASE_FARES[t] for t in _TYPES_BY_CODE])
+PER_KM_RATES = np.array([PRICE_PER_KM[t] for t in _TYPES_BY_CODE])
+PER_MIN_RATES = np.array([PRICE_PER_MIN[t] for t in _TYPES_BY_CODE])
+
+
+def load_demand_model(path: str = DEMAND_MODEL_PATH) -> Optional[DemandTable]:
+    """
+    Memory-map the demand table and validate it against the serving grid
+    
+    Args:
+        path: Demand table (.npy written by scripts/estimate_demand.py)
+    
+    Returns:
+        DemandTable: Demand per (region, hour, day), or None if missing or invalid
+    """
     try:
-        with open(DEMAND_MODEL_PATH, 'rb') as f:
-            data = pickle.load(f)
-            
-        # Handle nested list structure (new format)
-        if isinstance(data, dict) and 'demand_data' in data:
-            raw_list = data['demand_data']
-            # Convert list to dict keyed by region_id (model appears to be time-agnostic)
-            return {item['region_id']: item for item in raw_list}
-            
-        return data
+        table = DemandTable.load(path)
+        grid = table.meta.get('grid')
+        if grid is not None and grid != city_grid.fingerprint:
+            raise ValueError(f"built on city grid {grid}, serving grid is {city_grid.fingerprint}")
+        coverage = table.validate(n_regions=city_grid.n_regions)
     except FileNotFoundError:
-        print(f"Warning: Demand model not found at {DEMAND_MODEL_PATH}")
+        print(f"Warning: Demand model not found at {path}")
+        return None
+    except (ValueError, KeyError) as e:
+        print(f"⚠ Demand table rejected: {e}")
         return None
+    
+    if coverage['slot_coverage'] < DEMAND_MIN_COVERAGE:
+        print(f"⚠ Demand table covers only {coverage['slot_coverage']:.0%} of region-hour-day slots")
+    if coverage['regions_without_data']:
+        regions = ', '.join(format_region_id(r) for r in coverage['regions_without_data'])
+        print(f"⚠ No rides observed in regions {regions} (scored as lowest demand)")
+    table.meta['coverage'] = coverage
+    return table
 
 
-def get_region_id(lat: float, lon: float, grid_size: int = GRID_SIZE) -> str:
+def get_region_index(lat: float, lon: float, grid_size: Optional[int] = None) -> int:
     """
-    Convert lat/lon to region ID
+    Convert lat/lon to an integer region index
     
     Args:
         lat: Latitude
         lon: Longitude
-        grid_size: Grid size (default from config)
+        grid_size: Size of a uniform grid to use instead of the city grid
     
     Returns:
-        str: Region ID (e.g., "2_3")
+        int: Region index (lat_idx * grid_size + lon_idx on a uniform grid)
     """
-    # City bounds from config
-    min_lat, max_lat = CITY_MIN_LAT, CITY_MAX_LAT
-    min_lon, max_lon = CITY_MIN_LON, CITY_MAX_LON
+    if grid_size is None:
+        return city_grid.region_index(lat, lon)
     
     # Calculate grid indices
-    lat_idx = int((lat - min_lat) / (max_lat - min_lat) * grid_size)
-    lon_idx = int((lon - min_lon) / (max_lon - min_lon) * grid_size)
+    lat_idx = int((lat - CITY_MIN_LAT) / (CITY_MAX_LAT - CITY_MIN_LAT) * grid_size)
+    lon_idx = int((lon - CITY_MIN_LON) / (CITY_MAX_LON - CITY_MIN_LON) * grid_size)
     
     # Clamp to valid range
     lat_idx = max(0, min(grid_size - 1, lat_idx))
     lon_idx = max(0, min(grid_size - 1, lon_idx))
     
+    return lat_idx * grid_size + lon_idx
+
+
+def format_region_id(region: int, grid_size: Optional[int] = None) -> str:
+    """
+    String form of a region index (API responses only)
+    
+    Args:
+        region: Integer region index
+        grid_size: Size of a uniform grid to use instead of the city grid
+    
+    Returns:
+        str: Region ID (e.g., "2_3", or "2_3.1" for a split cell)
+    """
+    if grid_size is None:
+        return city_grid.format_region_id(region)
+    lat_idx, lon_idx = divmod(int(region), grid_size)
     return f"{lat_idx}_{lon_idx}"
 
 
+def get_region_id(lat: float, lon: float, grid_size: Optional[int] = None) -> str:
+    """
+    Convert lat/lon to region ID
+    
+    Args:
+        lat: Latitude
+        lon: Longitude
+        grid_size: Size of a uniform grid to use instead of the city grid
+    
+    Returns:
+        str: Region ID (e.g., "2_3")
+    """
+    return format_region_id(get_region_index(lat, lon, grid_size), grid_size)
+
+
+def get_region_ids(lats, lons, grid_size: Optional[int] = None) -> np.ndarray:
+    """
+    Vectorized region lookup returning integer region indices
+
+    Args:
+        lats: Latitudes (array-like)
+        lons: Longitudes (array-like)
+        grid_size: Size of a uniform grid to use instead of the city grid
+
+    Returns:
+        np.ndarray: Region index per point (see get_region_index)
+    """
+    if grid_size is None:
+        return city_grid.region_ids(lats, lons)
+    return uniform_cell_ids(lats, lons, grid_size)
+
+
 def get_demand_score(
-    region_id: str,
+    region: int,
     hour: int,
-    demand_data: Optional[Dict] = None
+    demand_data: Optional[DemandTable] = None,
+    day_of_week: int = 0
 ) -> float:
     """
     Get demand score for a region and hour
     
     Args:
-        region_id: Region identifier (e.g., "2_3")
+        region: Integer region index (see get_region_index)
         hour: Hour of day (0-23)
-        demand_data: Loaded demand model data
+        demand_data: Loaded demand table
+        day_of_week: Day of week (0=Monday)
     
     Returns:
         float: Demand score (0-1), or 0.5 if no data
@@ -94,42 +172,35 @@ def get_demand_score(
     if demand_data is None:
         return 0.5  # Default to medium demand
     
-    # Strategy 1: Look up by (region_id, hour) - Legacy format
-    if (region_id, hour) in demand_data:
-        return demand_data[(region_id, hour)].get('demand_score', 0.5)
-        
-    # Strategy 2: Look up by region_id only - New static format
-    if region_id in demand_data:
-        return demand_data[region_id].get('demand_score', 0.5)
-    
-    # Fallback: Return default
-    return 0.5
+    return float(demand_data.scores[region, hour, day_of_week])
 
 
 def calculate_demand_supply_ratio(
-    region_id: str,
+    region: int,
     hour: int,
-    available_vehicles: int,
-    demand_data: Optional[Dict] = None
+    available_vehicles: float,
+    demand_data: Optional[DemandTable] = None,
+    day_of_week: int = 0
 ) -> float:
     """
     Calculate demand-to-supply ratio
     
     Args:
-        region_id: Region identifier
+        region: Integer region index
         hour: Hour of day (0-23)
-        available_vehicles: Number of available vehicles in region
-        demand_data: Loaded demand model data
+        available_vehicles: Available vehicles in or around the region (may be distance-weighted)
+        demand_data: Loaded demand table
+        day_of_week: Day of week (0=Monday)
     
     Returns:
         float: Demand-supply ratio (0-inf)
     """
     # Get demand score (0-1)
-    demand_score = get_demand_score(region_id, hour, demand_data)
+    demand_score = get_demand_score(region, hour, demand_data, day_of_week)
     
     # Convert demand score to estimated ride count
     # Assume max demand is ~50 rides/hour in peak region
-    estimated_demand = demand_score * 50
+    estimated_demand = demand_score * PEAK_DEMAND_RIDES
     
     # Calculate ratio (avoid division by zero)
     supply = max(available_vehicles, 1)
@@ -171,22 +242,44 @@ def get_surge_multiplier(
     return min(multiplier, surge_cap)
 
 
+def get_surge_multipliers(
+    demand_supply_ratios: np.ndarray,
+    surge_cap: float = SURGE_CAP
+) -> np.ndarray:
+    """
+    Vectorized get_surge_multiplier (same tiers, one call for all regions)
+    
+    Args:
+        demand_supply_ratios: Demand-supply ratio per region
+        surge_cap: Maximum surge multiplier (default from config)
+    
+    Returns:
+        np.ndarray: Surge multiplier per region
+    """
+    bounds = [SURGE_THRESHOLDS['discount'], SURGE_THRESHOLDS['normal'], SURGE_THRESHOLDS['moderate']]
+    tiers = np.searchsorted(bounds, demand_supply_ratios, side='right')
+    multipliers = np.array([SURGE_MULTIPLIERS[t] for t in ('discount', 'normal', 'moderate', 'high')])
+    return np.minimum(multipliers[tiers], surge_cap)
+
+
 def get_surge_with_fallback(
-    region_id: str,
+    region: int,
     hour: int,
-    available_vehicles: int,
-    demand_data: Optional[Dict] = None,
-    default_surge: float = DEFAULT_SURGE
+    available_vehicles: float,
+    demand_data: Optional[DemandTable] = None,
+    default_surge: float = DEFAULT_SURGE,
+    day_of_week: int = 0
 ) -> Tuple[float, str]:
     """
     Get surge multiplier with comprehensive fallback logic
     
     Args:
-        region_id: Region identifier
+        region: Integer region index
         hour: Hour of day (0-23)
-        available_vehicles: Number of available vehicles
-        demand_data: Loaded demand model data
+        available_vehicles: Available vehicles in or around the region (may be distance-weighted)
+        demand_data: Loaded demand table
         default_surge: Default surge if all else fails
+        day_of_week: Day of week (0=Monday)
     
     Returns:
         tuple: (surge_multiplier, reason)
@@ -196,7 +289,7 @@ def get_surge_with_fallback(
     try:
         # Calculate demand-supply ratio
         ratio = calculate_demand_supply_ratio(
-            region_id, hour, available_vehicles, demand_data
+            region, hour, available_vehicles, demand_data, day_of_week
         )
         
         # Get surge multiplier
@@ -257,6 +350,56 @@ def calculate_fare(
     }
 
 
+def calculate_fares(
+    distance,
+    durations,
+    type_codes,
+    surge_multiplier: float
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculate_fare for a batch of candidates
+    
+    Same formula with per-type rate vectors indexed by type code; every
+    component is rounded to cents as in calculate_fare.
+    
+    Args:
+        distance: Trip distance(s) in kilometers (scalar or array)
+        durations: Trip duration per candidate in minutes
+        type_codes: Vehicle type code per candidate (VEHICLE_TYPE_CODES)
+        surge_multiplier: Surge multiplier (scalar or array)
+    
+    Returns:
+        dict: Column per fare component (see FARE_COMPONENTS), one row per candidate
+    """
+    type_codes = np.asarray(type_codes, dtype=np.intp)
+    if type_codes.size and (type_codes.min() < 0 or type_codes.max() >= len(_TYPES_BY_CODE)):
+        raise ValueError(f"Invalid vehicle type code in {np.unique(type_codes).tolist()}")
+    
+    base_fare = BASE_FARE_RATES[type_codes]
+    distance_cost = np.asarray(distance, dtype=np.float64) * PER_KM_RATES[type_codes]
+    time_cost = np.asarray(durations, dtype=np.float64) * PER_MIN_RATES[type_codes]
+    subtotal = base_fare + distance_cost + time_cost
+    final_fare = subtotal * surge_multiplier
+    
+    columns = (base_fare, distance_cost, time_cost, subtotal,
+               np.broadcast_to(surge_multiplier, type_codes.shape), final_fare)
+    return {name: np.round(column, 2) for name, column in zip(FARE_COMPONENTS, columns)}
+
+
+def fare_breakdown(fares: Dict[str, np.ndarray], index: int) -> Dict[str, float]:
+    """
+    Fare breakdown dict (as returned by calculate_fare) for one row of calculate_fares
+    
+    Args:
+        fares: Columnar fares from calculate_fares
+        index: Candidate row
+    
+    Returns:
+        dict: Fare breakdown with all components
+    """
+    return {name: float(fares[name][index]) for name in FARE_COMPONENTS}
+
+
 # Example usage
 if __name__ == "__main__":
     # Load demand model
@@ -264,14 +407,14 @@ if __name__ == "__main__":
     
     # Example 1: High demand scenario
     print("Example 1: High demand (rush hour, city center)")
-    region = "2_3"  # City center
+    region = get_region_index(13.34, 74.76)  # City center
     hour = 8  # Morning rush
     vehicles = 5
     
     ratio = calculate_demand_supply_ratio(region, hour, vehicles, demand_data)
     surge, reason = get_surge_with_fallback(region, hour, vehicles, demand_data)
     
-    print(f"  Region: {region}, Hour: {hour}, Vehicles: {vehicles}")
+    print(f"  Region: {format_region_id(region)}, Hour: {hour}, Vehicles: {vehicles}")
     print(f"  Demand-supply ratio: {ratio:.2f}")
     print(f"  Surge multiplier: {surge}× ({reason})")
     
@@ -281,14 +424,14 @@ if __name__ == "__main__":
     
     # Example 2: Low demand scenario
     print("Example 2: Low demand (late night, suburbs)")
-    region = "0_0"  # Suburbs
+    region = 0  # Suburbs ("0_0")
     hour = 2  # Late night
     vehicles = 10
     
     ratio = calculate_demand_supply_ratio(region, hour, vehicles, demand_data)
     surge, reason = get_surge_with_fallback(region, hour, vehicles, demand_data)
     
-    print(f"  Region: {region}, Hour: {hour}, Vehicles: {vehicles}")
+    print(f"  Region: {format_region_id(region)}, Hour: {hour}, Vehicles: {vehicles}")
     print(f"  Demand-supply ratio: {ratio:.2f}")
     print(f"  Surge multiplier: {surge}× ({reason})")
     
@@ -0,0 +1,136 @@
+"""
+Neighbor-Aware Supply
+
+Estimates available supply around a pickup from vehicles in the surrounding
+cells rather than only those in the pickup's own region, so a pickup near a
+region edge also sees the cars just across it.
+
+Vehicles are counted on a fine uniform grid (each base grid cell split
+into subdivisions x subdivisions cells). A summed-area table (2-D prefix sums)
+over those counts gives the number of vehicles in any square window of
+cells with four lookups, so a distance-weighted neighborhood is O(rings)
+per pickup regardless of fleet size.
+"""
+
+from typing import Optional, Sequence
+
+import numpy as np
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import SUPPLY_SUBDIVISIONS, SUPPLY_RING_WEIGHTS
+from .city_grid import CityGrid, city_grid, uniform_cell_ids
+
+
+class SupplyGrid:
+    """
+    Fine supply grid geometry with precomputed neighbor windows.
+
+    Design Decisions:
+    1. Rings: Window r is the (2r+1) x (2r+1) square of cells centered on the
+       pickup cell; ring r (window r minus window r-1) is weighted
+       ring_weights[r], so nearer cars count more.
+    2. Neighbor tables: The clipped bounds of every window of every cell are
+       precomputed, as is each cell's total in-city weight.
+    3. Region scale: The weighted count is divided by the total weight and
+       multiplied by the cells per region, i.e. the local vehicle density
+       expressed as vehicles per region (scaled by area for split regions of
+       the city grid). It equals the region count when vehicles are spread
+       evenly, and stays comparable with per-region demand.
+    4. Alignment: subdivisions is rounded up to a multiple of 2**max_depth of
+       the city grid, so every fine cell lies inside exactly one region
+       (cell_regions) and per-cell surge never mixes two regions' demand.
+    """
+
+    def __init__(
+        self,
+        grid: Optional[CityGrid] = None,
+        subdivisions: int = SUPPLY_SUBDIVISIONS,
+        ring_weights: Sequence[float] = SUPPLY_RING_WEIGHTS
+    ):
+        self.grid = grid or city_grid
+        grid = self.grid
+        self.bounds = grid.bounds
+        self.subdivisions = -(-subdivisions // 2 ** grid.max_depth) * 2 ** grid.max_depth
+        self.size = grid.base_size * self.subdivisions
+        self.n_cells = self.size * self.size
+        self.ring_weights = np.asarray(ring_weights, dtype=np.float64)
+
+        # Weighted sum over rings == sum over windows with these coefficients
+        self._coefficients = self.ring_weights - np.append(self.ring_weights[1:], 0.0)
+
+        # Neighbor tables: clipped window bounds [cell, ring] in summed-area table coordinates
+        rows, cols = np.divmod(np.arange(self.n_cells), self.size)
+        radius = np.arange(len(self.ring_weights))
+        self._r0 = np.clip(rows[:, None] - radius, 0, self.size)
+        self._r1 = np.clip(rows[:, None] + radius + 1, 0, self.size)
+        self._c0 = np.clip(cols[:, None] - radius, 0, self.size)
+        self._c1 = np.clip(cols[:, None] + radius + 1, 0, self.size)
+
+        # Total weight of each cell's neighborhood inside the city (smaller at edges)
+        self._weight_totals = self._window_sums(self.summed_area_from_counts(np.ones(self.n_cells)),
+                                                np.arange(self.n_cells))
+
+        # Fine cell at the center of each region (region-level supply) and region area vs. a base cell
+        self.region_centers = self.cell_ids(grid.center_lats, grid.center_lons)
+        self.region_scale = grid.area_fractions
+
+        # Region containing each fine cell
+        min_lat, max_lat, min_lon, max_lon = self.bounds
+        centers = (np.arange(self.size) + 0.5) / self.size
+        self.cell_regions = grid.region_ids(
+            np.repeat(min_lat + centers * (max_lat - min_lat), self.size),
+            np.tile(min_lon + centers * (max_lon - min_lon), self.size)
+        )
+
+    def cell_ids(self, lats, lons) -> np.ndarray:
+        """Fine cell index per point"""
+        return uniform_cell_ids(lats, lons, self.size, self.bounds)
+
+    def summed_area_from_counts(self, counts: np.ndarray) -> np.ndarray:
+        """Summed-area table (size + 1, size + 1) of per-cell counts"""
+        table = np.zeros((self.size + 1, self.size + 1), dtype=np.float64)
+        table[1:, 1:] = np.asarray(counts, dtype=np.float64).reshape(self.size, self.size).cumsum(0).cumsum(1)
+        return table
+
+    def summed_area(self, lats, lons) -> np.ndarray:
+        """
+        Summed-area table of vehicle counts per fine cell
+
+        Args:
+            lats: Latitudes of available vehicles
+            lons: Longitudes of available vehicles
+
+        Returns:
+            np.ndarray: Summed-area table (size + 1, size + 1)
+        """
+        counts = np.zeros(self.n_cells)
+        if len(lats):
+            counts = np.bincount(self.cell_ids(lats, lons), minlength=self.n_cells)
+        return self.summed_area_from_counts(counts)
+
+    def _window_sums(self, table: np.ndarray, cells) -> np.ndarray:
+        r0, r1, c0, c1 = self._r0[cells], self._r1[cells], self._c0[cells], self._c1[cells]
+        windows = table[r1, c1] - table[r0, c1] - table[r1, c0] + table[r0, c0]
+        return windows @ self._coefficients
+
+    def supply_at(self, table: np.ndarray, cells, regions=None) -> np.ndarray:
+        """
+        Distance-weighted supply around fine cells, in vehicles per region
+
+        Args:
+            table: Summed-area table from summed_area()
+            cells: Fine cell index (scalar or array)
+            regions: City grid region of each cell (default: per base cell area)
+
+        Returns:
+            float or np.ndarray: Supply estimate per cell
+        """
+        cells = np.asarray(cells)
+        supply = self._window_sums(table, cells) / self._weight_totals[cells] * self.subdivisions ** 2
+        if regions is not None:
+            supply = supply * self.region_scale[regions]
+        return supply
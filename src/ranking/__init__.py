@@ -6,6 +6,12 @@ from .vehicle_ranker import (
     normalize_scores,
     calculate_vehicle_score,
     rank_vehicles,
+    rank_candidates,
+    rank_candidates_by_mode,
+    mode_weights,
+    mode_weight_matrix,
+    normalize_features,
+    top_k_indices,
     format_vehicle_for_response
 )
 
@@ -13,5 +19,11 @@ __all__ = [
     'normalize_scores',
     'calculate_vehicle_score',
     'rank_vehicles',
+    'rank_candidates',
+    'rank_candidates_by_mode',
+    'mode_weights',
+    'mode_weight_matrix',
+    'normalize_features',
+    'top_k_indices',
     'format_vehicle_for_response'
 ]
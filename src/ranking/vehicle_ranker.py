@@ -5,7 +5,7 @@ Ranks vehicles based on user preferences (fastest/cheapest/balanced) using weigh
 """
 
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Sequence, Tuple
 import os
 import sys
 
@@ -13,6 +13,7 @@ import sys
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config import (
+    VEHICLE_TYPE_CODES,
     COMFORT_SCORES,
     USER_MODE_WEIGHTS,
     TOP_K_VEHICLES
@@ -96,6 +97,170 @@ def calculate_vehicle_score(
     return score
 
 
+# Ranking features, in the column order of the feature matrix and weight vectors
+RANKING_FEATURES = ('eta', 'cost', 'comfort')
+_HIGHER_IS_BETTER = np.array([False, False, True])
+
+# Comfort score per vehicle type code
+COMFORT_BY_CODE = np.array([
+    COMFORT_SCORES[t] for t in sorted(VEHICLE_TYPE_CODES, key=VEHICLE_TYPE_CODES.get)
+], dtype=np.float64)
+
+
+def mode_weights(user_mode: str = 'balanced') -> np.ndarray:
+    """
+    USER_MODE_WEIGHTS of a mode as a vector in RANKING_FEATURES order
+
+    Args:
+        user_mode: 'fastest' | 'cheapest' | 'balanced' (anything else is balanced)
+
+    Returns:
+        np.ndarray: (3,) weights
+    """
+    weights = USER_MODE_WEIGHTS.get(user_mode, USER_MODE_WEIGHTS['balanced'])
+    return np.array([weights[feature] for feature in RANKING_FEATURES], dtype=np.float64)
+
+
+def mode_weight_matrix(user_modes: Sequence[str] = tuple(USER_MODE_WEIGHTS)) -> np.ndarray:
+    """
+    Stacked mode_weights, one row per mode
+
+    Args:
+        user_modes: Modes to stack (default: every mode in USER_MODE_WEIGHTS)
+
+    Returns:
+        np.ndarray: (len(user_modes), 3) weights
+    """
+    return np.stack([mode_weights(mode) for mode in user_modes])
+
+
+def normalize_features(features: np.ndarray) -> np.ndarray:
+    """
+    Min-max normalize every feature column at once (same rules as normalize_scores)
+
+    Args:
+        features: (n, 3) eta, cost and comfort per candidate
+
+    Returns:
+        np.ndarray: (n, 3) scores in 0-1, higher is better; constant columns are 1.0
+    """
+    low = features.min(axis=0)
+    high = features.max(axis=0)
+    span = high - low
+    flat = span == 0
+    distance = np.where(_HIGHER_IS_BETTER, features - low, high - features)
+    normalized = distance / np.where(flat, 1.0, span)
+    normalized[:, flat] = 1.0
+    return normalized
+
+
+def top_k_indices(scores: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    Indices of the top_k scores, best first
+
+    Selects with argpartition and only sorts the selection. Ties are broken by
+    index, so the order is the same as a stable descending sort.
+
+    Args:
+        scores: (n,) scores
+        top_k: Number of indices to return
+
+    Returns:
+        np.ndarray: Up to top_k indices
+    """
+    n = len(scores)
+    if top_k <= 0 or n == 0:
+        return np.empty(0, dtype=np.intp)
+    if top_k < n:
+        kth_score = scores[np.argpartition(-scores, top_k - 1)[top_k - 1]]
+        above = np.flatnonzero(scores > kth_score)
+        tied = np.flatnonzero(scores == kth_score)[:top_k - len(above)]
+        selected = np.concatenate([above, tied])
+    else:
+        selected = np.arange(n)
+    return selected[np.lexsort((selected, -scores[selected]))]
+
+
+def _score_features(features: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Normalized features and weighted score per candidate (and per mode for a weight matrix)"""
+    normalized = normalize_features(features)
+    # Row-wise dot product with the mode weights, summed in eta, cost, comfort order
+    # like calculate_vehicle_score (a BLAS matmul can round differently and reorder exact ties)
+    if weights.ndim == 2:
+        return normalized, (normalized[:, None, :] * weights).sum(axis=2)
+    return normalized, (normalized * weights).sum(axis=1)
+
+
+def rank_candidates_by_mode(
+    eta_pickup,
+    trip_cost,
+    type_codes,
+    user_modes: Sequence[str] = tuple(USER_MODE_WEIGHTS),
+    top_k: int = TOP_K_VEHICLES
+) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Rank a columnar batch of candidates for several user modes at once
+
+    The features are normalized once and scored for every mode in one
+    product with the stacked mode weights (mode_weight_matrix). Nothing is
+    written to the inputs.
+
+    Args:
+        eta_pickup: (n,) minutes to pickup
+        trip_cost: (n,) total trip cost
+        type_codes: (n,) vehicle type codes (VEHICLE_TYPE_CODES)
+        user_modes: Modes to rank for (default: all of USER_MODE_WEIGHTS)
+        top_k: Number of top candidates to return per mode
+
+    Returns:
+        dict: mode -> (indices, scores) of its top-k candidates, sorted by score (descending)
+    """
+    type_codes = np.asarray(type_codes, dtype=np.intp)
+    if len(type_codes) == 0:
+        return {mode: (np.empty(0, dtype=np.intp), np.empty(0)) for mode in user_modes}
+    if type_codes.min() < 0 or type_codes.max() >= len(COMFORT_BY_CODE):
+        raise ValueError(f"Unknown vehicle type code in {np.unique(type_codes).tolist()}")
+    
+    features = np.column_stack([
+        np.asarray(eta_pickup, dtype=np.float64),
+        np.asarray(trip_cost, dtype=np.float64),
+        COMFORT_BY_CODE[type_codes]
+    ])
+    _, scores = _score_features(features, mode_weight_matrix(user_modes))
+    
+    rankings = {}
+    for m, mode in enumerate(user_modes):
+        indices = top_k_indices(scores[:, m], top_k)
+        rankings[mode] = (indices, scores[indices, m])
+    return rankings
+
+
+def rank_candidates(
+    eta_pickup,
+    trip_cost,
+    type_codes,
+    user_mode: str = 'balanced',
+    top_k: int = TOP_K_VEHICLES
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Rank a columnar batch of candidates and return the top-k
+
+    Nothing is written to the inputs; callers look up their own candidate
+    data with the returned indices.
+
+    Args:
+        eta_pickup: (n,) minutes to pickup
+        trip_cost: (n,) total trip cost
+        type_codes: (n,) vehicle type codes (VEHICLE_TYPE_CODES)
+        user_mode: 'fastest' | 'cheapest' | 'balanced'
+        top_k: Number of top candidates to return
+
+    Returns:
+        tuple: (indices, scores) of the top-k candidates, sorted by score (descending)
+    """
+    return rank_candidates_by_mode(eta_pickup, trip_cost, type_codes, (user_mode,), top_k)[user_mode]
+
+
 def rank_vehicles(
     available_vehicles: List[Dict],
     user_mode: str = 'balanced',
@@ -104,6 +269,9 @@ def rank_vehicles(
     """
     Rank vehicles and return top-k
     
+    The input dicts are not modified; the returned vehicles are copies with
+    the scores added.
+    
     Args:
         available_vehicles: List of vehicle dicts with:
             - 'id': str
@@ -120,42 +288,28 @@ def rank_vehicles(
     if not available_vehicles:
         return []
     
-    # Add comfort scores if not present
-    for vehicle in available_vehicles:
-        if 'comfort_score' not in vehicle:
-            vehicle['comfort_score'] = COMFORT_SCORES.get(
-                vehicle['vehicle_type'], 1
-            )
-    
-    # Extract values for normalization
-    eta_values = [v['eta_pickup'] for v in available_vehicles]
-    cost_values = [v['trip_cost'] for v in available_vehicles]
-    comfort_values = [v['comfort_score'] for v in available_vehicles]
-    
-    # Normalize scores
-    eta_scores = normalize_scores(eta_values, lower_is_better=True)
-    cost_scores = normalize_scores(cost_values, lower_is_better=True)
-    comfort_scores = normalize_scores(comfort_values, lower_is_better=False)
-    
-    # Add normalized scores to vehicles
-    for i, vehicle in enumerate(available_vehicles):
-        vehicle['eta_score_normalized'] = eta_scores[i]
-        vehicle['cost_score_normalized'] = cost_scores[i]
-        vehicle['comfort_score_normalized'] = comfort_scores[i]
-    
-    # Calculate weighted scores
-    for vehicle in available_vehicles:
-        vehicle['final_score'] = calculate_vehicle_score(vehicle, user_mode)
-    
-    # Sort by score (descending)
-    ranked_vehicles = sorted(
-        available_vehicles,
-        key=lambda v: v['final_score'],
-        reverse=True
-    )
+    # One row per vehicle: eta, cost, comfort
+    comfort = [
+        v.get('comfort_score', COMFORT_SCORES.get(v['vehicle_type'], 1))
+        for v in available_vehicles
+    ]
+    features = np.array([
+        (v['eta_pickup'], v['trip_cost'], c)
+        for v, c in zip(available_vehicles, comfort)
+    ], dtype=np.float64)
+    normalized, scores = _score_features(features, mode_weights(user_mode))
     
-    # Return top-k
-    return ranked_vehicles[:top_k]
+    return [
+        {
+            **available_vehicles[i],
+            'comfort_score': comfort[i],
+            'eta_score_normalized': float(normalized[i, 0]),
+            'cost_score_normalized': float(normalized[i, 1]),
+            'comfort_score_normalized': float(normalized[i, 2]),
+            'final_score': float(scores[i])
+        }
+        for i in top_k_indices(scores, top_k).tolist()
+    ]
 
 
 def format_vehicle_for_response(vehicle: Dict) -> Dict:
@@ -0,0 +1,173 @@
+"""
+Live Demand Estimator
+
+Counts distinct /ride/quote trip intents per region over a sliding window
+using a ring buffer of time buckets, and blends the observed rate with the
+historical prior from the demand table.
+"""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional, Set
+
+import numpy as np
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import LIVE_DEMAND_WINDOW_S, LIVE_DEMAND_BUCKET_S, LIVE_DEMAND_PRIOR_QUOTES
+from src.pricing.city_grid import city_grid
+
+
+class LiveDemandEstimator:
+    """
+    Sliding-window quote counts per region.
+
+    Design Decisions:
+    1. Ring buffer: counts[region, slot] with one slot per `bucket_s`; a slot is
+       cleared when the ring wraps around to it, so recording is O(1)
+       (amortized O(regions) once per bucket).
+    2. Running totals: Window totals per region are kept up to date as slots
+       are cleared, so reading all rates is one vector operation.
+    3. Prior blending: Each region's observed rate is pulled towards the demand
+       table's rate with `prior_quotes` pseudo-quotes, so a quiet or just-started
+       window falls back to history instead of reading as zero demand. Until the
+       window has filled, the live weight is further scaled by the fraction of
+       it observed, so a few quotes right after a restart cannot spike surge.
+    4. Intent dedup: Refreshes and mode toggles re-quote the same trip, so a
+       quote carrying an intent key already counted in the window is ignored.
+       Each count is then one prospective ride, the same unit as the
+       demand table's rides/hour prior.
+    """
+
+    def __init__(
+        self,
+        n_regions: int = city_grid.n_regions,
+        window_s: float = LIVE_DEMAND_WINDOW_S,
+        bucket_s: float = LIVE_DEMAND_BUCKET_S,
+        prior_quotes: float = LIVE_DEMAND_PRIOR_QUOTES
+    ):
+        self.n_regions = n_regions
+        self.bucket_s = bucket_s
+        self.n_buckets = max(1, int(round(window_s / bucket_s)))
+        self.window_s = self.n_buckets * bucket_s
+        self.prior_quotes = prior_quotes
+
+        self._counts = np.zeros((n_regions, self.n_buckets), dtype=np.int64)
+        self._totals = np.zeros(n_regions, dtype=np.int64)
+        self._epoch: Optional[int] = None  # Bucket number of the newest slot
+        self._started_at: Optional[float] = None
+        self._seen: Set[Hashable] = set()  # Intent keys counted in the window
+        self._slot_intents = [set() for _ in range(self.n_buckets)]
+        self.recorded = 0
+        self.duplicates = 0
+        self._lock = threading.Lock()
+
+    def _advance(self, now: float) -> None:
+        """Clear slots that fell out of the window up to the bucket containing `now`"""
+        epoch = int(now // self.bucket_s)
+        if self._epoch is None:
+            self._epoch = epoch
+            self._started_at = now
+            return
+        if epoch <= self._epoch:
+            return
+        # Every slot between the last seen bucket and now is stale (at most n_buckets)
+        for stale in range(self._epoch + 1, min(epoch, self._epoch + self.n_buckets) + 1):
+            slot = stale % self.n_buckets
+            self._totals -= self._counts[:, slot]
+            self._counts[:, slot] = 0
+            self._seen -= self._slot_intents[slot]
+            self._slot_intents[slot].clear()
+        self._epoch = epoch
+
+    def record(self, region: int, intent: Optional[Hashable] = None, now: Optional[float] = None) -> bool:
+        """
+        Count one quote request
+
+        Args:
+            region: Pickup region index
+            intent: Key of the rider's trip (e.g. snapped pickup/drop cells);
+                    a key already counted in the window is not counted again
+            now: Monotonic time in seconds (default: time.monotonic())
+
+        Returns:
+            bool: True if the quote was counted, False if it repeated a counted intent
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._advance(now)
+            slot = self._epoch % self.n_buckets
+            if intent is not None:
+                if intent in self._seen:
+                    self.duplicates += 1
+                    return False
+                self._seen.add(intent)
+                self._slot_intents[slot].add(intent)
+            self._counts[region, slot] += 1
+            self._totals[region] += 1
+            self.recorded += 1
+            return True
+
+    def window_counts(self, now: Optional[float] = None) -> np.ndarray:
+        """Counted quotes per region in the current window"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._advance(now)
+            return self._totals.copy()
+
+    def _observed_s(self, now: float) -> float:
+        # Window length actually observed (shorter right after startup)
+        if self._started_at is None:
+            return 0.0
+        return min(self.window_s, max(now - self._started_at, self.bucket_s))
+
+    def rates(self, now: Optional[float] = None) -> np.ndarray:
+        """Observed quotes per hour per region"""
+        now = time.monotonic() if now is None else now
+        counts = self.window_counts(now)
+        observed_s = self._observed_s(now)
+        if observed_s == 0:
+            return np.zeros(self.n_regions)
+        return counts * 3600.0 / observed_s
+
+    def blend(self, prior_rates: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """
+        Demand per region blending live quotes with the historical prior
+
+        Args:
+            prior_rates: Historical rides/hour per region (from the demand table)
+            now: Monotonic time in seconds (default: time.monotonic())
+
+        Returns:
+            np.ndarray: Blended demand (per hour) per region
+        """
+        now = time.monotonic() if now is None else now
+        counts = self.window_counts(now)
+        observed_s = self._observed_s(now)
+        if observed_s == 0:
+            return np.asarray(prior_rates, dtype=np.float64)
+        live_rates = counts * 3600.0 / observed_s
+        weight = np.divide(
+            counts, counts + self.prior_quotes, out=np.zeros(self.n_regions), where=counts > 0
+        ) * (observed_s / self.window_s)
+        return weight * live_rates + (1 - weight) * prior_rates
+
+    def stats(self) -> Dict:
+        """Window configuration and current counts"""
+        counts = self.window_counts()
+        return {
+            'window_s': self.window_s,
+            'bucket_s': self.bucket_s,
+            'prior_quotes': self.prior_quotes,
+            'recorded': self.recorded,
+            'duplicates': self.duplicates,
+            'quotes_in_window': int(counts.sum()),
+            'counts': counts.tolist()
+        }
+
+
+# Global instance
+live_demand = LiveDemandEstimator()
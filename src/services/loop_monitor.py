@@ -0,0 +1,103 @@
+"""
+Event Loop Block Monitor
+
+Measures how often and for how long the asyncio event loop is blocked by
+synchronous work (e.g. model inference running on the loop thread).
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import LOOP_MONITOR_INTERVAL_MS, LOOP_BLOCK_THRESHOLD_MS
+
+
+class LoopBlockMonitor:
+    """
+    Background task that sleeps for a fixed interval and records how late it wakes up.
+
+    A wake-up later than `threshold_ms` past the interval means something held
+    the loop; the lateness is counted as one blocking event of that duration.
+    """
+
+    def __init__(
+        self,
+        interval_ms: float = LOOP_MONITOR_INTERVAL_MS,
+        threshold_ms: float = LOOP_BLOCK_THRESHOLD_MS,
+        stats_window: int = 1000
+    ):
+        self.interval_ms = interval_ms
+        self.threshold_ms = threshold_ms
+        self._task: Optional[asyncio.Task] = None
+        self._started_at: Optional[float] = None
+        self.samples = 0
+        self.blocked_events = 0
+        self.blocked_ms_total = 0.0
+        self.max_lag_ms = 0.0
+        self._lags_ms = deque(maxlen=stats_window)
+
+    def start(self) -> None:
+        """Start monitoring on the running event loop"""
+        if self._task is None:
+            self._started_at = time.perf_counter()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def reset(self) -> None:
+        """Clear counters (e.g. to compare before/after a config change)"""
+        self._started_at = time.perf_counter() if self._task else None
+        self.samples = 0
+        self.blocked_events = 0
+        self.blocked_ms_total = 0.0
+        self.max_lag_ms = 0.0
+        self._lags_ms.clear()
+
+    async def _run(self) -> None:
+        interval = self.interval_ms / 1000
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lag_ms = (time.perf_counter() - start - interval) * 1000
+
+            self.samples += 1
+            self._lags_ms.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+            if lag_ms > self.threshold_ms:
+                self.blocked_events += 1
+                self.blocked_ms_total += lag_ms
+
+    def stats(self) -> Dict:
+        """Loop blocking frequency and duration"""
+        lags = np.asarray(self._lags_ms, dtype=np.float64)
+        elapsed_s = time.perf_counter() - self._started_at if self._started_at else 0.0
+
+        return {
+            'running': self._task is not None,
+            'interval_ms': self.interval_ms,
+            'threshold_ms': self.threshold_ms,
+            'samples': self.samples,
+            'blocked_events': self.blocked_events,
+            'blocked_ms_total': round(self.blocked_ms_total, 2),
+            'blocked_fraction': round(self.blocked_ms_total / (elapsed_s * 1000), 4) if elapsed_s else 0.0,
+            'lag_ms': {
+                'p50': round(float(np.percentile(lags, 50)), 3) if lags.size else 0.0,
+                'p99': round(float(np.percentile(lags, 99)), 3) if lags.size else 0.0,
+                'max': round(self.max_lag_ms, 3)
+            }
+        }
+
+
+# Global instance
+loop_monitor = LoopBlockMonitor()
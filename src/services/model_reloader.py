@@ -0,0 +1,210 @@
+"""
+Model Hot Reload
+
+Holds the set of loaded models as one immutable snapshot, validates a
+freshly loaded set on a canary batch before it is swapped in, and watches
+the model artifacts on disk so a retrained model is picked up without
+restarting the API (and without losing the in-memory vehicle store).
+"""
+
+import asyncio
+import os
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import MODEL_WATCH_INTERVAL_S, CANARY_MAX_DURATION_MIN
+
+
+class ModelSet:
+    """
+    One consistent snapshot of everything loaded from model artifacts.
+
+    Requests read the current snapshot once and use it throughout, so a
+    reload that swaps in a new snapshot never affects an in-flight quote
+    and no request can observe a half-loaded set.
+    """
+
+    __slots__ = (
+        'demand_model', 'pickup_eta', 'eta_model', 'eta_bundle', 'feature_builder', 'eta_predict',
+        'eta_table', 'eta_batcher', 'eta_executor', 'shadow', 'generation', 'loaded_at'
+    )
+
+    def __init__(
+        self,
+        demand_model=None,
+        pickup_eta=None,
+        eta_model=None,
+        eta_bundle=None,
+        feature_builder=None,
+        eta_predict=None,
+        eta_table=None,
+        eta_batcher=None,
+        eta_executor=None,
+        shadow=None,
+        generation: int = 0
+    ):
+        self.demand_model = demand_model
+        self.pickup_eta = pickup_eta  # PickupEtaModel (pace per region, hour and vehicle type)
+        self.eta_model = eta_model
+        self.eta_bundle = eta_bundle  # Verified EtaBundle (model + feature schema + provenance)
+        self.feature_builder = feature_builder
+        self.eta_predict = eta_predict  # Batch predict function (compiled forest or model.predict)
+        self.eta_table = eta_table  # Optional precomputed EtaLookupTable
+        self.eta_batcher = eta_batcher  # MicroBatcher shared by concurrent quote requests
+        self.eta_executor = eta_executor  # InferenceExecutor running predictions off the event loop
+        self.shadow = shadow  # Optional ShadowEvaluator running a challenger model on sampled quotes
+        self.generation = generation
+        self.loaded_at = datetime.now().isoformat()
+
+    def retire(self) -> None:
+        """
+        Release the worker pool and shadow evaluator of a snapshot that has been swapped out
+
+        Predictions already submitted still complete on this snapshot's model;
+        anything submitted later runs inline.
+        """
+        if self.eta_executor is not None:
+            self.eta_executor.shutdown(cancel_pending=False)
+        if self.shadow is not None:
+            self.shadow.stop()
+
+
+def build_canary_batch(feature_builder, n_vehicle_types: int) -> np.ndarray:
+    """
+    Feature rows spanning short to long trips, every hour, weekday/weekend and every vehicle type
+
+    Args:
+        feature_builder: EtaFeatureBuilder of the candidate model
+        n_vehicle_types: Number of vehicle type codes
+
+    Returns:
+        np.ndarray: Canary feature matrix
+    """
+    distances = np.array([0.5, 2.0, 5.0, 10.0, 25.0])
+    hours = np.arange(24)
+    days = np.array([0, 5])  # Monday, Saturday
+    codes = np.arange(n_vehicle_types)
+
+    dist, hour, day, code = (
+        grid.ravel() for grid in np.meshgrid(distances, hours, days, codes, indexing='ij')
+    )
+    return feature_builder.build_batch(dist, hour, day, code)
+
+
+def check_canary(
+    predictions: np.ndarray,
+    reference: Optional[np.ndarray] = None,
+    max_duration: float = CANARY_MAX_DURATION_MIN
+) -> Dict:
+    """
+    Sanity-check a candidate model's canary predictions
+
+    Args:
+        predictions: Candidate durations (minutes) for the canary batch,
+                     (n,) or (n, outputs) with the point estimate first
+        reference: Current model's durations for the same batch, if any
+        max_duration: Largest plausible trip duration
+
+    Returns:
+        dict: Canary report
+
+    Raises:
+        ValueError: If the predictions are not finite or outside (0, max_duration]
+    """
+    predictions = np.asarray(predictions, dtype=np.float64)
+
+    if not np.all(np.isfinite(predictions)):
+        raise ValueError("Canary predictions contain NaN/inf")
+    if predictions.min() <= 0 or predictions.max() > max_duration:
+        raise ValueError(
+            f"Canary predictions out of range [{predictions.min():.2f}, {predictions.max():.2f}] min"
+        )
+
+    report = {
+        'rows': int(predictions.shape[0]),
+        'min_duration': round(float(predictions.min()), 2),
+        'max_duration': round(float(predictions.max()), 2)
+    }
+    if predictions.ndim == 2 and predictions.shape[1] > 2:
+        # Share of rows where a higher quantile falls below a lower one
+        crossing = np.any(np.diff(predictions[:, 1:], axis=1) < 0, axis=1)
+        report['quantile_crossing_rate'] = round(float(crossing.mean()), 4)
+    if reference is not None:
+        # Point estimates only; the current set may have different outputs
+        point = predictions if predictions.ndim == 1 else predictions[:, 0]
+        reference = np.asarray(reference, dtype=np.float64)
+        reference = reference if reference.ndim == 1 else reference[:, 0]
+        report['mean_abs_change_vs_current'] = round(float(np.mean(np.abs(point - reference))), 3)
+    return report
+
+
+class ModelFileWatcher:
+    """
+    Background task that polls model artifact files and calls `on_change`
+    once a change has settled.
+
+    A change is only acted on when the files' (mtime, size) signature is the
+    same on two consecutive polls, so a model that is still being written is
+    not picked up half-way.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        on_change: Callable[[], Awaitable],
+        interval_s: float = MODEL_WATCH_INTERVAL_S
+    ):
+        self.paths = list(paths)
+        self.on_change = on_change
+        self.interval_s = interval_s
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start watching on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def signature(self) -> Tuple:
+        """(path, mtime, size) of every watched file (walks directories)"""
+        entries = []
+        for path in self.paths:
+            if os.path.isdir(path):
+                files = sorted(os.path.join(path, name) for name in os.listdir(path))
+            else:
+                files = [path]
+            for file_path in files:
+                try:
+                    stat = os.stat(file_path)
+                    entries.append((file_path, stat.st_mtime_ns, stat.st_size))
+                except FileNotFoundError:
+                    entries.append((file_path, None, None))
+        return tuple(entries)
+
+    async def _run(self) -> None:
+        current = self.signature()
+        pending = None
+        while True:
+            await asyncio.sleep(self.interval_s)
+            observed = self.signature()
+
+            if observed == current:
+                pending = None
+            elif observed != pending:
+                pending = observed  # Changed; wait one more poll for writes to settle
+            else:
+                current, pending = observed, None
+                try:
+                    await self.on_change()
+                except Exception as e:
+                    print(f"⚠ Model reload after file change failed: {e}")
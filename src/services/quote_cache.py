@@ -0,0 +1,229 @@
+"""
+Quote Cache
+
+Short-lived LRU cache of full /ride/quote responses, so riders toggling
+user_mode or refreshing get the same quote without recomputation, and
+signed quote tokens that let a later booking redeem the quoted fare.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import (
+    QUOTE_CACHE_MAX_SIZE,
+    QUOTE_CACHE_TTL_SECONDS,
+    QUOTE_TOKEN_TTL_SECONDS,
+    TRIP_CACHE_CELL_DEGREES
+)
+
+
+class QuoteCache:
+    """
+    LRU + TTL cache of quote responses, invalidated by surge changes.
+
+    Design Decisions:
+    1. Key: Snapped pickup/drop cells (as in TripCache), user mode, hour bucket
+       and the surge multiplier quoted, so each mode has its own entry.
+    2. Surge version: Each entry records the surge version of its pickup region;
+       a lookup under a newer version drops the entry (counted as an
+       invalidation) instead of serving a price from stale surge.
+    3. Bounded: OrderedDict with LRU eviction at max_size, like TripCache.
+    """
+
+    def __init__(
+        self,
+        max_size: int = QUOTE_CACHE_MAX_SIZE,
+        ttl_seconds: float = QUOTE_CACHE_TTL_SECONDS,
+        cell_degrees: float = TRIP_CACHE_CELL_DEGREES
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.cell_degrees = cell_degrees
+        self._entries: "OrderedDict[Tuple, Tuple[float, Hashable, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _snap(self, value: float) -> int:
+        return int(round(value / self.cell_degrees))
+
+    def make_key(
+        self,
+        pickup_lat: float,
+        pickup_lon: float,
+        drop_lat: float,
+        drop_lon: float,
+        user_mode: str,
+        hour: int,
+        day_of_week: int,
+        surge_multiplier: float
+    ) -> Tuple:
+        """
+        Build a cache key from snapped coordinates, mode, time bucket and surge
+
+        Returns:
+            tuple: (pickup cell, drop cell, user mode, hour, day of week, surge)
+        """
+        return (
+            self._snap(pickup_lat), self._snap(pickup_lon),
+            self._snap(drop_lat), self._snap(drop_lon),
+            user_mode, hour, day_of_week, round(surge_multiplier, 4)
+        )
+
+    def get(self, key: Tuple, surge_version: Hashable) -> Optional[Any]:
+        """Return the cached quote, or None on miss / expiry / surge version change"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, stored_version, value = entry
+            if stored_version != surge_version:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+            if now - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple, surge_version: Hashable, value: Any) -> None:
+        """Insert or refresh a quote, evicting the least recently used one if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), surge_version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+            self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b'=').decode('ascii')
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+class QuoteSigner:
+    """
+    HMAC-SHA256 signed quote tokens.
+
+    A token is base64url(JSON payload) + '.' + base64url(signature); the
+    payload carries the quoted fares and an expiry, so redeeming one needs
+    no server-side state. The secret comes from the QUOTE_TOKEN_SECRET
+    environment variable; without it a random per-process secret is used
+    (tokens then do not survive a restart or cross replicas).
+    """
+
+    def __init__(self, secret: Optional[bytes] = None, ttl_seconds: float = QUOTE_TOKEN_TTL_SECONDS):
+        if secret is None:
+            env_secret = os.environ.get('QUOTE_TOKEN_SECRET')
+            secret = env_secret.encode() if env_secret else secrets.token_bytes(32)
+        self._secret = secret
+        self.ttl_seconds = ttl_seconds
+
+    def _sign(self, body: str) -> str:
+        return _b64encode(hmac.new(self._secret, body.encode('ascii'), hashlib.sha256).digest())
+
+    def issue(self, payload: Dict[str, Any], now: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Sign a quote payload
+
+        Args:
+            payload: JSON-serializable quote contents
+            now: Unix time (default: time.time())
+
+        Returns:
+            tuple: (token, expires_at unix time)
+        """
+        now = time.time() if now is None else now
+        expires_at = round(now + self.ttl_seconds, 3)
+        body = _b64encode(json.dumps(dict(payload, expires_at=expires_at), separators=(',', ':')).encode())
+        return f"{body}.{self._sign(body)}", expires_at
+
+    def verify(self, token: str, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Check a token's signature and expiry
+
+        Args:
+            token: Token from issue()
+            now: Unix time (default: time.time())
+
+        Returns:
+            dict: Signed payload (including expires_at and fares)
+
+        Raises:
+            ValueError: If the token is malformed, forged, expired or lacks expires_at/fares
+        """
+        if not token.isascii():
+            raise ValueError("Malformed quote token")
+        body, _, signature = token.partition('.')
+        if not signature or not hmac.compare_digest(signature, self._sign(body)):
+            raise ValueError("Invalid quote token signature")
+        try:
+            payload = json.loads(_b64decode(body))
+            expires_at = float(payload['expires_at'])
+            fares = payload['fares']
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError(f"Malformed quote token payload: {e!r}") from e
+        if not isinstance(fares, dict):
+            raise ValueError("Malformed quote token payload: fares is not a mapping")
+        now = time.time() if now is None else now
+        if now > expires_at:
+            raise ValueError("Quote token has expired")
+        return payload
+
+
+# Global instances
+quote_cache = QuoteCache()
+quote_signer = QuoteSigner()
@@ -0,0 +1,233 @@
+"""
+Shadow Model Evaluator
+
+Runs a challenger ETA model on a sampled fraction of live quotes, off the
+request path, and logs its predictions next to the served (champion) ones
+together with per-model inference latency. Reports are built from the log
+by src/evaluation/shadow_report.py.
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import VEHICLE_TYPE_CODES, SHADOW_SAMPLE_RATE, SHADOW_QUEUE_SIZE, SHADOW_LOG_PATH
+
+# Latency histogram bucket upper bounds (ms), log-spaced from 10 µs to 10 s
+LATENCY_BUCKETS_MS = np.logspace(-2, 4, 25)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (cheap to update, mergeable across logs)"""
+
+    def __init__(self, bucket_bounds_ms: np.ndarray = LATENCY_BUCKETS_MS):
+        self.bounds = np.asarray(bucket_bounds_ms, dtype=np.float64)
+        self.counts = np.zeros(len(self.bounds) + 1, dtype=np.int64)  # last bucket: overflow
+        self.total_ms = 0.0
+
+    def record(self, latency_ms: float) -> None:
+        self.counts[np.searchsorted(self.bounds, latency_ms)] += 1
+        self.total_ms += latency_ms
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-th percentile"""
+        if self.count == 0:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self.counts), q / 100 * self.count))
+        return float(self.bounds[min(index, len(self.bounds) - 1)])
+
+    def to_dict(self) -> Dict:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 4) if self.count else 0.0,
+            'p50_ms': round(self.percentile(50), 4),
+            'p99_ms': round(self.percentile(99), 4),
+            'bucket_bounds_ms': [round(float(b), 4) for b in self.bounds],
+            'counts': self.counts.tolist()
+        }
+
+
+class ShadowModel:
+    """A model as seen by the shadow evaluator: its own feature builder and predict function"""
+
+    def __init__(self, version: str, feature_builder, predict_fn: Callable[[np.ndarray], np.ndarray]):
+        self.version = version
+        self.feature_builder = feature_builder
+        self.predict_fn = predict_fn
+
+    def predict(self, distance: float, hour: int, day_of_week: int, vehicle_codes: Sequence[int]):
+        """Point-estimate durations and inference latency (ms) for one quote"""
+        features = self.feature_builder.build_batch(
+            np.full(len(vehicle_codes), distance), np.full(len(vehicle_codes), hour),
+            np.full(len(vehicle_codes), day_of_week), np.asarray(vehicle_codes)
+        )
+        start = time.perf_counter()
+        predictions = np.asarray(self.predict_fn(features), dtype=np.float64)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if predictions.ndim == 2:
+            predictions = predictions[:, 0]  # Point estimate column of multi-output models
+        return predictions, latency_ms
+
+
+class ShadowEvaluator:
+    """
+    Champion/challenger comparison on sampled live traffic.
+
+    Design Decisions:
+    1. Off the request path: submit() only samples and enqueues (bounded queue,
+       dropped when full); a background task runs both models in a worker thread.
+    2. Same conditions: Both models are re-timed back to back on the same inputs in
+       the worker, so latency histograms compare the models rather than queueing.
+    3. Served values: The logged champion prediction is the one the rider was shown.
+    """
+
+    def __init__(
+        self,
+        champion: ShadowModel,
+        challenger: ShadowModel,
+        sample_rate: float = SHADOW_SAMPLE_RATE,
+        log_path: Optional[str] = SHADOW_LOG_PATH,
+        max_queue: int = SHADOW_QUEUE_SIZE
+    ):
+        self.champion = champion
+        self.challenger = challenger
+        self.sample_rate = sample_rate
+        self.log_path = log_path
+        self.max_queue = max_queue
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.sampled = 0
+        self.dropped = 0
+        self.evaluated = 0
+        self.errors = 0
+        self.latency = {'champion': LatencyHistogram(), 'challenger': LatencyHistogram()}
+        self._abs_delta_sum = 0.0
+        self._delta_sum = 0.0
+        self._delta_count = 0
+
+    def submit(
+        self,
+        request_id: str,
+        distance: float,
+        hour: int,
+        day_of_week: int,
+        served: Dict[str, Dict[str, float]]
+    ) -> bool:
+        """
+        Maybe queue one quote for shadow evaluation (call from the event loop)
+
+        Args:
+            request_id: Quote request ID (for joining with actual trip durations)
+            distance: Trip distance in kilometers
+            hour: Hour of day (0-23)
+            day_of_week: Day of week (0=Monday)
+            served: vehicle_type -> served outputs (see _predict_durations)
+
+        Returns:
+            bool: Whether the quote was queued
+        """
+        if random.random() >= self.sample_rate:
+            return False
+
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+        self.sampled += 1
+        try:
+            self._queue.put_nowait((request_id, distance, hour, day_of_week, served))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        return True
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                record = await asyncio.to_thread(self._evaluate, *item)
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠ Shadow evaluation failed: {e}")
+                continue
+            self._record_stats(record)
+
+    def _evaluate(self, request_id, distance, hour, day_of_week, served) -> Dict:
+        """Run both models for one quote and append the record to the log (worker thread)"""
+        vehicle_types = list(served)
+        codes = [VEHICLE_TYPE_CODES[vehicle_type] for vehicle_type in vehicle_types]
+
+        _, champion_ms = self.champion.predict(distance, hour, day_of_week, codes)
+        challenger_pred, challenger_ms = self.challenger.predict(distance, hour, day_of_week, codes)
+        champion_pred = [served[vehicle_type]['duration'] for vehicle_type in vehicle_types]
+
+        record = {
+            'timestamp': datetime.now().isoformat(),
+            'request_id': request_id,
+            'champion_version': self.champion.version,
+            'challenger_version': self.challenger.version,
+            'distance': round(float(distance), 4),
+            'hour': int(hour),
+            'day_of_week': int(day_of_week),
+            'vehicle_types': vehicle_types,
+            'champion': [round(float(v), 4) for v in champion_pred],
+            'challenger': [round(float(v), 4) for v in challenger_pred],
+            'delta': [round(float(c - s), 4) for c, s in zip(challenger_pred, champion_pred)],
+            'champion_latency_ms': round(champion_ms, 4),
+            'challenger_latency_ms': round(challenger_ms, 4)
+        }
+
+        if self.log_path:
+            os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+            with open(self.log_path, 'a') as f:
+                f.write(json.dumps(record) + '\n')
+        return record
+
+    def _record_stats(self, record: Dict) -> None:
+        self.evaluated += 1
+        self.latency['champion'].record(record['champion_latency_ms'])
+        self.latency['challenger'].record(record['challenger_latency_ms'])
+        deltas = record['delta']
+        self._delta_sum += sum(deltas)
+        self._abs_delta_sum += sum(abs(d) for d in deltas)
+        self._delta_count += len(deltas)
+
+    def stats(self) -> Dict:
+        """Sampling counters, latency histograms and prediction deltas"""
+        n = self._delta_count
+        return {
+            'champion_version': self.champion.version,
+            'challenger_version': self.challenger.version,
+            'sample_rate': self.sample_rate,
+            'sampled': self.sampled,
+            'dropped': self.dropped,
+            'evaluated': self.evaluated,
+            'errors': self.errors,
+            'queued': self._queue.qsize() if self._queue is not None else 0,
+            'mean_delta': round(self._delta_sum / n, 4) if n else 0.0,
+            'mean_abs_delta': round(self._abs_delta_sum / n, 4) if n else 0.0,
+            'latency': {name: hist.to_dict() for name, hist in self.latency.items()}
+        }
+
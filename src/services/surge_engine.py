@@ -0,0 +1,231 @@
+"""
+Background Surge Engine
+
+Recomputes surge multipliers on a fixed interval from live supply
+(distance-weighted available vehicles around every fine supply cell) and
+demand (live quote rate blended with the demand table), and publishes the
+result as an immutable snapshot that quote requests read in O(1).
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import SURGE_REFRESH_INTERVAL_S
+from src.pricing.dynamic_pricing import (
+    PEAK_DEMAND_RIDES,
+    get_surge_multipliers
+)
+from src.pricing.city_grid import city_grid
+from src.pricing.supply import SupplyGrid
+
+
+class SurgeSnapshot:
+    """
+    Surge multipliers for all regions at one point in time.
+
+    Arrays are read-only; a recompute publishes a new snapshot rather than
+    modifying this one, so a request that read it sees consistent values.
+    Multipliers are published per fine supply cell (from the supply around
+    the cell and its region's demand); a quote is priced with its pickup
+    cell's multiplier, and each region reports the value of its center cell.
+    """
+
+    __slots__ = (
+        'version', 'cell_versions', 'cell_multipliers', 'cell_ratios',
+        'multipliers', 'ratios', 'supply', 'effective_supply', 'demand_rates',
+        'supply_grid', 'supply_table', 'hour', 'day_of_week', 'computed_at', '_computed_monotonic'
+    )
+
+    def __init__(
+        self,
+        version: int,
+        cell_versions: np.ndarray,
+        cell_multipliers: np.ndarray,
+        cell_ratios: np.ndarray,
+        supply: np.ndarray,
+        demand_rates: np.ndarray,
+        supply_grid: SupplyGrid,
+        supply_table: np.ndarray,
+        hour: int,
+        day_of_week: int
+    ):
+        centers = supply_grid.region_centers
+        self.version = version
+        self.cell_versions = cell_versions  # Version at which each cell's multiplier last changed
+        self.cell_multipliers = cell_multipliers
+        self.cell_ratios = cell_ratios
+        self.multipliers = cell_multipliers[centers]  # Per region, at its center cell
+        self.ratios = cell_ratios[centers]
+        self.supply = supply  # Available vehicles inside each region
+        # Distance-weighted supply around each region's center
+        self.effective_supply = supply_grid.supply_at(supply_table, centers, np.arange(len(centers)))
+        self.demand_rates = demand_rates  # Estimated rides/hour per region
+        self.supply_grid = supply_grid
+        self.supply_table = supply_table  # Summed-area table of vehicles per fine cell
+        for array in (
+            cell_versions, cell_multipliers, cell_ratios, self.multipliers, self.ratios,
+            supply, self.effective_supply, demand_rates, supply_table
+        ):
+            array.setflags(write=False)
+        self.hour = hour
+        self.day_of_week = day_of_week
+        self.computed_at = datetime.now().isoformat()
+        self._computed_monotonic = time.monotonic()
+
+    @property
+    def age_s(self) -> float:
+        return time.monotonic() - self._computed_monotonic
+
+    def covers(self, hour: int, day_of_week: int) -> bool:
+        """Whether the snapshot was computed for this hour and day"""
+        return self.hour == hour and self.day_of_week == day_of_week
+
+    def lookup(self, cell: int) -> Tuple[float, str]:
+        """
+        Published surge at a pickup's fine supply cell
+
+        Args:
+            cell: Fine supply cell of the pickup (SupplyGrid.cell_ids)
+
+        Returns:
+            tuple: (surge_multiplier, reason)
+        """
+        return (
+            float(self.cell_multipliers[cell]),
+            f"Calculated from demand-supply ratio ({self.cell_ratios[cell]:.2f})"
+        )
+
+
+class SurgeEngine:
+    """
+    Background task publishing a SurgeSnapshot every `interval_s`.
+
+    Demand and vehicles are read through callables, so the engine always uses
+    the currently served demand model (which hot reloads swap out). With a
+    live demand estimator, the demand table is the prior its quote counts
+    are blended with.
+    """
+
+    def __init__(
+        self,
+        demand_fn: Callable[[], Optional[object]],
+        vehicles_fn: Callable[[], List[Dict]],
+        live_demand=None,
+        n_regions: int = city_grid.n_regions,
+        interval_s: float = SURGE_REFRESH_INTERVAL_S,
+        supply_grid: Optional[SupplyGrid] = None
+    ):
+        self.demand_fn = demand_fn
+        self.vehicles_fn = vehicles_fn
+        self.live_demand = live_demand  # Optional LiveDemandEstimator
+        self.n_regions = n_regions
+        self.supply_grid = supply_grid or SupplyGrid()
+        self.interval_s = interval_s
+        self.snapshot: Optional[SurgeSnapshot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._version = 0
+
+    def start(self) -> None:
+        """Publish a first snapshot and keep refreshing on the running event loop"""
+        if self._task is None:
+            self.recompute()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_s)
+            try:
+                self.recompute()
+            except Exception as e:
+                print(f"⚠ Surge recompute failed: {e}")
+
+    def recompute(self, now: Optional[datetime] = None) -> SurgeSnapshot:
+        """
+        Recompute surge for every region and publish the snapshot
+
+        Args:
+            now: Time to compute for (default: current time)
+
+        Returns:
+            SurgeSnapshot: Newly published snapshot
+        """
+        now = now or datetime.now()
+        hour, day_of_week = now.hour, now.weekday()
+
+        # Supply: available vehicles per region, and per fine cell for the distance-weighted counts
+        available = [v for v in self.vehicles_fn() if v['status'] == 'available']
+        lats = [v['location']['lat'] for v in available]
+        lons = [v['location']['lon'] for v in available]
+        supply = np.zeros(self.n_regions, dtype=np.int64)
+        if available:
+            supply = np.bincount(self.supply_grid.grid.region_ids(lats, lons), minlength=self.n_regions)
+        supply_table = self.supply_grid.summed_area(lats, lons)
+
+        # Demand: historical rides/hour for this hour and day (score 0.5 without a demand model),
+        # blended with the live quote rate
+        demand = self.demand_fn()
+        if demand is not None:
+            scores = np.array(demand.scores[:, hour, day_of_week], dtype=np.float64)
+        else:
+            scores = np.full(self.n_regions, 0.5)
+        rates = scores * PEAK_DEMAND_RIDES
+        if self.live_demand is not None:
+            rates = self.live_demand.blend(rates)
+
+        # Surge per fine cell: its region's demand over the distance-weighted supply around it
+        cell_regions = self.supply_grid.cell_regions
+        cell_supply = self.supply_grid.supply_at(
+            supply_table, np.arange(self.supply_grid.n_cells), cell_regions
+        )
+        cell_ratios = rates[cell_regions] / np.maximum(cell_supply, 1)
+        cell_multipliers = get_surge_multipliers(cell_ratios)
+
+        # A cell's surge version only moves when its multiplier changes
+        self._version += 1
+        previous = self.snapshot
+        if previous is None:
+            cell_versions = np.full(self.supply_grid.n_cells, self._version, dtype=np.int64)
+        else:
+            cell_versions = np.where(
+                cell_multipliers != previous.cell_multipliers, self._version, previous.cell_versions
+            )
+        self.snapshot = SurgeSnapshot(
+            self._version, cell_versions, cell_multipliers, cell_ratios, supply, rates,
+            self.supply_grid, supply_table, hour, day_of_week
+        )
+        return self.snapshot
+
+    def stats(self) -> Dict:
+        """Current snapshot summary"""
+        snapshot = self.snapshot
+        if snapshot is None:
+            return {'running': self._task is not None, 'version': None}
+        return {
+            'running': self._task is not None,
+            'interval_s': self.interval_s,
+            'version': snapshot.version,
+            'computed_at': snapshot.computed_at,
+            'age_s': round(snapshot.age_s, 3),
+            'hour': snapshot.hour,
+            'day_of_week': snapshot.day_of_week,
+            'multipliers': snapshot.multipliers.tolist(),
+            'cell_multipliers': snapshot.cell_multipliers.reshape(
+                snapshot.supply_grid.size, snapshot.supply_grid.size
+            ).tolist(),
+            'supply': snapshot.supply.tolist(),
+            'effective_supply': np.round(snapshot.effective_supply, 2).tolist()
+        }
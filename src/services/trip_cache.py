@@ -0,0 +1,134 @@
+"""
+Trip Cache
+
+Size-bounded LRU cache with TTL for per-trip work (distance, predicted duration)
+that only depends on where the rider is going and when.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+import os
+import sys
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from config import (
+    TRIP_CACHE_MAX_SIZE,
+    TRIP_CACHE_TTL_SECONDS,
+    TRIP_CACHE_CELL_DEGREES
+)
+
+
+class TripCache:
+    """
+    LRU + TTL cache keyed on snapped pickup/drop cells and time bucket.
+
+    Design Decisions:
+    1. Snapped coordinates: A refresh or a mode toggle moves the pin by a few metres at most,
+       so nearby coordinates share one cell and one entry.
+    2. OrderedDict: O(1) get/put and O(1) eviction of the least recently used entry.
+    3. Lock: Cheap insurance so the cache stays consistent if inference moves to worker threads.
+    """
+
+    def __init__(
+        self,
+        max_size: int = TRIP_CACHE_MAX_SIZE,
+        ttl_seconds: float = TRIP_CACHE_TTL_SECONDS,
+        cell_degrees: float = TRIP_CACHE_CELL_DEGREES
+    ):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.cell_degrees = cell_degrees
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _snap(self, value: float) -> int:
+        return int(round(value / self.cell_degrees))
+
+    def make_key(
+        self,
+        pickup_lat: float,
+        pickup_lon: float,
+        drop_lat: float,
+        drop_lon: float,
+        hour: int,
+        day_of_week: int
+    ) -> Tuple:
+        """
+        Build a cache key from snapped coordinates, hour and day of week.
+
+        The ETA model takes day_of_week as a feature, so each weekday gets its
+        own entry rather than sharing a weekday/weekend bucket.
+
+        Returns:
+            tuple: (pickup cell, drop cell, hour, day_of_week)
+        """
+        return (
+            self._snap(pickup_lat), self._snap(pickup_lon),
+            self._snap(drop_lat), self._snap(drop_lon),
+            hour, day_of_week
+        )
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Return the cached value, or None on miss / expiry"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            stored_at, value = entry
+            if now - stored_at > self.ttl_seconds:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple, value: Any) -> None:
+        """Insert or refresh an entry, evicting the least recently used one if full"""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+            self.expirations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl_seconds,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Global instance
+trip_cache = TripCache()
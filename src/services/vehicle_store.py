@@ -93,6 +93,9 @@ class VehicleStore:
         """
         Filters vehicles by proximity using Haversine distance (approximate).
         Why this is okay for demo: Simple math is reliable.
+        
+        Returns the stored vehicle dicts themselves (no per-call copies);
+        callers must treat them as read-only and go through update_vehicle.
         """
         nearby = []
         for v in self._vehicles.values():
@@ -106,12 +109,8 @@ class VehicleStore:
             if abs(v_lat - lat) > 0.1 or abs(v_lon - lon) > 0.1:
                 continue
                 
-            dist = self._haversine(lat, lon, v_lat, v_lon)
-            if dist <= radius_km:
-                # Inject distance for frontend use if needed
-                v_copy = v.copy()
-                v_copy['distance_km'] = round(dist, 2)
-                nearby.append(v_copy)
+            if self._haversine(lat, lon, v_lat, v_lon) <= radius_km:
+                nearby.append(v)
                 
         return nearby
 
@@ -7,12 +7,15 @@ Tests API endpoints, request validation, and response schemas.
 import pytest
 import sys
 import os
+from datetime import datetime
 from fastapi.testclient import TestClient
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import api.main as api_main
 from api.main import app
+from src.services.demand_estimator import LiveDemandEstimator
 
 # Create test client
 client = TestClient(app)
@@ -40,6 +43,23 @@ class TestAPIEndpoints:
         assert data["status"] == "healthy"
         assert "models_loaded" in data
 
+    def test_liveness_and_readiness(self):
+        """Test liveness is immediate and readiness follows background model loading"""
+        assert client.get("/health/live").status_code == 200
+
+        with TestClient(app) as started_client:
+            # A quote waits for loading, so afterwards the API must report ready
+            started_client.post("/ride/quote", json={
+                "pickup": {"lat": 13.35, "lon": 74.78},
+                "drop": {"lat": 13.34, "lon": 74.75},
+                "user_mode": "balanced"
+            })
+            response = started_client.get("/health/ready")
+
+            assert response.status_code == 200
+            assert response.json()["ready"] is True
+            assert response.json()["startup"]["time_to_ready_ms"] is not None
+
 
 class TestVehicleUpdateEndpoint:
     """Test suite for /vehicles/update endpoint"""
@@ -280,6 +300,96 @@ class TestRideQuoteEndpoint:
                 f"Score {score} should be in range [0, 1]"
 
 
+class TestQuoteSurgePath:
+    """Surge for quotes is read from the published snapshot, never by scanning the fleet"""
+    
+    @pytest.fixture
+    def no_fleet_scans(self, monkeypatch):
+        def get_all():
+            raise AssertionError("quote surge scanned the fleet")
+        fleet = [{'location': {'lat': 13.345, 'lon': 74.745}, 'status': 'available'}] * 3
+        engine = api_main.SurgeEngine(lambda: None, lambda: fleet)
+        engine.recompute(datetime(2024, 1, 15, 8, 30))
+        monkeypatch.setattr(api_main, 'surge_engine', engine)
+        monkeypatch.setattr(api_main.vehicle_store, 'get_all', get_all)
+        return engine
+    
+    def test_snapshot_hour_reads_published_multiplier(self, no_fleet_scans):
+        snapshot = no_fleet_scans.snapshot
+        surge, _, used, version = api_main._region_surge(13.345, 74.745, 8, 0, None)
+        cell = snapshot.supply_grid.cell_ids([13.345], [74.745])[0]
+        
+        assert used is snapshot
+        assert surge == snapshot.cell_multipliers[cell]
+        assert version == snapshot.cell_versions[cell]
+    
+    def test_other_hour_uses_snapshot_supply(self, no_fleet_scans):
+        for hour, day_of_week in [(9, 0), (8, 3)]:
+            surge, _, used, version = api_main._region_surge(13.345, 74.745, hour, day_of_week, None)
+            assert used is None and version is None
+            assert surge > 0
+    
+    def test_no_snapshot_falls_back(self, no_fleet_scans):
+        no_fleet_scans.snapshot = None
+        surge, reason, used, _ = api_main._region_surge(13.345, 74.745, 8, 0, None)
+        assert (surge, used) == (1.0, None)
+
+
+class TestLiveDemandRecording:
+    """Live demand counts each trip once, not every refresh or mode toggle"""
+    
+    def test_repeat_and_mode_toggle_count_once(self, monkeypatch):
+        estimator = LiveDemandEstimator()
+        monkeypatch.setattr(api_main, 'live_demand', estimator)
+        
+        with TestClient(app) as started_client:
+            for mode, pickup_lon in [('balanced', 74.78), ('balanced', 74.78001), ('cheapest', 74.78), ('all', 74.78)]:
+                started_client.post("/ride/quote", json={
+                    "pickup": {"lat": 13.35, "lon": pickup_lon},
+                    "drop": {"lat": 13.34, "lon": 74.75},
+                    "timestamp": "2024-01-15T08:30:00",
+                    "user_mode": mode
+                })
+        
+        assert int(estimator.window_counts().sum()) == 1
+        assert estimator.duplicates == 3
+
+
+class TestQuoteRedemption:
+    """Bad quote tokens are client errors"""
+    
+    def test_cache_hits_get_fresh_id_and_token(self):
+        """Refreshes served from the quote cache are quoted the same but signed separately"""
+        api_main.quote_cache.clear()
+        quote = {
+            "pickup": {"lat": 13.35, "lon": 74.78},
+            "drop": {"lat": 13.34, "lon": 74.75},
+            "user_mode": "balanced"
+        }
+        
+        with TestClient(app) as started_client:
+            responses = [started_client.post("/ride/quote", json=quote).json() for _ in range(3)]
+            hits = api_main.quote_cache.hits
+            redeemed = [
+                started_client.post("/ride/quote/redeem", json={
+                    "quote_token": data["quote_token"],
+                    "vehicle_id": data["available_vehicles"][0]["vehicle_id"]
+                }).json()
+                for data in responses
+            ]
+        
+        assert hits >= 2
+        assert len({data["request_id"] for data in responses}) == 3
+        assert len({data["quote_token"] for data in responses}) == 3
+        assert [data["available_vehicles"] for data in responses[1:]] == [responses[0]["available_vehicles"]] * 2
+        assert [r["request_id"] for r in redeemed] == [data["request_id"] for data in responses]
+    
+    @pytest.mark.parametrize('token', ['\u00e9.x', 'not-a-token', 'a.b.c'])
+    def test_malformed_token_is_400(self, token):
+        response = client.post("/ride/quote/redeem", json={"quote_token": token, "vehicle_id": "v1"})
+        assert response.status_code == 400
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
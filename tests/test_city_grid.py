@@ -0,0 +1,105 @@
+"""
+Unit Tests for the Multi-Resolution City Grid
+
+Tests region lookup through the raster, quadtree splitting of dense cells,
+and that the uniform grid keeps the original region indices and IDs.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pricing.city_grid import CityGrid, uniform_cell_ids
+from src.pricing.dynamic_pricing import get_region_index, get_region_id, get_region_ids
+from src.pricing.supply import SupplyGrid
+
+
+@pytest.fixture
+def dense_grid():
+    # 1000 pickups in the north-east quarter of base cell 2_2, a few spread elsewhere
+    rng = np.random.default_rng(0)
+    lats = np.concatenate([rng.uniform(13.340, 13.350, 1000), rng.uniform(13.29, 13.39, 100)])
+    lons = np.concatenate([rng.uniform(74.740, 74.750, 1000), rng.uniform(74.69, 74.79, 100)])
+    return CityGrid.from_points(lats, lons, split_threshold=500, max_depth=2)
+
+
+class TestCityGrid:
+    """Test suite for the quadtree city grid"""
+
+    def test_uniform_matches_base_grid(self):
+        grid = CityGrid.uniform()
+        rng = np.random.default_rng(1)
+        lats = rng.uniform(13.28, 13.40, 500)
+        lons = rng.uniform(74.68, 74.80, 500)
+
+        assert grid.n_regions == 25
+        np.testing.assert_array_equal(grid.region_ids(lats, lons), uniform_cell_ids(lats, lons, 5))
+        np.testing.assert_array_equal(get_region_ids(lats, lons), get_region_ids(lats, lons, grid_size=5))
+        assert grid.format_region_id(get_region_index(13.345, 74.745)) == '2_2'
+        assert get_region_id(13.345, 74.745) == '2_2'
+
+    def test_dense_cells_are_split(self, dense_grid):
+        assert '2_2' not in dense_grid.leaves
+        assert '2_2.3' not in dense_grid.leaves       # dense quarter split again
+        assert '2_2.30' in dense_grid.leaves
+        assert '2_2.0' in dense_grid.leaves           # sparse quarters stay whole
+        assert '0_0' in dense_grid.leaves
+        assert dense_grid.area_fractions.sum() == pytest.approx(25)
+
+    def test_lookups_agree(self, dense_grid):
+        rng = np.random.default_rng(2)
+        lats = rng.uniform(13.29, 13.39, 300)
+        lons = rng.uniform(74.69, 74.79, 300)
+        regions = dense_grid.region_ids(lats, lons)
+
+        assert list(regions) == [dense_grid.region_index(lat, lon) for lat, lon in zip(lats, lons)]
+        assert dense_grid.format_region_id(dense_grid.region_index(13.3495, 74.7495)) == '2_2.33'
+        for region in np.unique(regions):
+            assert dense_grid.parse_region_id(dense_grid.format_region_id(region)) == region
+
+    def test_save_load_roundtrip(self, dense_grid, tmp_path):
+        path = str(tmp_path / 'city_grid.json')
+        dense_grid.save(path)
+        loaded = CityGrid.load(path)
+
+        assert loaded.leaves == dense_grid.leaves
+        assert loaded.fingerprint == dense_grid.fingerprint
+        assert loaded.fingerprint != CityGrid.uniform().fingerprint
+
+    def test_invalid_leaves(self):
+        leaves = [f"{i}_{j}" for i in range(5) for j in range(5)]
+        with pytest.raises(ValueError):
+            CityGrid(leaves[:-1])                      # incomplete coverage
+        with pytest.raises(ValueError):
+            CityGrid(leaves + ['2_2.0'])               # overlap
+        with pytest.raises(ValueError):
+            CityGrid(leaves[:12] + ['2_2.4'] + leaves[13:])
+        with pytest.raises(ValueError):
+            CityGrid.uniform().parse_region_id('9_9')
+
+    def test_supply_scaled_to_region_area(self, dense_grid):
+        """Uniform vehicle density gives supply proportional to region area"""
+        supply = SupplyGrid(grid=dense_grid, subdivisions=4)
+        cells = supply.cell_ids(dense_grid.center_lats, dense_grid.center_lons)
+        counts = np.ones(supply.size * supply.size)
+        table = supply.summed_area_from_counts(counts)
+
+        values = supply.supply_at(table, cells, np.arange(dense_grid.n_regions))
+        np.testing.assert_allclose(values, 16 * dense_grid.area_fractions)
+
+    def test_supply_cells_inside_one_region(self, dense_grid):
+        """Supply subdivisions are aligned with the finest regions"""
+        supply = SupplyGrid(grid=dense_grid, subdivisions=5)
+        rows, cols = np.divmod(np.arange(supply.n_cells), supply.size)
+        corner_regions = dense_grid.region_ids(
+            13.29 + (rows + 0.01) / supply.size * 0.1, 74.69 + (cols + 0.01) / supply.size * 0.1
+        )
+
+        assert supply.subdivisions == 8
+        np.testing.assert_array_equal(supply.cell_regions, corner_regions)
+        np.testing.assert_array_equal(supply.cell_regions[supply.region_centers], np.arange(dense_grid.n_regions))
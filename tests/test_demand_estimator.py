@@ -0,0 +1,99 @@
+"""
+Unit Tests for Live Demand Estimation
+
+Tests the sliding-window ring buffer of quote counts and blending the live
+rate with the historical prior.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.demand_estimator import LiveDemandEstimator
+from src.services.surge_engine import SurgeEngine
+
+
+class TestSlidingWindow:
+    """Test suite for the ring-buffer window"""
+
+    def test_counts_per_region(self):
+        estimator = LiveDemandEstimator(n_regions=4, window_s=60, bucket_s=10)
+        for now, region in [(0.0, 1), (5.0, 1), (12.0, 3)]:
+            estimator.record(region, now=now)
+        np.testing.assert_array_equal(estimator.window_counts(now=15.0), [0, 2, 0, 1])
+
+    def test_old_buckets_expire(self):
+        """Quotes older than the window drop out as the ring wraps"""
+        estimator = LiveDemandEstimator(n_regions=2, window_s=30, bucket_s=10)
+        estimator.record(0, now=0.0)
+        estimator.record(0, now=15.0)
+        assert estimator.window_counts(now=29.0)[0] == 2
+        assert estimator.window_counts(now=31.0)[0] == 1  # bucket [0, 10) reused
+        assert estimator.window_counts(now=1000.0)[0] == 0  # long idle gap clears everything
+
+    def test_rate_uses_observed_time_after_start(self):
+        """Right after startup, rates are per observed time rather than the full window"""
+        estimator = LiveDemandEstimator(n_regions=1, window_s=3600, bucket_s=60)
+        for i in range(10):
+            estimator.record(0, now=float(i))
+        assert estimator.rates(now=60.0)[0] == pytest.approx(600.0)  # 10 quotes / minute
+
+    def test_repeat_intent_counted_once_per_window(self):
+        """Re-quoting the same trip is not new demand until it leaves the window"""
+        estimator = LiveDemandEstimator(n_regions=2, window_s=30, bucket_s=10)
+        trip = (1, 2, 3, 4, 8, 0)
+        assert estimator.record(0, intent=trip, now=0.0)
+        assert not estimator.record(0, intent=trip, now=5.0)
+        assert estimator.record(0, intent=(9, 9, 9, 9, 8, 0), now=6.0)
+        assert estimator.window_counts(now=7.0)[0] == 2
+        assert estimator.duplicates == 1
+
+        assert estimator.record(0, intent=trip, now=31.0)  # bucket [0, 10) expired with both counts
+        assert estimator.window_counts(now=31.0)[0] == 1
+
+
+class TestPriorBlending:
+    """Test suite for blending live demand with the historical prior"""
+
+    def test_no_quotes_returns_prior(self):
+        estimator = LiveDemandEstimator(n_regions=3, window_s=60, bucket_s=10, prior_quotes=5)
+        estimator.record(0, now=0.0)
+        blended = estimator.blend(np.array([10.0, 20.0, 30.0]), now=30.0)
+        assert blended[1:].tolist() == [20.0, 30.0]
+
+    def test_many_quotes_dominate_prior(self):
+        """Weight on the live rate grows with the number of quotes"""
+        estimator = LiveDemandEstimator(n_regions=1, window_s=60, bucket_s=10, prior_quotes=5)
+        for i in range(95):
+            estimator.record(0, now=i * 0.5)
+        live = estimator.rates(now=59.0)[0]
+        blended = estimator.blend(np.array([1.0]), now=59.0)[0]
+        weight = 0.95 * 59 / 60  # 59 of the 60 s window observed
+        assert blended == pytest.approx(weight * live + (1 - weight) * 1.0)
+
+    def test_no_spike_right_after_startup(self):
+        """A few quotes seconds after a restart barely move demand off the prior"""
+        estimator = LiveDemandEstimator(n_regions=1, window_s=900, bucket_s=30, prior_quotes=20)
+        for i in range(5):
+            estimator.record(0, now=1000.0 + i * 0.5)
+        blended = estimator.blend(np.array([10.0]), now=1003.0)[0]
+
+        assert estimator.rates(now=1003.0)[0] == pytest.approx(600.0)  # 5 quotes over the 30 s floor
+        assert blended == pytest.approx(10.0, abs=5.0)
+
+    def test_surge_reacts_to_live_quotes(self):
+        """A burst of quotes in a region raises its published surge"""
+        estimator = LiveDemandEstimator(n_regions=25, window_s=60, bucket_s=10, prior_quotes=5)
+        fleet = [{'location': {'lat': 13.345, 'lon': 74.745}, 'status': 'available'}] * 10
+        engine = SurgeEngine(lambda: None, lambda: fleet, live_demand=estimator)
+
+        quiet = engine.recompute().multipliers[12]
+        for _ in range(200):
+            estimator.record(12)
+        busy = engine.recompute().multipliers[12]
+        assert busy > quiet
@@ -0,0 +1,447 @@
+"""
+Unit Tests for Online Inference
+
+Tests the pandas-free ETA feature builder, the flattened tree predictor,
+the precomputed ETA lookup table, the async micro-batcher, the worker-pool
+executor, the versioned model bundle and the pickup ETA model.
+"""
+
+import pytest
+import asyncio
+import time
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sklearn.preprocessing import StandardScaler
+from src.inference.feature_builder import ETA_FEATURE_COLUMNS, EtaFeatureBuilder
+from src.inference.tree_compiler import CompiledForest, compile_lgbm, stack_forests
+from src.inference.eta_table import EtaLookupTable
+from src.inference.batcher import MicroBatcher
+from src.inference.executor import InferenceExecutor
+from src.inference.pickup_eta import PickupEtaModel
+from src.inference.bundle import save_eta_bundle, load_eta_bundle
+from src.services.loop_monitor import LoopBlockMonitor
+
+
+class TestEtaFeatureBuilder:
+    """Test suite for the ETA feature builder"""
+
+    def test_row_per_vehicle_code(self):
+        """Each vehicle code gets its own row with shared trip features"""
+        builder = EtaFeatureBuilder()
+        features = builder.build(4.2, 8, 5, [0, 1, 2])
+
+        assert features.shape == (3, len(ETA_FEATURE_COLUMNS))
+        col = ETA_FEATURE_COLUMNS.index
+        assert list(features[:, col('vehicle_encoded')]) == [0, 1, 2]
+        assert np.all(features[:, col('trip_distance')] == 4.2)
+        assert np.all(features[:, col('is_rush_hour')] == 1)
+        assert np.all(features[:, col('is_morning_rush')] == 1)
+        assert np.all(features[:, col('is_weekend')] == 1)
+        assert np.all(features[:, col('is_late_night')] == 0)
+
+    def test_matches_scaler_transform(self):
+        """Folded scaling should match StandardScaler.transform on a DataFrame"""
+        rng = np.random.default_rng(0)
+        train = pd.DataFrame(rng.normal(size=(50, 9)) + 3, columns=ETA_FEATURE_COLUMNS)
+        scaler = StandardScaler().fit(train)
+
+        builder = EtaFeatureBuilder()
+        builder.set_scaler(scaler)
+        features = builder.build(3.0, 18, 2, [1]).copy()
+
+        raw = EtaFeatureBuilder().build(3.0, 18, 2, [1])
+        expected = scaler.transform(pd.DataFrame(raw, columns=ETA_FEATURE_COLUMNS))
+        np.testing.assert_allclose(features, expected)
+
+    def test_validate_rejects_wrong_order(self):
+        """A model trained on a different column order must be rejected at load"""
+        train = pd.DataFrame(np.ones((5, 9)), columns=list(reversed(ETA_FEATURE_COLUMNS)))
+        scaler = StandardScaler().fit(train)
+
+        with pytest.raises(ValueError):
+            EtaFeatureBuilder().validate(scaler)
+
+    def test_batch_matches_single_trip(self):
+        """Vectorized build_batch should produce the same rows as build"""
+        builder = EtaFeatureBuilder()
+        single = builder.build(7.5, 22, 6, [0, 2]).copy()
+        batch = builder.build_batch([7.5, 7.5], 22, 6, [0, 2])
+        np.testing.assert_array_equal(batch, single)
+
+    def test_unknown_column_rejected(self):
+        """Unknown feature names cannot be built"""
+        with pytest.raises(ValueError):
+            EtaFeatureBuilder(feature_columns=['trip_distance', 'weather'])
+
+
+@pytest.fixture(scope='module')
+def model_and_data():
+    """Small LightGBM regressor trained on synthetic data"""
+    lgb = pytest.importorskip('lightgbm')
+    rng = np.random.default_rng(42)
+    X = rng.uniform(0, 10, size=(500, 4))
+    y = 3 * X[:, 0] + np.sin(X[:, 1]) * 5 + X[:, 2] * X[:, 3]
+    model = lgb.LGBMRegressor(n_estimators=30, num_leaves=15, verbose=-1)
+    model.fit(X, y)
+    return model, X
+
+
+class TestCompiledForest:
+    """Test suite for the flattened LightGBM predictor"""
+
+    def test_matches_model_predict(self, model_and_data):
+        """Compiled predictions must match model.predict to float tolerance"""
+        model, X = model_and_data
+        forest = compile_lgbm(model)
+
+        assert forest.num_trees == 30
+        np.testing.assert_allclose(forest.predict(X), model.predict(X), rtol=1e-9, atol=1e-9)
+
+    def test_single_row_and_missing_values(self, model_and_data):
+        """Single rows and NaN inputs follow LightGBM's routing"""
+        model, X = model_and_data
+        forest = compile_lgbm(model)
+
+        row = X[:1].copy()
+        row[0, 0] = np.nan
+        np.testing.assert_allclose(forest.predict(row[0]), model.predict(row), atol=1e-9)
+
+    def test_zero_as_missing_matches_model(self, tmp_path):
+        """missing_type 'Zero' sends 0.0 and NaN in the default direction, like LightGBM"""
+        lgb = pytest.importorskip('lightgbm')
+        rng = np.random.default_rng(0)
+        X = rng.uniform(-5, 10, size=(600, 3))
+        X[rng.random(600) < 0.2, 0] = 0.0
+        X[rng.random(600) < 0.1, 1] = np.nan
+        y = 3 * X[:, 0] + np.nan_to_num(X[:, 1]) + (X[:, 0] == 0) * 20
+        model = lgb.LGBMRegressor(n_estimators=20, num_leaves=15, zero_as_missing=True, verbose=-1).fit(X, y)
+        forest = compile_lgbm(model)
+
+        X_test = X.copy()
+        X_test[:50, 2] = 0.0
+        X_test[50:100, 0] = np.nan
+        assert forest.zero_missing.any()
+        np.testing.assert_allclose(forest.predict(X_test), model.predict(X_test), rtol=1e-9, atol=1e-9)
+
+        path = str(tmp_path / 'forest.npz')
+        forest.save(path)
+        np.testing.assert_array_equal(CompiledForest.load(path).predict(X_test), forest.predict(X_test))
+
+    def test_save_and_load(self, model_and_data, tmp_path):
+        """Exported arrays round-trip through .npz"""
+        model, X = model_and_data
+        forest = compile_lgbm(model)
+        path = str(tmp_path / 'forest.npz')
+
+        forest.save(path)
+        loaded = CompiledForest.load(path)
+        np.testing.assert_array_equal(loaded.predict(X), forest.predict(X))
+
+    def test_stacked_forest_matches_each_model(self, model_and_data):
+        """One traversal of a stacked forest returns every model's prediction"""
+        lgb = pytest.importorskip('lightgbm')
+        model, X = model_and_data
+        y = model.predict(X)
+        quantile = lgb.LGBMRegressor(objective='quantile', alpha=0.9, n_estimators=12,
+                                     num_leaves=7, verbose=-1).fit(X, y)
+
+        stacked = stack_forests([compile_lgbm(model), compile_lgbm(quantile)])
+        predictions = stacked.predict(X)
+
+        assert stacked.num_outputs == 2 and stacked.num_trees == 42
+        assert predictions.shape == (len(X), 2)
+        np.testing.assert_allclose(predictions[:, 0], model.predict(X), atol=1e-9)
+        np.testing.assert_allclose(predictions[:, 1], quantile.predict(X), atol=1e-9)
+
+
+def _toy_predict(features):
+    """Piecewise-linear stand-in for the ETA model (distance * speed factor + hour)"""
+    col = ETA_FEATURE_COLUMNS.index
+    return (features[:, col('trip_distance')] * (2.0 + features[:, col('vehicle_encoded')])
+            + features[:, col('hour')] / 10.0)
+
+
+class TestEtaLookupTable:
+    """Test suite for the precomputed ETA table"""
+
+    def test_lookup_matches_model(self):
+        """Interpolation of a linear-in-distance model is exact"""
+        builder = EtaFeatureBuilder()
+        table = EtaLookupTable.build(_toy_predict, builder, 3, step_km=0.5, max_distance_km=10.0)
+
+        expected = _toy_predict(builder.build(3.3, 8, 2, [0, 1, 2]))
+        np.testing.assert_allclose(table.lookup(3.3, 8, 2, [0, 1, 2]), expected)
+        assert table.meta['max_interpolation_error'] < 1e-9
+        assert table.covers(10.0) and not table.covers(10.5)
+
+    def test_regenerated_when_model_changes(self, tmp_path):
+        """A different model fingerprint triggers a rebuild; same one is memory-mapped"""
+        path = str(tmp_path / 'eta_table.npy')
+        builder = EtaFeatureBuilder()
+        args = dict(predict_fn=_toy_predict, feature_builder=builder,
+                    n_vehicle_types=3, step_km=1.0, max_distance_km=5.0)
+
+        first = EtaLookupTable.load_or_build(path, 'model-a', **args)
+        assert isinstance(first.table, np.memmap)
+        built_at = first.meta['built_at']
+
+        same = EtaLookupTable.load_or_build(path, 'model-a', **args)
+        assert same.meta['built_at'] == built_at
+
+        changed = EtaLookupTable.load_or_build(path, 'model-b', **args)
+        assert changed.meta['model_fingerprint'] == 'model-b'
+
+    def test_multi_output_lookup(self):
+        """Tables of (duration, quantile) outputs interpolate every output"""
+        builder = EtaFeatureBuilder()
+        predict = lambda features: np.column_stack([_toy_predict(features), 1.5 * _toy_predict(features)])
+        table = EtaLookupTable.build(predict, builder, 3, step_km=0.5, max_distance_km=10.0)
+
+        assert table.table.shape == (24, 7, 3, 21, 2)
+        assert table.max_distance_km == 10.0
+        np.testing.assert_allclose(table.lookup(3.3, 8, 2, [0, 2]), predict(builder.build(3.3, 8, 2, [0, 2])))
+
+
+class TestMicroBatcher:
+    """Test suite for async micro-batching"""
+
+    def test_concurrent_requests_share_one_batch(self):
+        """Requests inside the window are served by a single predict call"""
+        calls = []
+
+        def predict(X):
+            calls.append(len(X))
+            return X[:, 0] * 2
+
+        async def run():
+            batcher = MicroBatcher(predict, max_batch_rows=1000, max_wait_us=5000)
+            results = await asyncio.gather(*(
+                batcher.predict(np.full((2, 3), float(i))) for i in range(10)
+            ))
+            return batcher, results
+
+        batcher, results = asyncio.run(run())
+
+        assert calls == [20]
+        for i, result in enumerate(results):
+            np.testing.assert_array_equal(result, [2.0 * i, 2.0 * i])
+        stats = batcher.stats()
+        assert stats['batches'] == 1
+        assert stats['requests'] == 10
+        assert stats['mean_batch_fill'] == 0.02
+
+    def test_full_batch_flushes_without_waiting(self):
+        """Reaching max_batch_rows flushes immediately instead of waiting out the window"""
+        calls = []
+
+        def predict(X):
+            calls.append(len(X))
+            return X.sum(axis=1)
+
+        async def run():
+            batcher = MicroBatcher(predict, max_batch_rows=4, max_wait_us=10_000_000)
+            return await asyncio.wait_for(
+                asyncio.gather(*(batcher.predict(np.ones((2, 2))) for _ in range(4))),
+                timeout=1.0
+            )
+
+        asyncio.run(run())
+        assert calls == [4, 4]
+
+    def test_errors_propagate_to_all_waiters(self):
+        """A failing predict call fails every request in the batch"""
+        def predict(X):
+            raise RuntimeError("model exploded")
+
+        async def run():
+            batcher = MicroBatcher(predict, max_batch_rows=100, max_wait_us=100)
+            return await asyncio.gather(
+                batcher.predict(np.ones((1, 2))),
+                batcher.predict(np.ones((1, 2))),
+                return_exceptions=True
+            )
+
+        results = asyncio.run(run())
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+
+class TestInferenceExecutor:
+    """Test suite for running inference off the event loop"""
+
+    def test_thread_pool_predicts(self):
+        """Thread mode returns the same predictions as a direct call"""
+        def predict(X):
+            return X.sum(axis=1)
+
+        async def run():
+            executor = InferenceExecutor(predict, mode='thread', max_workers=1)
+            try:
+                return await executor.predict(np.ones((3, 4)))
+            finally:
+                executor.shutdown()
+
+        np.testing.assert_array_equal(asyncio.run(run()), [4.0, 4.0, 4.0])
+
+    def test_batcher_through_executor(self):
+        """Micro-batches can be dispatched to the executor"""
+        async def run():
+            executor = InferenceExecutor(lambda X: X[:, 0], mode='thread', max_workers=1)
+            batcher = MicroBatcher(lambda X: X[:, 0], max_wait_us=1000, executor=executor)
+            try:
+                return await asyncio.gather(*(
+                    batcher.predict(np.full((1, 2), float(i))) for i in range(5)
+                ))
+            finally:
+                executor.shutdown()
+
+        results = asyncio.run(run())
+        assert [float(r[0]) for r in results] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+    def test_invalid_mode(self):
+        """Unknown modes and process mode without a model path are rejected"""
+        with pytest.raises(ValueError):
+            InferenceExecutor(None, mode='gpu')
+        with pytest.raises(ValueError):
+            InferenceExecutor(None, mode='process')
+
+    def test_loop_monitor_sees_blocking_call(self):
+        """A synchronous call on the loop shows up as a blocking event"""
+        async def run():
+            monitor = LoopBlockMonitor(interval_ms=1.0, threshold_ms=10.0)
+            monitor.start()
+            await asyncio.sleep(0.01)
+            time.sleep(0.05)  # Blocks the loop
+            await asyncio.sleep(0.01)
+            monitor.stop()
+            return monitor.stats()
+
+        stats = asyncio.run(run())
+        assert stats['blocked_events'] >= 1
+        assert stats['lag_ms']['max'] >= 30
+
+
+class TestEtaBundle:
+    """Test suite for the versioned ETA model bundle"""
+
+    @pytest.fixture
+    def trained(self):
+        lgb = pytest.importorskip('lightgbm')
+        rng = np.random.default_rng(7)
+        X = pd.DataFrame(rng.uniform(0, 10, size=(300, 9)), columns=ETA_FEATURE_COLUMNS)
+        y = X['trip_distance'] * 2 + X['hour'] / 5
+        model = lgb.LGBMRegressor(n_estimators=10, verbose=-1).fit(X, y)
+        return model, X
+
+    def test_round_trip(self, trained, tmp_path):
+        """A saved bundle loads, verifies and predicts like the original model"""
+        model, X = trained
+        data_path = tmp_path / 'rides.csv'
+        data_path.write_text('ride_id\nR1\n')
+
+        schema = save_eta_bundle(str(tmp_path / 'bundle'), model, ETA_FEATURE_COLUMNS,
+                                 training_data_path=str(data_path))
+        bundle = load_eta_bundle(str(tmp_path / 'bundle'), expected_columns=ETA_FEATURE_COLUMNS)
+
+        assert bundle.version == schema['model_version']
+        assert bundle.mean is None
+        assert schema['training_data_sha256'] is not None
+        np.testing.assert_allclose(bundle.model.predict(X.values), model.predict(X))
+
+    def test_quantile_models_round_trip(self, trained, tmp_path):
+        """Quantile models are saved, verified and predicted alongside the point model"""
+        lgb = pytest.importorskip('lightgbm')
+        model, X = trained
+        y = model.predict(X)
+        quantiles = {
+            alpha: lgb.LGBMRegressor(objective='quantile', alpha=alpha, n_estimators=5, verbose=-1).fit(X, y)
+            for alpha in (0.9, 0.5)
+        }
+
+        schema = save_eta_bundle(str(tmp_path / 'bundle'), model, ETA_FEATURE_COLUMNS,
+                                 quantile_models=quantiles)
+        bundle = load_eta_bundle(str(tmp_path / 'bundle'))
+
+        assert list(schema['quantiles']) == ['p50', 'p90']
+        assert bundle.output_names == ['duration', 'p50', 'p90']
+        predictions = bundle.predict(X.values)
+        assert predictions.shape == (len(X), 3)
+        np.testing.assert_allclose(predictions[:, 2], quantiles[0.9].predict(X))
+
+        with open(tmp_path / 'bundle' / 'model_p90.txt', 'a') as f:
+            f.write('\n')
+        with pytest.raises(ValueError):
+            load_eta_bundle(str(tmp_path / 'bundle'))
+
+    def test_corrupted_model_rejected(self, trained, tmp_path):
+        """A model file that does not match the recorded hash is rejected"""
+        model, _ = trained
+        bundle_dir = tmp_path / 'bundle'
+        save_eta_bundle(str(bundle_dir), model, ETA_FEATURE_COLUMNS)
+        with open(bundle_dir / 'model.txt', 'a') as f:
+            f.write('\n')
+
+        with pytest.raises(ValueError):
+            load_eta_bundle(str(bundle_dir))
+
+    def test_feature_schema_mismatch_rejected(self, trained, tmp_path):
+        """The API refuses a bundle trained on different columns"""
+        model, _ = trained
+        save_eta_bundle(str(tmp_path / 'bundle'), model, ETA_FEATURE_COLUMNS)
+
+        with pytest.raises(ValueError):
+            load_eta_bundle(str(tmp_path / 'bundle'), expected_columns=ETA_FEATURE_COLUMNS[::-1])
+
+
+class TestPickupEtaModel:
+    """Test suite for the learned pickup ETA model"""
+
+    @staticmethod
+    def _rides(n=4000, seed=0):
+        """Rides where region 1 is twice as slow as region 0 and rush hour halves speed"""
+        rng = np.random.default_rng(seed)
+        region = rng.integers(0, 2, n)
+        hour = rng.integers(0, 24, n)
+        code = rng.integers(0, 3, n)
+        straight_km = rng.uniform(0.5, 8.0, n)
+        speed = 40.0 / (1 + region) / np.where((hour >= 17) & (hour <= 19), 2.0, 1.0)
+        road_km = straight_km * 1.3
+        return straight_km, road_km, road_km / speed * 60, region, hour, code
+
+    def test_learns_region_and_hour_speeds(self):
+        """Without shrinkage, recovers the detour factor and per-region/hour paces exactly"""
+        model = PickupEtaModel.fit(*self._rides(), n_regions=2, n_vehicle_types=3, prior_strength=0.0)
+
+        assert model.detour_factor == pytest.approx(1.3)
+        eta = model.predict(
+            np.array([2.0, 2.0, 2.0]), np.array([0, 1, 0]), np.array([12, 12, 18]), np.array([0, 0, 0])
+        )
+        np.testing.assert_allclose(eta, [2.6 / 40 * 60, 2.6 / 20 * 60, 2.6 / 20 * 60], rtol=1e-6)
+
+    def test_unseen_cells_fall_back_to_hour_pace(self):
+        """A region with no rides uses the (hour, type) pace"""
+        model = PickupEtaModel.fit(*self._rides(), n_regions=3, n_vehicle_types=3)
+        assert np.all(np.isfinite(model.pace))
+        assert np.all(model.pace[2] > model.pace[0])  # Between the fast and slow regions
+        assert np.all(model.pace[2] < model.pace[1])
+
+    def test_save_load_roundtrip(self, tmp_path):
+        """Saved model predicts identically after loading"""
+        model = PickupEtaModel.fit(*self._rides(n=500), n_regions=2, n_vehicle_types=3)
+        path = str(tmp_path / 'pickup_eta.npz')
+        model.save(path)
+        loaded = PickupEtaModel.load(path)
+
+        np.testing.assert_array_equal(loaded.pace, model.pace)
+        assert loaded.detour_factor == model.detour_factor
+        assert loaded.meta['n_rides'] == 500
+
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, "-v"])
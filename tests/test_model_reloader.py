@@ -0,0 +1,116 @@
+"""
+Unit Tests for Model Hot Reload
+
+Tests canary batch construction and checks, the file watcher's settle
+logic and retiring a swapped-out model set.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+import time
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.inference.executor import InferenceExecutor
+from src.inference.feature_builder import EtaFeatureBuilder
+from src.services.model_reloader import ModelSet, ModelFileWatcher, build_canary_batch, check_canary
+
+
+class TestCanary:
+    """Test suite for canary validation of candidate models"""
+
+    def test_canary_batch_covers_all_types(self):
+        """Canary rows span every distance/hour/day/vehicle combination"""
+        features = build_canary_batch(EtaFeatureBuilder(), n_vehicle_types=3)
+        assert features.shape == (5 * 24 * 2 * 3, 9)
+        assert np.all(np.isfinite(features))
+
+    def test_valid_predictions_pass(self):
+        """Plausible predictions produce a report with the change vs. current"""
+        report = check_canary(np.array([5.0, 10.0]), reference=np.array([4.0, 10.0]))
+        assert report['rows'] == 2
+        assert report['mean_abs_change_vs_current'] == pytest.approx(0.5)
+
+    def test_quantile_outputs_reported(self):
+        """Multi-output canaries compare point estimates and report quantile crossing"""
+        predictions = np.array([[5.0, 5.0, 6.0], [7.0, 8.0, 7.5]])
+        report = check_canary(predictions, reference=np.array([5.0, 6.0]))
+        assert report['quantile_crossing_rate'] == pytest.approx(0.5)
+        assert report['mean_abs_change_vs_current'] == pytest.approx(0.5)
+
+    @pytest.mark.parametrize("predictions", [
+        [5.0, np.nan], [5.0, np.inf], [5.0, -1.0], [5.0, 0.0], [5.0, 10000.0]
+    ])
+    def test_invalid_predictions_rejected(self, predictions):
+        """NaN/inf, non-positive and implausibly long durations are rejected"""
+        with pytest.raises(ValueError):
+            check_canary(np.array(predictions))
+
+
+class TestModelFileWatcher:
+    """Test suite for the model file watcher"""
+
+    def test_change_triggers_reload_once(self, tmp_path):
+        """A settled change calls on_change exactly once"""
+        model_file = tmp_path / 'model.txt'
+        model_file.write_text('v1')
+        calls = []
+
+        async def on_change():
+            calls.append(time.perf_counter())
+
+        async def run():
+            watcher = ModelFileWatcher([str(tmp_path)], on_change, interval_s=0.01)
+            watcher.start()
+            await asyncio.sleep(0.03)
+            model_file.write_text('version 2')
+            await asyncio.sleep(0.1)
+            watcher.stop()
+
+        asyncio.run(run())
+        assert len(calls) == 1
+
+    def test_no_change_no_reload(self, tmp_path):
+        """Unchanged files never trigger a reload"""
+        (tmp_path / 'model.txt').write_text('v1')
+        calls = []
+
+        async def on_change():
+            calls.append(1)
+
+        async def run():
+            watcher = ModelFileWatcher([str(tmp_path)], on_change, interval_s=0.01)
+            watcher.start()
+            await asyncio.sleep(0.05)
+            watcher.stop()
+
+        asyncio.run(run())
+        assert calls == []
+
+
+class TestModelSetRetire:
+    """Test suite for retiring a swapped-out model set"""
+
+    def test_in_flight_predictions_finish_on_old_model(self):
+        """Work submitted before retire completes; later calls run inline"""
+        def slow_predict(features):
+            time.sleep(0.05)
+            return np.full(len(features), 1.0)
+
+        old = ModelSet(eta_executor=InferenceExecutor(slow_predict, mode='thread', max_workers=1))
+
+        async def run():
+            in_flight = asyncio.ensure_future(old.eta_executor.predict(np.ones((2, 9))))
+            await asyncio.sleep(0)
+            old.retire()
+            after = await old.eta_executor.predict(np.ones((1, 9)))
+            return await in_flight, after
+
+        in_flight, after = asyncio.run(run())
+        np.testing.assert_array_equal(in_flight, [1.0, 1.0])
+        np.testing.assert_array_equal(after, [1.0])
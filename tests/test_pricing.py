@@ -8,6 +8,8 @@ import pytest
 import sys
 import os
 
+import numpy as np
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
@@ -15,9 +17,17 @@ from src.pricing.dynamic_pricing import (
     get_surge_multiplier,
     calculate_demand_supply_ratio,
     calculate_fare,
-    get_surge_with_fallback
+    calculate_fares,
+    fare_breakdown,
+    get_surge_with_fallback,
+    get_region_id,
+    get_region_index,
+    get_region_ids,
+    format_region_id,
+    get_demand_score
 )
-from config import SURGE_CAP, SURGE_MULTIPLIERS
+from src.pricing.demand_table import DemandTable
+from config import SURGE_CAP, SURGE_MULTIPLIERS, VEHICLE_TYPE_CODES
 
 
 class TestSurgePricing:
@@ -81,11 +91,12 @@ class TestSurgePricing:
     def test_demand_supply_ratio_calculation(self):
         """Test demand-supply ratio calculation"""
         # Mock demand data (simplified)
-        demand_data = {
-            ('2_3', 8): {'demand_score': 0.8}  # High demand region
-        }
+        demand_data = DemandTable.from_records(
+            [{'region_id': '2_3', 'hour': 8, 'demand_score': 0.8}],  # High demand region
+            grid_size=5
+        )
         
-        ratio = calculate_demand_supply_ratio('2_3', 8, 5, demand_data)
+        ratio = calculate_demand_supply_ratio(13, 8, 5, demand_data)
         
         # Demand score 0.8 → ~40 rides, 5 cars → ratio = 8.0
         assert ratio > 0, "Ratio should be positive"
@@ -94,7 +105,7 @@ class TestSurgePricing:
     def test_zero_vehicles_handling(self):
         """Test handling of zero available vehicles"""
         # Should not crash, should use minimum 1 vehicle
-        ratio = calculate_demand_supply_ratio('2_3', 8, 0, None)
+        ratio = calculate_demand_supply_ratio(13, 8, 0, None)
         assert ratio >= 0, "Should handle zero vehicles gracefully"
 
 
@@ -148,12 +159,34 @@ class TestFareCalculation:
             calculate_fare(5.0, 15.0, 'invalid_type', 1.0)
 
 
+class TestVectorizedFares:
+    """Test suite for batch fare calculation"""
+    
+    def test_matches_scalar(self):
+        """Every row equals calculate_fare for that candidate"""
+        types = ['economy', 'suv', 'sedan', 'economy']
+        durations = [15.0, 22.5, 9.3, 40.1]
+        fares = calculate_fares(7.3, durations, [VEHICLE_TYPE_CODES[t] for t in types], 1.3)
+        
+        for i, (vehicle_type, duration) in enumerate(zip(types, durations)):
+            assert fare_breakdown(fares, i) == pytest.approx(calculate_fare(7.3, duration, vehicle_type, 1.3))
+    
+    def test_columnar_output(self):
+        fares = calculate_fares(5.0, np.full(3, 15.0), np.zeros(3, dtype=int), 1.0)
+        assert all(len(column) == 3 for column in fares.values())
+        assert fares['surge_multiplier'].tolist() == [1.0, 1.0, 1.0]
+    
+    def test_invalid_type_code(self):
+        with pytest.raises(ValueError):
+            calculate_fares(5.0, [15.0], [len(VEHICLE_TYPE_CODES)], 1.0)
+
+
 class TestFallbackLogic:
     """Test suite for fallback logic"""
     
     def test_fallback_with_no_data(self):
         """Test fallback when no demand data available"""
-        surge, reason = get_surge_with_fallback('0_0', 8, 5, None, default_surge=1.0)
+        surge, reason = get_surge_with_fallback(0, 8, 5, None, default_surge=1.0)
         
         # Should use default or calculated value
         assert surge > 0, "Should return valid surge"
@@ -161,12 +194,104 @@ class TestFallbackLogic:
     
     def test_fallback_returns_valid_surge(self):
         """Test that fallback always returns valid surge"""
-        surge, reason = get_surge_with_fallback('999_999', 99, 5, None)
+        surge, reason = get_surge_with_fallback(999, 99, 5, None)
         
         assert 0.9 <= surge <= SURGE_CAP, \
             f"Fallback surge {surge}× should be within valid range"
 
 
+class TestRegionLookup:
+    """Test suite for region lookup"""
+    
+    def test_vectorized_matches_scalar(self):
+        """Integer indices agree with the string region IDs, including clamped points"""
+        lats = [13.2900, 13.3467, 13.3899, 13.2000, 13.5000]
+        lons = [74.6900, 74.7926, 74.7042, 74.6000, 74.9000]
+        
+        indices = get_region_ids(lats, lons, grid_size=5)
+        
+        for lat, lon, index in zip(lats, lons, indices):
+            assert index == get_region_index(lat, lon, grid_size=5)
+            lat_idx, lon_idx = map(int, get_region_id(lat, lon, grid_size=5).split('_'))
+            assert index == lat_idx * 5 + lon_idx
+    
+    def test_format_region_id(self):
+        """Integer indices map back to lat_idx_lon_idx strings"""
+        assert format_region_id(13, grid_size=5) == '2_3'
+        assert format_region_id(0, grid_size=5) == '0_0'
+
+
+class TestDemandTable:
+    """Test suite for the dense demand table"""
+    
+    def test_every_hour_kept(self):
+        """Records for several hours of one region all land in the table"""
+        table = DemandTable.from_records([
+            {'region_id': '2_3', 'hour': 8, 'demand_score': 0.9},
+            {'region_id': '2_3', 'hour': 2, 'demand_score': 0.1}
+        ], grid_size=5)
+        
+        assert table.scores.shape == (25, 24, 7)
+        assert get_demand_score(13, 8, table) == pytest.approx(0.9)
+        assert get_demand_score(13, 2, table, day_of_week=6) == pytest.approx(0.1)
+        assert get_demand_score(13, 12, table) == pytest.approx(0.5)
+    
+    def test_vectorized_lookup(self):
+        """Arrays of regions and hours are scored in one lookup"""
+        table = DemandTable.from_records([
+            {'region_id': '0_1', 'hour': 9, 'demand_score': 0.7}
+        ], grid_size=5)
+        
+        scores = table.score(np.array([1, 1, 2]), np.array([9, 10, 9]))
+        np.testing.assert_allclose(scores, [0.7, 0.5, 0.5])
+    
+    def test_invalid_shape_rejected(self):
+        with pytest.raises(ValueError):
+            DemandTable(np.zeros((25, 24)))
+    
+    def test_from_rides_separates_weekends(self):
+        """Weekday and weekend demand are estimated per day of that type"""
+        # Monday 2024-01-01 and Saturday 2024-01-06: region 3 busy on the weekday only
+        region = np.array([3, 3, 3, 3, 7])
+        hour = np.array([8, 8, 8, 8, 8])
+        day_of_week = np.array([0, 0, 0, 0, 5])
+        date = np.array(['2024-01-01'] * 4 + ['2024-01-06'])
+        
+        table = DemandTable.from_rides(region, hour, day_of_week, date, n_regions=25)
+        
+        assert table.score(3, 8, 0) == pytest.approx(1.0)
+        assert table.score(3, 8, 4) == pytest.approx(1.0)  # every weekday
+        assert table.score(3, 8, 6) == pytest.approx(0.0)
+        assert table.score(7, 8, 5) == pytest.approx(0.25)
+        assert table.tier(3, 8, 0) == 3  # high
+        assert table.rides[3, 8, 0] == 4
+    
+    def test_save_load_memory_mapped(self, tmp_path):
+        """A saved table loads memory-mapped with identical slots"""
+        table = DemandTable.from_records(
+            [{'region_id': '1_1', 'hour': 18, 'demand_score': 0.8, 'demand_count': 12}], grid_size=5
+        )
+        path = str(tmp_path / 'demand_table.npy')
+        table.save(path)
+        
+        loaded = DemandTable.load(path)
+        assert isinstance(loaded.slots, np.memmap)
+        np.testing.assert_array_equal(loaded.slots, table.slots)
+        assert loaded.tier(6, 18) == 2  # moderate
+    
+    def test_validate_coverage_and_grid(self):
+        """Coverage is reported; a table for another grid is rejected"""
+        table = DemandTable.from_records(
+            [{'region_id': '0_0', 'hour': h, 'demand_score': 0.5} for h in range(24)], grid_size=2
+        )
+        coverage = table.validate(n_regions=4)
+        assert coverage['slot_coverage'] == pytest.approx(0.25)
+        assert coverage['regions_without_data'] == [1, 2, 3]
+        
+        with pytest.raises(ValueError):
+            table.validate(n_regions=25)
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
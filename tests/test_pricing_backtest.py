@@ -0,0 +1,115 @@
+"""
+Unit Tests for the Pricing Backtest
+
+Tests that the vectorized replay matches per-ride pricing and that chunking
+and worker processes do not change the results.
+"""
+
+import pytest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.evaluation.pricing_backtest import (
+    current_parameters,
+    parameter_grid,
+    run_backtest,
+    summarize_backtest,
+    backtest_by_region_hour
+)
+from src.pricing.demand_table import DemandTable
+from src.pricing.dynamic_pricing import (
+    calculate_demand_supply_ratio,
+    calculate_fare,
+    get_region_index,
+    get_surge_multiplier
+)
+
+
+@pytest.fixture
+def rides():
+    # Four rides in region "2_2" at 08:xx on one day, one in "0_0" at 08:xx, one in "2_2" at 09:xx
+    return pd.DataFrame({
+        'timestamp': ['2024-01-15 08:01:00', '2024-01-15 08:20:00', '2024-01-15 08:40:00',
+                      '2024-01-15 08:59:00', '2024-01-15 08:30:00', '2024-01-15 09:10:00'],
+        'origin_lat': [13.345, 13.346, 13.347, 13.345, 13.291, 13.345],
+        'origin_lon': [74.745, 74.746, 74.747, 74.745, 74.691, 74.745],
+        'vehicle_type': ['economy', 'sedan', 'suv', 'economy', 'sedan', 'economy'],
+        'trip_distance': [5.0, 3.2, 7.5, 1.1, 4.0, 2.0],
+        'trip_duration': [15.0, 10.0, 22.0, 5.0, 12.0, 8.0]
+    })
+
+
+class TestPricingBacktest:
+    """Test suite for the vectorized pricing replay"""
+
+    def test_matches_per_ride_pricing(self, rides):
+        """Revenue under the current config equals pricing each ride with its hourly demand"""
+        result = run_backtest(rides, [current_parameters()], supply_per_region=2.0, n_workers=1)
+
+        hourly_rides = [4, 4, 4, 4, 1, 1]
+        expected = sum(
+            calculate_fare(ride.trip_distance, ride.trip_duration, ride.vehicle_type, 1.0)['subtotal']
+            * get_surge_multiplier(count / 2.0)
+            for ride, count in zip(rides.itertuples(), hourly_rides)
+        )
+        assert result['revenue'][0].sum() == pytest.approx(expected)
+        assert result['rides'].sum() == 6
+
+    def test_chunks_and_workers_agree(self, rides):
+        param_sets = parameter_grid((0.8, 1.0), (1.0, 1.5), (1.5,))
+        single = run_backtest(rides, param_sets, n_workers=1)
+        parallel = run_backtest(rides, param_sets, chunksize=2, n_workers=2)
+
+        for name in ('revenue', 'surge_sum', 'tier_counts'):
+            np.testing.assert_allclose(parallel[name], single[name])
+
+    def test_reports(self, rides):
+        result = run_backtest(rides, parameter_grid(caps=(1.2, 1.5)), n_workers=1)
+        summary = summarize_backtest(result)
+        by_slot = backtest_by_region_hour(result)
+
+        assert len(summary) == 2
+        assert summary.loc[0, 'revenue'] <= summary.loc[1, 'revenue']  # lower cap, less revenue
+        assert set(by_slot['region_id']) == {'2_2', '0_0'}
+        shares = by_slot[['discount_share', 'normal_share', 'moderate_share', 'high_share']].sum(axis=1)
+        np.testing.assert_allclose(shares, 1.0)
+
+    def test_demand_table_matches_served_pricing(self, rides):
+        """With a demand table, each ride is priced like a live quote for its slot"""
+        demand = DemandTable.from_records(
+            [{'region_id': '2_2', 'hour': 8, 'demand_score': 0.9},
+             {'region_id': '2_2', 'hour': 9, 'demand_score': 0.05},
+             {'region_id': '0_0', 'hour': 8, 'demand_score': 0.3}],
+            grid_size=5
+        )
+        result = run_backtest(rides, [current_parameters()], supply_per_region=2.0, n_workers=1,
+                              demand_table=demand)
+
+        expected = sum(
+            calculate_fare(ride.trip_distance, ride.trip_duration, ride.vehicle_type, 1.0)['subtotal']
+            * get_surge_multiplier(calculate_demand_supply_ratio(
+                get_region_index(ride.origin_lat, ride.origin_lon), int(ride.timestamp[11:13]), 2.0, demand, 0
+            ))
+            for ride in rides.itertuples()
+        )
+        assert result['demand_source'] == 'demand_table'
+        assert result['revenue'][0].sum() == pytest.approx(expected)
+
+    def test_unknown_vehicle_types_skipped(self, rides):
+        rides.loc[[1, 4], 'vehicle_type'] = ['scooter', None]
+        result = run_backtest(rides, [current_parameters()], n_workers=1)
+
+        assert result['skipped_rides'] == 2
+        assert result['rides'].sum() == 4
+
+    def test_invalid_supply(self, rides):
+        with pytest.raises(ValueError):
+            run_backtest(rides, [current_parameters()], supply_per_region=0)
+        with pytest.raises(ValueError):
+            run_backtest(rides, [current_parameters()], demand_table=DemandTable.from_records([], grid_size=3))
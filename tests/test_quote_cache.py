@@ -0,0 +1,115 @@
+"""
+Unit Tests for Quote Caching
+
+Tests the quote cache (mode keys, surge version invalidation, LRU eviction,
+hit-rate counters) and signed quote tokens.
+"""
+
+import pytest
+import sys
+import os
+import json
+from datetime import datetime
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.quote_cache import QuoteCache, QuoteSigner, _b64encode
+from src.services.surge_engine import SurgeEngine
+
+
+def key(cache, user_mode='balanced', surge=1.0, pickup=(13.35, 74.70)):
+    return cache.make_key(*pickup, 13.34, 74.79, user_mode, 8, 0, surge)
+
+
+class TestQuoteCache:
+    """Test suite for the quote cache"""
+
+    def test_hit_under_same_surge_version(self):
+        cache = QuoteCache()
+        cache.put(key(cache), 3, 'quote')
+        assert cache.get(key(cache, pickup=(13.35002, 74.70001)), 3) == 'quote'
+        assert cache.get(key(cache, user_mode='fastest'), 3) is None
+
+    def test_surge_version_change_invalidates(self):
+        """An entry quoted under an older surge version is dropped, not served"""
+        cache = QuoteCache()
+        cache.put(key(cache), 3, 'quote')
+        assert cache.get(key(cache), 4) is None
+        assert cache.get(key(cache), 3) is None  # entry is gone
+        assert cache.stats()['invalidations'] == 1
+
+    def test_lru_eviction_and_hit_rate(self):
+        cache = QuoteCache(max_size=2)
+        for mode in ('fastest', 'cheapest', 'balanced'):
+            cache.put(key(cache, user_mode=mode), 1, mode)
+        assert cache.get(key(cache, user_mode='fastest'), 1) is None
+        assert cache.get(key(cache, user_mode='balanced'), 1) == 'balanced'
+
+        stats = cache.stats()
+        assert (stats['size'], stats['evictions'], stats['hit_rate']) == (2, 1, 0.5)
+
+    def test_expiry(self):
+        cache = QuoteCache(ttl_seconds=0.0)
+        cache.put(key(cache), 1, 'quote')
+        assert cache.get(key(cache), 1) is None
+        assert cache.stats()['expirations'] == 1
+
+
+class TestQuoteTokens:
+    """Test suite for signed quote tokens"""
+
+    def test_round_trip(self):
+        signer = QuoteSigner(secret=b'test-secret', ttl_seconds=60)
+        token, expires_at = signer.issue({'fares': {'v1': 123.45}}, now=1000.0)
+        payload = signer.verify(token, now=1030.0)
+        assert payload['fares'] == {'v1': 123.45}
+        assert expires_at == payload['expires_at'] == 1060.0
+
+    def test_tampered_token_rejected(self):
+        signer = QuoteSigner(secret=b'test-secret')
+        token, _ = signer.issue({'fares': {'v1': 123.45}})
+        forged, _ = QuoteSigner(secret=b'other-secret').issue({'fares': {'v1': 1.0}})
+        with pytest.raises(ValueError):
+            signer.verify(forged.split('.')[0] + '.' + token.split('.')[1])
+        with pytest.raises(ValueError):
+            signer.verify('not-a-token')
+
+    def test_malformed_tokens_raise_value_error(self):
+        """Anything that is not a well-formed signed quote fails with ValueError"""
+        signer = QuoteSigner(secret=b'test-secret')
+        bodies = [
+            _b64encode(json.dumps({'fares': {'v1': 1.0}}).encode()),   # no expires_at
+            _b64encode(json.dumps({'expires_at': 2e9}).encode()),      # no fares
+            _b64encode(json.dumps([1, 2]).encode()),                   # not an object
+            _b64encode(b'not json'),
+            'a',                                                       # bad base64
+        ]
+        for body in bodies:
+            with pytest.raises(ValueError):
+                signer.verify(f"{body}.{signer._sign(body)}")
+        with pytest.raises(ValueError):
+            signer.verify('\u00e9.x')
+
+    def test_expired_token_rejected(self):
+        signer = QuoteSigner(secret=b'test-secret', ttl_seconds=60)
+        token, _ = signer.issue({'fares': {}}, now=1000.0)
+        with pytest.raises(ValueError):
+            signer.verify(token, now=1061.0)
+
+
+class TestCellSurgeVersions:
+    """Test suite for per-cell surge versions used to invalidate quotes"""
+
+    def test_version_moves_only_when_multiplier_changes(self):
+        fleet = [{'location': {'lat': 13.345, 'lon': 74.745}, 'status': 'available'}] * 30
+        engine = SurgeEngine(lambda: None, lambda: fleet)
+        first = engine.recompute(datetime(2024, 1, 15, 8))
+        second = engine.recompute(datetime(2024, 1, 15, 8))
+        assert second.cell_versions.tolist() == first.cell_versions.tolist()
+
+        fleet.clear()
+        third = engine.recompute(datetime(2024, 1, 15, 8))
+        busy_cell = engine.supply_grid.cell_ids([13.345], [74.745])[0]
+        assert third.cell_versions[busy_cell] == third.version  # cars around "2_2" left
+        assert third.cell_versions[0] == first.version  # still no cars near "0_0"
@@ -8,15 +8,20 @@ import pytest
 import sys
 import os
 
+import numpy as np
+
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.ranking.vehicle_ranker import (
     normalize_scores,
     calculate_vehicle_score,
-    rank_vehicles
+    rank_vehicles,
+    rank_candidates,
+    rank_candidates_by_mode,
+    top_k_indices
 )
-from config import USER_MODE_WEIGHTS
+from config import USER_MODE_WEIGHTS, VEHICLE_TYPE_CODES
 
 
 class TestScoreNormalization:
@@ -216,6 +221,99 @@ class TestVehicleRanking:
             "Different modes should produce different rankings"
 
 
+def reference_ranking(vehicles, user_mode, top_k):
+    """Per-vehicle scoring and a full stable sort (the ranking rank_vehicles must match)"""
+    comfort = [v.get('comfort_score', {'economy': 1, 'sedan': 2, 'suv': 3}[v['vehicle_type']]) for v in vehicles]
+    normalized = zip(
+        normalize_scores([v['eta_pickup'] for v in vehicles]),
+        normalize_scores([v['trip_cost'] for v in vehicles]),
+        normalize_scores(comfort, lower_is_better=False)
+    )
+    scored = [
+        (v['id'], calculate_vehicle_score({
+            'eta_score_normalized': eta, 'cost_score_normalized': cost, 'comfort_score_normalized': comf
+        }, user_mode))
+        for v, (eta, cost, comf) in zip(vehicles, normalized)
+    ]
+    return sorted(scored, key=lambda item: item[1], reverse=True)[:top_k]
+
+
+class TestVectorizedRanking:
+    """Test suite for the NumPy ranking path"""
+    
+    @pytest.mark.parametrize('user_mode', ['fastest', 'cheapest', 'balanced'])
+    def test_matches_reference_ranking(self, user_mode):
+        rng = np.random.default_rng(0)
+        types = ['economy', 'sedan', 'suv']
+        vehicles = [
+            {'id': f'CAR{i:03d}', 'eta_pickup': float(rng.integers(1, 8)),
+             'trip_cost': float(rng.choice([120.0, 150.0, 200.0])), 'vehicle_type': types[i % 3]}
+            for i in range(60)
+        ]  # few distinct values, so many exact score ties
+        
+        for k in (1, 5, 10, 60, 100):
+            expected = reference_ranking(vehicles, user_mode, k)
+            ranked = rank_vehicles([dict(v) for v in vehicles], user_mode=user_mode, top_k=k)
+            assert [v['id'] for v in ranked] == [vid for vid, _ in expected]
+            np.testing.assert_allclose([v['final_score'] for v in ranked], [score for _, score in expected])
+    
+    def test_top_k_ties_by_index(self):
+        scores = np.array([0.5, 0.9, 0.5, 0.9, 0.1, 0.5])
+        assert top_k_indices(scores, 4).tolist() == [1, 3, 0, 2]
+        assert top_k_indices(scores, 10).tolist() == [1, 3, 0, 2, 5, 4]
+        assert top_k_indices(scores, 0).tolist() == []
+    
+    def test_rank_vehicles_does_not_modify_input(self):
+        vehicles = [
+            {'id': 'CAR001', 'eta_pickup': 2.0, 'trip_cost': 25.0, 'vehicle_type': 'suv'},
+            {'id': 'CAR002', 'eta_pickup': 8.0, 'trip_cost': 10.0, 'vehicle_type': 'economy'},
+        ]
+        before = [dict(v) for v in vehicles]
+        ranked = rank_vehicles(vehicles, user_mode='fastest')
+        
+        assert vehicles == before
+        assert all(r is not v for r in ranked for v in vehicles)
+    
+    @pytest.mark.parametrize('user_mode', ['fastest', 'cheapest', 'balanced'])
+    def test_columnar_matches_dicts(self, user_mode):
+        rng = np.random.default_rng(1)
+        eta = rng.integers(1, 10, 40).astype(float)
+        cost = rng.choice([90.0, 120.0, 180.0], 40)
+        codes = rng.integers(0, 3, 40)
+        types = sorted(VEHICLE_TYPE_CODES, key=VEHICLE_TYPE_CODES.get)
+        vehicles = [
+            {'id': i, 'eta_pickup': e, 'trip_cost': c, 'vehicle_type': types[t]}
+            for i, (e, c, t) in enumerate(zip(eta.tolist(), cost.tolist(), codes.tolist()))
+        ]
+        
+        indices, scores = rank_candidates(eta, cost, codes, user_mode=user_mode, top_k=10)
+        ranked = rank_vehicles(vehicles, user_mode=user_mode, top_k=10)
+        
+        assert indices.tolist() == [v['id'] for v in ranked]
+        np.testing.assert_array_equal(scores, [v['final_score'] for v in ranked])
+    
+    def test_columnar_edge_cases(self):
+        indices, scores = rank_candidates([], [], [])
+        assert len(indices) == 0 and len(scores) == 0
+        with pytest.raises(ValueError):
+            rank_candidates([1.0], [10.0], [7])
+    
+    def test_all_modes_match_single_mode(self):
+        """Ranking every mode in one product gives each mode's own ranking"""
+        rng = np.random.default_rng(2)
+        eta = rng.integers(1, 10, 50).astype(float)
+        cost = rng.choice([90.0, 120.0, 180.0], 50)
+        codes = rng.integers(0, 3, 50)
+        
+        rankings = rank_candidates_by_mode(eta, cost, codes, top_k=10)
+        
+        assert list(rankings) == list(USER_MODE_WEIGHTS)
+        for mode, (indices, scores) in rankings.items():
+            single_indices, single_scores = rank_candidates(eta, cost, codes, user_mode=mode, top_k=10)
+            assert indices.tolist() == single_indices.tolist()
+            np.testing.assert_array_equal(scores, single_scores)
+
+
 if __name__ == "__main__":
     # Run tests
     pytest.main([__file__, "-v"])
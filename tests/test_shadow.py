@@ -0,0 +1,151 @@
+"""
+Unit Tests for Shadow Evaluation
+
+Tests sampling and logging of challenger predictions off the request path,
+the latency histogram and reports built from the shadow log.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.inference.feature_builder import EtaFeatureBuilder
+from src.services.shadow_evaluator import LatencyHistogram, ShadowModel, ShadowEvaluator
+from src.evaluation.shadow_report import load_shadow_log, build_shadow_report
+
+
+def make_model(version, offset):
+    """Model predicting distance-column + offset (point column first, like a stacked forest)"""
+    def predict(features):
+        point = features[:, 0] + offset
+        return np.column_stack([point, point, point + 1])
+    return ShadowModel(version, EtaFeatureBuilder(), predict)
+
+
+def served(*vehicle_types, duration=10.0):
+    return {t: {'duration': duration, 'p50': duration, 'p90': duration + 1} for t in vehicle_types}
+
+
+async def drain(evaluator):
+    for _ in range(100):
+        await asyncio.sleep(0.01)
+        if evaluator.evaluated + evaluator.errors >= evaluator.sampled - evaluator.dropped:
+            return
+
+
+class TestLatencyHistogram:
+    """Test suite for the latency histogram"""
+
+    def test_percentiles_from_buckets(self):
+        """Percentiles report the upper bound of the bucket they fall in"""
+        histogram = LatencyHistogram(np.array([1.0, 10.0, 100.0]))
+        for latency in [0.5, 0.5, 0.5, 50.0]:
+            histogram.record(latency)
+        assert histogram.count == 4
+        assert histogram.percentile(50) == 1.0
+        assert histogram.percentile(99) == 100.0
+
+    def test_overflow_bucket(self):
+        """Latencies above the last bound are counted, not dropped"""
+        histogram = LatencyHistogram(np.array([1.0]))
+        histogram.record(5.0)
+        assert histogram.counts.tolist() == [0, 1]
+
+
+class TestShadowEvaluator:
+    """Test suite for the shadow evaluator"""
+
+    def test_sampled_quotes_logged_with_deltas(self, tmp_path):
+        """Challenger predictions are logged next to the served ones"""
+        log_path = str(tmp_path / 'shadow.jsonl')
+        evaluator = ShadowEvaluator(make_model('1', 0.0), make_model('2', 1.5),
+                                    sample_rate=1.0, log_path=log_path)
+
+        async def run():
+            assert evaluator.submit('REQ_1', 5.0, 8, 0, served('economy', 'suv'))
+            await drain(evaluator)
+            evaluator.stop()
+
+        asyncio.run(run())
+        log_df = load_shadow_log(log_path)
+        assert list(log_df['vehicle_type']) == ['economy', 'suv']
+        assert list(log_df['champion']) == [10.0, 10.0]
+        assert evaluator.stats()['evaluated'] == 1
+        assert evaluator.latency['challenger'].count == 1
+        # Challenger sees standardized distance + 1.5, champion was served 10.0
+        np.testing.assert_allclose(log_df['delta'], log_df['challenger'] - 10.0)
+
+    def test_unsampled_quotes_skipped(self, tmp_path):
+        """With sample_rate 0 nothing is queued or written"""
+        log_path = tmp_path / 'shadow.jsonl'
+        evaluator = ShadowEvaluator(make_model('1', 0.0), make_model('2', 0.0),
+                                    sample_rate=0.0, log_path=str(log_path))
+        assert not evaluator.submit('REQ_1', 5.0, 8, 0, served('economy'))
+        assert evaluator.sampled == 0
+        assert not log_path.exists()
+
+    def test_full_queue_drops(self):
+        """Quotes beyond the queue bound are dropped instead of blocking"""
+        evaluator = ShadowEvaluator(make_model('1', 0.0), make_model('2', 0.0),
+                                    sample_rate=1.0, log_path=None, max_queue=1)
+
+        async def run():
+            results = [evaluator.submit(f'REQ_{i}', 5.0, 8, 0, served('sedan')) for i in range(3)]
+            evaluator.stop()
+            return results
+
+        assert asyncio.run(run()) == [True, False, False]
+        assert evaluator.dropped == 2
+
+
+class TestShadowReport:
+    """Test suite for shadow log reports"""
+
+    @pytest.fixture
+    def log_df(self):
+        return pd.DataFrame({
+            'request_id': ['A', 'A', 'B', 'C'],
+            'vehicle_type': ['economy', 'suv', 'economy', 'sedan'],
+            'champion': [10.0, 12.0, 20.0, 30.0],
+            'challenger': [11.0, 12.0, 19.0, 33.0],
+            'delta': [1.0, 0.0, -1.0, 3.0],
+            'champion_latency_ms': [0.1, 0.1, 0.2, 0.3],
+            'challenger_latency_ms': [0.2, 0.2, 0.4, 0.6],
+            'champion_version': '1',
+            'challenger_version': '2',
+            'distance': [3.0, 3.0, 6.0, 9.0],
+            'hour': 8,
+            'day_of_week': 0
+        })
+
+    def test_agreement_and_latency(self, log_df):
+        """Report counts quotes once for latency and every row for deltas"""
+        report = build_shadow_report(log_df)
+        assert report['quotes'] == 3
+        assert report['predictions'] == 4
+        assert report['agreement']['mae'] == pytest.approx(1.25)
+        assert report['delta']['by_vehicle_type']['economy'] == pytest.approx(0.0)
+        assert report['latency']['challenger']['mean_ms'] == pytest.approx(0.4)
+
+    def test_accuracy_against_actuals(self, log_df):
+        """Joined completed trips score both models and pick the better one"""
+        actuals = pd.DataFrame({
+            'request_id': ['A', 'B', 'C'],
+            'vehicle_type': ['economy', 'economy', 'sedan'],
+            'actual_duration': [11.0, 19.0, 33.0]
+        })
+        report = build_shadow_report(log_df, actuals)
+        assert report['completed_trips'] == 3
+        assert report['accuracy']['challenger']['mae'] == pytest.approx(0.0)
+        assert report['better_model'] == 'challenger'
+
+    def test_empty_log_rejected(self):
+        with pytest.raises(ValueError):
+            build_shadow_report(pd.DataFrame())
@@ -0,0 +1,90 @@
+"""
+Unit Tests for Neighbor-Aware Supply
+
+Tests the distance-weighted supply around a pickup computed from the
+summed-area table of vehicle counts on the fine supply grid.
+"""
+
+import pytest
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pricing.dynamic_pricing import get_region_index
+from src.pricing.supply import SupplyGrid
+from src.services.surge_engine import SurgeEngine
+
+CELL_DEG = 0.1 / 25  # Fine cell size on the default grid
+
+
+def cell_center(row, col):
+    return 13.29 + (row + 0.5) * CELL_DEG, 74.69 + (col + 0.5) * CELL_DEG
+
+
+def cell_of(grid, row, col):
+    lat, lon = cell_center(row, col)
+    return grid.cell_ids([lat], [lon])[0]
+
+
+class TestSupplyGrid:
+    """Test suite for the summed-area supply estimate"""
+
+    def test_matches_brute_force(self):
+        """Window sums from the prefix table equal an explicit distance-weighted count"""
+        grid = SupplyGrid()
+        rng = np.random.default_rng(0)
+        counts = rng.integers(0, 4, size=grid.n_cells)
+        table = grid.summed_area_from_counts(counts)
+
+        rows, cols = np.divmod(np.arange(grid.n_cells), grid.size)
+        for cell in [0, 12, 312, grid.n_cells - 1]:
+            ring = np.maximum(abs(rows - rows[cell]), abs(cols - cols[cell]))
+            weights = np.where(ring < 3, np.array([1.0, 0.75, 0.5, 0.0])[np.minimum(ring, 3)], 0.0)
+            expected = (weights * counts).sum() / weights.sum() * 25
+            assert grid.supply_at(table, cell) == pytest.approx(expected)
+
+    def test_uniform_fleet_equals_region_count(self):
+        """With one car per fine cell every location (edges included) sees 25 cars per region"""
+        grid = SupplyGrid()
+        table = grid.summed_area_from_counts(np.ones(grid.n_cells))
+        np.testing.assert_allclose(grid.supply_at(table, np.arange(grid.n_cells)), 25.0)
+
+    def test_counts_cars_across_region_boundary(self):
+        """A pickup at a region's edge sees the cars just across it; one at the far side does not"""
+        grid = SupplyGrid()
+        # Region (2, 2) spans fine rows/cols 10-14; cars just across its right edge in (2, 3)
+        lats, lons = zip(*[cell_center(12, 15)] * 4)
+        table = grid.summed_area(lats, lons)
+
+        near_edge = cell_of(grid, 12, 14)
+        far_side = cell_of(grid, 12, 10)
+        assert get_region_index(*cell_center(12, 14)) != get_region_index(*cell_center(12, 15))
+        assert grid.supply_at(table, near_edge) > 0
+        assert grid.supply_at(table, far_side) == 0
+
+    def test_snapshot_lookup_uses_pickup_cell(self):
+        """Quotes read surge from the supply around their own pickup"""
+        fleet = [{'location': dict(zip(('lat', 'lon'), cell_center(12, 15))), 'status': 'available'}] * 40
+        snapshot = SurgeEngine(lambda: None, lambda: fleet).recompute(datetime(2024, 1, 15, 8))
+        grid = snapshot.supply_grid
+
+        near_edge, _ = snapshot.lookup(cell_of(grid, 12, 14))
+        far_side, _ = snapshot.lookup(cell_of(grid, 12, 10))
+        assert near_edge < far_side
+
+    def test_snapshot_publishes_what_quotes_are_priced_with(self):
+        """Region multipliers are their center cells' published multipliers"""
+        fleet = [{'location': dict(zip(('lat', 'lon'), cell_center(12, 15))), 'status': 'available'}] * 40
+        snapshot = SurgeEngine(lambda: None, lambda: fleet).recompute(datetime(2024, 1, 15, 8))
+        grid = snapshot.supply_grid
+
+        np.testing.assert_array_equal(grid.cell_regions[grid.region_centers], np.arange(25))
+        for region, cell in enumerate(grid.region_centers):
+            assert snapshot.lookup(cell)[0] == snapshot.multipliers[region]
+        with pytest.raises(ValueError):
+            snapshot.cell_multipliers[0] = 2.0
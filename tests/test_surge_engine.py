@@ -0,0 +1,110 @@
+"""
+Unit Tests for the Background Surge Engine
+
+Tests per-region surge recomputation from live supply and demand, snapshot
+immutability and the vectorized surge tiers.
+"""
+
+import asyncio
+import pytest
+import sys
+import os
+from datetime import datetime
+
+import numpy as np
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pricing.demand_table import DemandTable
+from src.pricing.dynamic_pricing import (
+    get_region_index,
+    get_surge_multiplier,
+    get_surge_multipliers,
+    get_surge_with_fallback
+)
+from src.services.surge_engine import SurgeEngine
+
+MONDAY_8AM = datetime(2024, 1, 15, 8, 30)
+
+
+def vehicle(lat, lon, status='available'):
+    return {'location': {'lat': lat, 'lon': lon}, 'status': status}
+
+
+@pytest.fixture
+def fleet():
+    # Three available cars and one busy car in region "2_2", one car in "0_0"
+    return [
+        vehicle(13.345, 74.745), vehicle(13.346, 74.746), vehicle(13.347, 74.747),
+        vehicle(13.345, 74.745, status='busy'),
+        vehicle(13.291, 74.691)
+    ]
+
+
+@pytest.fixture
+def demand():
+    return DemandTable.from_records(
+        [{'region_id': '2_2', 'hour': 8, 'demand_score': 0.9},
+         {'region_id': '0_0', 'hour': 8, 'demand_score': 0.01}],
+        grid_size=5
+    )
+
+
+class TestSurgeEngine:
+    """Test suite for background surge recomputation"""
+
+    def test_matches_per_request_surge(self, fleet, demand):
+        """Published multipliers equal the per-request calculation for every region"""
+        engine = SurgeEngine(lambda: demand, lambda: fleet)
+        snapshot = engine.recompute(MONDAY_8AM)
+
+        assert snapshot.supply[get_region_index(13.345, 74.745)] == 3
+        for region in range(25):
+            supply = snapshot.effective_supply[region]
+            expected, _ = get_surge_with_fallback(region, 8, max(supply, 1.0), demand, day_of_week=0)
+            assert snapshot.multipliers[region] == pytest.approx(expected)
+
+    def test_snapshot_is_immutable_and_versioned(self, fleet, demand):
+        """Recomputing publishes a new snapshot; the old one is unchanged and read-only"""
+        engine = SurgeEngine(lambda: demand, lambda: fleet)
+        first = engine.recompute(MONDAY_8AM)
+        fleet.clear()
+        second = engine.recompute(MONDAY_8AM)
+
+        assert (first.version, second.version) == (1, 2)
+        assert engine.snapshot is second
+        assert first.supply.sum() == 4
+        with pytest.raises(ValueError):
+            first.multipliers[0] = 2.0
+
+    def test_covers_hour_and_day(self, fleet):
+        """Snapshots only serve quotes for the hour and day they were computed for"""
+        snapshot = SurgeEngine(lambda: None, lambda: fleet).recompute(MONDAY_8AM)
+        assert snapshot.covers(8, 0)
+        assert not snapshot.covers(9, 0)
+        assert not snapshot.covers(8, 1)
+
+    def test_background_refresh(self, fleet, demand):
+        """The running task keeps publishing new versions"""
+        engine = SurgeEngine(lambda: demand, lambda: fleet, interval_s=0.01)
+
+        async def run():
+            engine.start()
+            await asyncio.sleep(0.05)
+            engine.stop()
+
+        asyncio.run(run())
+        assert engine.snapshot.version > 2
+
+
+class TestVectorizedSurge:
+    """Test suite for the vectorized surge tiers"""
+
+    def test_matches_scalar(self):
+        ratios = np.array([0.0, 0.49, 0.5, 1.49, 1.5, 2.99, 3.0, 50.0])
+        expected = [get_surge_multiplier(r) for r in ratios]
+        np.testing.assert_allclose(get_surge_multipliers(ratios), expected)
+
+    def test_cap_applied(self):
+        assert get_surge_multipliers(np.array([10.0]), surge_cap=1.2)[0] == pytest.approx(1.2)
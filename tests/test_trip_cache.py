@@ -0,0 +1,88 @@
+"""
+Unit Tests for Trip Cache
+
+Tests key snapping, LRU eviction, TTL expiry and hit/miss counters.
+"""
+
+import pytest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.trip_cache import TripCache
+
+
+class TestTripCacheKeys:
+    """Test suite for cache key construction"""
+
+    def test_nearby_points_share_key(self):
+        """Points within the same cell should map to the same key"""
+        cache = TripCache(cell_degrees=0.001)
+        key1 = cache.make_key(13.35001, 74.70001, 13.34001, 74.79001, 8, 1)
+        key2 = cache.make_key(13.35002, 74.70003, 13.34003, 74.79002, 8, 1)
+        assert key1 == key2
+
+    def test_distant_points_differ(self):
+        """Points in different cells should not collide"""
+        cache = TripCache(cell_degrees=0.001)
+        key1 = cache.make_key(13.350, 74.700, 13.340, 74.790, 8, 1)
+        key2 = cache.make_key(13.360, 74.700, 13.340, 74.790, 8, 1)
+        assert key1 != key2
+
+    def test_day_of_week_bucketing(self):
+        """Each day of week gets its own entry, matching the ETA model's day_of_week feature"""
+        cache = TripCache()
+        monday = cache.make_key(13.35, 74.70, 13.34, 74.79, 8, 0)
+        tuesday = cache.make_key(13.35, 74.70, 13.34, 74.79, 8, 1)
+        saturday = cache.make_key(13.35, 74.70, 13.34, 74.79, 8, 5)
+        assert monday != tuesday
+        assert monday != saturday
+
+        cache.put(monday, {'durations': {'Bike': 10.0}})
+        cache.put(tuesday, {'durations': {'Bike': 12.5}})
+        assert cache.get(monday)['durations']['Bike'] == 10.0
+        assert cache.get(tuesday)['durations']['Bike'] == 12.5
+
+
+class TestTripCacheBehaviour:
+    """Test suite for LRU eviction, TTL and counters"""
+
+    def test_hit_and_miss_counters(self):
+        """Counters should track lookups"""
+        cache = TripCache()
+        assert cache.get('a') is None
+        cache.put('a', {'distance': 1.0, 'duration': 5.0})
+        assert cache.get('a') == {'distance': 1.0, 'duration': 5.0}
+
+        stats = cache.stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert stats['hit_rate'] == 0.5
+
+    def test_lru_eviction(self):
+        """Least recently used entry should be evicted first"""
+        cache = TripCache(max_size=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')  # 'b' is now least recently used
+        cache.put('c', 3)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+
+    def test_ttl_expiry(self):
+        """Expired entries should be treated as misses"""
+        cache = TripCache(ttl_seconds=0.0)
+        cache.put('a', 1)
+        assert cache.get('a') is None
+        assert cache.stats()['expirations'] == 1
+        assert cache.stats()['size'] == 0
+
+
+if __name__ == "__main__":
+    # Run tests
+    pytest.main([__file__, "-v"])